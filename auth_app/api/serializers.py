@@ -1,8 +1,13 @@
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
 
+from auth_app.authentication import is_expired
+from auth_app.hashing import check_user_password, hash_password
+from auth_app.models import normalize_email, users_with_email
+
 
 class RegistrationSerializer(serializers.Serializer):
     """Serializer for user registration."""
@@ -11,14 +16,6 @@ class RegistrationSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
     repeated_password = serializers.CharField(write_only=True)
 
-    def validate_email(self, value):
-        """Check that the email is not already in use."""
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError(
-                "Email already exists."
-            )
-        return value
-
     def validate(self, data):
         """Check that both passwords match."""
         if data['password'] != data['repeated_password']:
@@ -35,18 +32,32 @@ class RegistrationSerializer(serializers.Serializer):
         return first_name, last_name
 
     def create(self, validated_data):
-        """Create a new user and generate an auth token."""
+        """Create a new user and generate an auth token.
+
+        A taken email is detected by the unique index on insert, so two
+        concurrent registrations cannot both succeed. The token is cached
+        on ``user.auth_token``.
+        """
         first_name, last_name = self.parse_name(
             validated_data['fullname']
         )
-        user = User.objects.create_user(
-            username=validated_data['email'],
-            email=validated_data['email'],
-            password=validated_data['password'],
+        email = normalize_email(validated_data['email'])
+        # Hashed on the hashing pool instead of inside create_user().
+        user = User(
+            username=User.normalize_username(email),
+            email=email,
+            password=hash_password(validated_data['password']),
             first_name=first_name,
             last_name=last_name,
         )
-        Token.objects.create(user=user)
+        try:
+            with transaction.atomic():
+                user.save()
+                Token.objects.create(user=user)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {'email': ["Email already exists."]}
+            )
         return user
 
 
@@ -61,16 +72,42 @@ class LoginSerializer(serializers.Serializer):
         password = data['password']
 
         try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError(
-                "Invalid credentials."
+            user = (
+                users_with_email(User.objects.select_related('auth_token__usage'))
+                .get(email=normalize_email(email))
             )
+        except User.DoesNotExist:
+            user = None
 
-        if not user.check_password(password):
+        if not check_user_password(user, password):
             raise serializers.ValidationError(
                 "Invalid credentials."
             )
 
         data['user'] = user
+        data['token'] = self.get_token(user)
         return data
+
+    def get_token(self, user):
+        """Return the user's token, replacing it if it expired and creating it if missing."""
+        try:
+            token = user.auth_token
+        except Token.DoesNotExist:
+            pass
+        else:
+            if not is_expired(token):
+                return token
+            token.delete()
+        try:
+            with transaction.atomic():
+                return Token.objects.create(user=user)
+        except IntegrityError:
+            # A concurrent login created it first.
+            return Token.objects.get(user=user)
+
+
+class EmailCheckBatchSerializer(serializers.Serializer):
+    """Serializer for checking several email addresses at once."""
+    emails = serializers.ListField(
+        child=serializers.EmailField(), allow_empty=False, max_length=100,
+    )
@@ -1,12 +1,12 @@
 from django.contrib.auth.models import User
 
 from rest_framework import status
-from rest_framework.authtoken.models import Token
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from auth_app.api.serializers import RegistrationSerializer, LoginSerializer
+from auth_app.api.serializers import EmailCheckBatchSerializer, RegistrationSerializer, LoginSerializer
+from auth_app.models import normalize_email, users_with_email
 
 
 def get_formatted_fullname(user):
@@ -23,6 +23,15 @@ def get_formatted_fullname(user):
     return f"{first} {last}"
 
 
+def get_email_check_data(user):
+    """Return the data email checks show about a user."""
+    return {
+        'id': user.id,
+        'email': user.email,
+        'fullname': get_formatted_fullname(user),
+    }
+
+
 def get_user_response(token, user):
     """Return user data dict for auth responses."""
     full_name = get_formatted_fullname(user)
@@ -41,13 +50,15 @@ def get_user_response(token, user):
 class RegistrationView(APIView):
     """User Registration View."""
     permission_classes = [AllowAny]
+    # A stale token sent along must not block getting a new one.
+    authentication_classes = []
 
     def post(self, request):
         """Register a new user and return a token."""
         serializer = RegistrationSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            token = Token.objects.get(user=user)
+            token = user.auth_token
             return Response(
                 {
                     'token': token.key,
@@ -66,13 +77,15 @@ class RegistrationView(APIView):
 class LoginView(APIView):
     """User Login View."""
     permission_classes = [AllowAny]
+    # A stale token sent along must not block getting a new one.
+    authentication_classes = []
 
     def post(self, request):
         """Authenticate user and return a token."""
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.validated_data['user']
-            token, created = Token.objects.get_or_create(user=user)
+            token = serializer.validated_data['token']
             return Response(
                 {
                     'token': token.key,
@@ -124,23 +137,40 @@ class UserProfileView(APIView):
 
 
 class EmailCheckView(APIView):
-    """Check if an email address is already registered."""
+    """Check if email addresses are already registered."""
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         """Return user data if email exists, 404 otherwise."""
         email = request.query_params.get('email', '')
         try:
-            user = User.objects.get(email=email)
+            user = users_with_email(User.objects).get(email=normalize_email(email))
         except User.DoesNotExist:
             return Response(
                 {'detail': 'User not found.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        return Response(get_email_check_data(user), status=status.HTTP_200_OK)
+
+    def post(self, request):
+        """Look up a list of emails with one query; unknown ones map to None."""
+        serializer = EmailCheckBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        emails = serializer.validated_data['emails']
+        users = (
+            users_with_email(User.objects)
+            .filter(email__in={normalize_email(email) for email in emails})
+        )
+        by_email = {user.email: get_email_check_data(user) for user in users}
         return Response({
-            'id': user.id,
-            'email': user.email,
-            'fullname': get_formatted_fullname(user),
+            'results': [
+                {'email': email, 'user': by_email.get(normalize_email(email))}
+                for email in emails
+            ],
         }, status=status.HTTP_200_OK)
 
 
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AuthAppConfig(AppConfig):
     name = 'auth_app'
+
+    def ready(self):
+        """Connect the signal handlers."""
+        import auth_app.signals  # noqa: F401
@@ -0,0 +1,121 @@
+"""Token authentication with sliding expiry.
+
+A token expires once it has not been used for ``TOKEN_TTL`` seconds.
+Authenticating never writes to the database: the last use is kept in
+the cache, refreshed at most every ``TOKEN_TOUCH_INTERVAL`` seconds, and
+the tokens touched by this process are written to ``TokenUsage`` in one
+batch at the end of a request, at most every ``TOKEN_USAGE_FLUSH_INTERVAL``
+seconds. Expired tokens are deleted by ``purge_expired_tokens``; a login
+with an expired token gets a new one.
+"""
+import datetime
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, close_old_connections
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from auth_app.models import TokenUsage
+from core.metrics import AUTH_CACHE
+
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_touched = set()
+_last_flush = 0.0
+
+
+def _cache_key(key):
+    return f'token-used:{key}'
+
+
+def last_used(token):
+    """Return when the token was last used, as a timestamp."""
+    value = cache.get(_cache_key(token.key))
+    AUTH_CACHE.inc(result='miss' if value is None else 'hit')
+    if value is not None:
+        return value
+    try:
+        return token.usage.last_used.timestamp()
+    except TokenUsage.DoesNotExist:
+        return token.created.timestamp()
+
+
+def cached_last_uses(keys):
+    """Return {key: timestamp} for tokens whose last use is in the cache."""
+    used = cache.get_many([_cache_key(key) for key in keys])
+    return {key: used[_cache_key(key)] for key in keys if _cache_key(key) in used}
+
+
+def is_expired(token, now=None):
+    """Return whether the token has not been used for longer than TOKEN_TTL."""
+    now = time.time() if now is None else now
+    return now - last_used(token) > settings.TOKEN_TTL
+
+
+def touch(token, used, now):
+    """Record a use of the token in the cache if the stored one is getting old."""
+    if now - used < settings.TOKEN_TOUCH_INTERVAL:
+        return
+    cache.set(_cache_key(token.key), now, settings.TOKEN_TTL)
+    with _lock:
+        _touched.add(token.key)
+
+
+def flush_usage(force=False):
+    """Write the last use of the tokens touched by this process to the database."""
+    global _last_flush
+    with _lock:
+        if not _touched or not (force or time.monotonic() - _last_flush >= settings.TOKEN_USAGE_FLUSH_INTERVAL):
+            return 0
+        keys = list(_touched)
+        _touched.clear()
+        _last_flush = time.monotonic()
+    used = cache.get_many([_cache_key(key) for key in keys])
+    # Tokens deleted since, e.g. by a logout, are skipped.
+    existing = set(Token.objects.filter(key__in=keys).values_list('key', flat=True))
+    rows = [
+        TokenUsage(token_id=key, last_used=datetime.datetime.fromtimestamp(used[_cache_key(key)], datetime.timezone.utc))
+        for key in keys if key in existing and _cache_key(key) in used
+    ]
+    try:
+        TokenUsage.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['token'], update_fields=['last_used'],
+        )
+    except IntegrityError:
+        logger.warning('Token usage of %d tokens not saved, a token was deleted during the flush', len(rows))
+        return 0
+    return len(rows)
+
+
+def flush_usage_on_request_finished(sender, **kwargs):
+    """Flush token usage after a response has been sent."""
+    if flush_usage():
+        close_old_connections()
+
+
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """Token authentication that rejects tokens unused for TOKEN_TTL seconds."""
+
+    def authenticate_credentials(self, key):
+        """Return the token's user unless the token is unknown or expired."""
+        try:
+            token = Token.objects.select_related('user', 'usage').get(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        now = time.time()
+        used = last_used(token)
+        if now - used > settings.TOKEN_TTL:
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+        touch(token, used, now)
+        return token.user, token
@@ -0,0 +1,83 @@
+"""Password hashing on a bounded thread pool.
+
+Password hashes are slow on purpose. Running them on a small
+process-wide pool means at most ``PASSWORD_HASHING_THREADS`` hashes use
+the CPU at once, so during a login storm the other requests of a
+threaded worker keep being served. At most ``PASSWORD_HASHING_QUEUE``
+more calls wait for a thread; a call that cannot get a slot within
+``PASSWORD_HASHING_TIMEOUT`` seconds fails with ``HashingBusy`` (503 with
+``Retry-After``) instead of piling up. With 0 threads hashing runs on the
+request thread.
+
+Only the hashing runs on the pool. Database writes, like upgrading a
+hash to the preferred hasher after a login, stay on the request thread
+and its transaction.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    """Raised when the hashing pool has no free slot."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many logins at the moment, please try again.'
+    default_code = 'hashing_busy'
+    # DRF turns this into a Retry-After header.
+    wait = 1
+
+
+_lock = threading.Lock()
+_pool = None
+_slots = None
+
+
+def _get_pool():
+    """Create the pool and its slots on first use."""
+    global _pool, _slots
+    with _lock:
+        if _pool is None:
+            threads = settings.PASSWORD_HASHING_THREADS
+            _pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='password-hashing')
+            _slots = threading.BoundedSemaphore(threads + settings.PASSWORD_HASHING_QUEUE)
+        return _pool, _slots
+
+
+def run_hashing(func, *args):
+    """Run a hashing function on the pool and return its result."""
+    if not settings.PASSWORD_HASHING_THREADS:
+        return func(*args)
+    pool, slots = _get_pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_TIMEOUT):
+        raise HashingBusy()
+    try:
+        future = pool.submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future.result()
+
+
+def hash_password(password):
+    """Return the password hashed with the preferred hasher."""
+    return run_hashing(make_password, password)
+
+
+def check_user_password(user, password):
+    """Check a user's password and upgrade the stored hash if the hasher settings changed.
+
+    ``user`` may be None for an unknown account; a hash is computed anyway
+    so the response time does not reveal which emails are registered.
+    """
+    encoded = user.password if user is not None else ''
+    is_correct, must_update = run_hashing(verify_password, password, encoded)
+    if is_correct and must_update:
+        user.password = hash_password(password)
+        user.save(update_fields=['password'])
+    return is_correct
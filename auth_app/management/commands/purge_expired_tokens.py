@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from auth_app.authentication import cached_last_uses, flush_usage
+
+
+class Command(BaseCommand):
+    help = 'Deletes auth tokens that have not been used for TOKEN_TTL seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Tokens checked and deleted per batch')
+
+    def handle(self, *args, **options):
+        flush_usage(force=True)
+        cutoff = timezone.now() - timedelta(seconds=settings.TOKEN_TTL)
+        # Tokens without a usage row, e.g. from bulk_create, count from their creation.
+        expired = Token.objects.filter(
+            Q(usage__last_used__lt=cutoff) | Q(usage__isnull=True, created__lt=cutoff)
+        ).order_by('key').values_list('key', flat=True)
+        deleted = 0
+        last_key = ''
+        while True:
+            keys = list(expired.filter(key__gt=last_key)[:options['chunk_size']])
+            if not keys:
+                break
+            last_key = keys[-1]
+            # Uses not flushed to the database yet are only in the cache.
+            used = cached_last_uses(keys)
+            keys = [key for key in keys if used.get(key, 0) < cutoff.timestamp()]
+            deleted += Token.objects.filter(key__in=keys).delete()[1].get(Token._meta.label, 0)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired tokens.'))
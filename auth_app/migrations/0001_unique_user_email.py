@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_email_index(apps, schema_editor):
+    """Make non-empty emails unique; needs partial index support (SQLite, PostgreSQL)."""
+    if schema_editor.connection.vendor not in ('sqlite', 'postgresql'):
+        return
+    schema_editor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS auth_user_email_uniq "
+        "ON auth_user (email) WHERE email <> ''"
+    )
+
+
+def drop_email_index(apps, schema_editor):
+    """Drop the unique email index."""
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP INDEX IF EXISTS auth_user_email_uniq")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 11:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def track_existing_tokens(apps, schema_editor):
+    """Start the expiry clock of existing tokens now."""
+    Token = apps.get_model('authtoken', 'Token')
+    TokenUsage = apps.get_model('auth_app', 'TokenUsage')
+    now = timezone.now()
+    keys = Token.objects.values_list('key', flat=True).iterator()
+    TokenUsage.objects.bulk_create((TokenUsage(token_id=key, last_used=now) for key in keys), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth_app', '0001_unique_user_email'),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenUsage',
+            fields=[
+                ('token', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='usage', serialize=False, to='authtoken.token')),
+                ('last_used', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.RunPython(track_existing_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+DIRECTORY_INDEXES = [
+    models.Index(Lower('email'), name='auth_user_email_lower_idx'),
+    models.Index(Lower('first_name'), name='auth_user_first_lower_idx'),
+    models.Index(Lower('last_name'), name='auth_user_last_lower_idx'),
+]
+
+
+def create_directory_indexes(apps, schema_editor):
+    """Index the lowercased fields the user directory searches by prefix."""
+    User = apps.get_model('auth', 'User')
+    for index in DIRECTORY_INDEXES:
+        schema_editor.add_index(User, index)
+
+
+def drop_directory_indexes(apps, schema_editor):
+    """Drop the user directory indexes."""
+    User = apps.get_model('auth', 'User')
+    for index in DIRECTORY_INDEXES:
+        schema_editor.remove_index(User, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0002_tokenusage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_directory_indexes, drop_directory_indexes),
+    ]
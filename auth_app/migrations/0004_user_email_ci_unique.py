@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+EMAIL_LOWER_INDEX = models.Index(Lower('email'), name='auth_user_email_lower_idx')
+# Users without an email are left out. Queries have to repeat the
+# condition to use the index, see auth_app.models.users_with_email.
+EMAIL_UNIQUE = models.UniqueConstraint(
+    Lower('email'), condition=~models.Q(email=''), name='auth_user_email_ci_uniq',
+)
+
+
+def replace_email_indexes(apps, schema_editor):
+    """Make emails unique regardless of case, with one index for lookups and uniqueness."""
+    User = apps.get_model('auth', 'User')
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP INDEX IF EXISTS auth_user_email_uniq")
+    schema_editor.remove_index(User, EMAIL_LOWER_INDEX)
+    schema_editor.add_constraint(User, EMAIL_UNIQUE)
+
+
+def restore_email_indexes(apps, schema_editor):
+    """Go back to the case-sensitive unique index and the prefix search index."""
+    User = apps.get_model('auth', 'User')
+    schema_editor.remove_constraint(User, EMAIL_UNIQUE)
+    schema_editor.add_index(User, EMAIL_LOWER_INDEX)
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS auth_user_email_uniq "
+            "ON auth_user (email) WHERE email <> ''"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0003_user_directory_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(replace_email_indexes, restore_email_indexes),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+EMAIL_CI_UNIQUE = models.UniqueConstraint(
+    Lower('email'), condition=~models.Q(email=''), name='auth_user_email_ci_uniq',
+)
+# Emails are stored lowercased, so the stored value is unique. Users
+# without an email are left out; queries have to repeat the condition to
+# use the index, see auth_app.models.users_with_email.
+EMAIL_UNIQUE = models.UniqueConstraint(
+    fields=['email'], condition=~models.Q(email=''), name='auth_user_email_uniq',
+)
+
+
+def lowercase_emails(apps, schema_editor):
+    """Store emails lowercased and make the stored value unique.
+
+    SQLite's LOWER() only folds ASCII, so two emails may differ only in
+    non-ASCII case; an email whose lowercased form is taken is left as it is.
+    """
+    User = apps.get_model('auth', 'User')
+    schema_editor.remove_constraint(User, EMAIL_CI_UNIQUE)
+    users = list(User.objects.exclude(email='').order_by('id').only('id', 'email'))
+    taken = {user.email for user in users}
+    changed = []
+    for user in users:
+        email = user.email.strip().lower()
+        if email != user.email and email not in taken:
+            taken.discard(user.email)
+            taken.add(email)
+            user.email = email
+            changed.append(user)
+    User.objects.bulk_update(changed, ['email'], batch_size=1000)
+    schema_editor.add_constraint(User, EMAIL_UNIQUE)
+
+
+def restore_case_insensitive_index(apps, schema_editor):
+    """Go back to the LOWER() unique index; emails stay lowercased."""
+    User = apps.get_model('auth', 'User')
+    schema_editor.remove_constraint(User, EMAIL_UNIQUE)
+    schema_editor.add_constraint(User, EMAIL_CI_UNIQUE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0004_user_email_ci_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, restore_case_insensitive_index),
+    ]
@@ -1,3 +1,35 @@
 from django.db import models
 
-# Create your models here.
+from rest_framework.authtoken.models import Token
+
+
+class TokenUsage(models.Model):
+    """When an auth token was last used; tokens unused for TOKEN_TTL expire."""
+    token = models.OneToOneField(
+        Token, on_delete=models.CASCADE, primary_key=True, related_name='usage',
+    )
+    last_used = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        """Return the token's user and last use."""
+        return f'{self.token.user_id}: {self.last_used}'
+
+
+def users_with_email(queryset):
+    """Return the users of a queryset that have an email.
+
+    Emails are stored normalized, so filter ``email`` on
+    ``normalize_email(...)``. Filters use the unique index of migration
+    0005, which only covers non-empty emails; the ``exclude`` repeats that
+    condition so the index can be used.
+    """
+    return queryset.exclude(email='')
+
+
+def normalize_email(email):
+    """Return an email address as it is stored: stripped and lowercased.
+
+    Lowercased in Python, not with SQL ``LOWER()``, which only folds ASCII
+    letters on SQLite.
+    """
+    return email.strip().lower()
@@ -0,0 +1,25 @@
+from django.core.signals import request_finished
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from auth_app.authentication import flush_usage_on_request_finished
+from auth_app.models import TokenUsage, normalize_email
+
+
+request_finished.connect(flush_usage_on_request_finished, dispatch_uid='auth_app.flush_token_usage')
+
+
+@receiver(pre_save, sender=User)
+def store_normalized_email(sender, instance, **kwargs):
+    """Store emails lowercased so lookups can compare the stored value."""
+    instance.email = normalize_email(instance.email or '')
+
+
+@receiver(post_save, sender=Token)
+def track_new_token(sender, instance, created, raw=False, **kwargs):
+    """Start the expiry clock of a new token."""
+    if created and not raw:
+        TokenUsage.objects.create(token=instance, last_used=instance.created)
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.authtoken.models import Token
@@ -56,6 +58,63 @@ class RegistrationAPITest(TestCase):
         }
         response = self.client.post('/api/registration/', data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+        self.assertEqual(User.objects.filter(email='john@example.com').count(), 1)
+
+    def test_registration_duplicate_email_other_case(self):
+        """Test that emails differing only in case count as duplicates"""
+        User.objects.create_user(username='existing', email='john@example.com')
+        data = {
+            'fullname': 'John Doe',
+            'email': 'John@Example.com',
+            'password': 'secure123',
+            'repeated_password': 'secure123'
+        }
+        response = self.client.post('/api/registration/', data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+
+    def test_registration_stores_email_lowercased(self):
+        """Test that non-ASCII uppercase emails are stored lowercased and can log in"""
+        data = {
+            'fullname': 'Émile Zola',
+            'email': 'Emile@ÉCOLE.fr',
+            'password': 'secure123',
+            'repeated_password': 'secure123'
+        }
+        response = self.client.post('/api/registration/', data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(User.objects.get().email, 'emile@école.fr')
+        response = self.client.post('/api/login/', {'email': 'emile@École.fr', 'password': 'secure123'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_saved_emails_are_lowercased(self):
+        """Test that emails set outside registration are stored lowercased too"""
+        user = User.objects.create_user(username='emile', email=' Émile@Example.COM ')
+        user.refresh_from_db()
+        self.assertEqual(user.email, 'émile@example.com')
+
+    def test_users_without_email_do_not_collide(self):
+        """Test that any number of users may have no email"""
+        User.objects.create_user(username='first')
+        User.objects.create_user(username='second')
+        self.assertEqual(User.objects.filter(email='').count(), 2)
+
+    def test_registration_only_inserts(self):
+        """Test that registration inserts the user, token and token usage without re-reading"""
+        data = {
+            'fullname': 'John Doe',
+            'email': 'john@example.com',
+            'password': 'secure123',
+            'repeated_password': 'secure123'
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/registration/', data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        sql = [q['sql'] for q in queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        self.assertEqual(len(sql), 3)
+        self.assertTrue(all(statement.startswith('INSERT') for statement in sql))
+        self.assertEqual(response.data['token'], Token.objects.get(user__email='john@example.com').key)
     
     def test_registration_missing_fields(self):
         """Test registration with missing fields"""
@@ -91,6 +150,28 @@ class LoginAPITest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('token', response.data)
         self.assertEqual(response.data['email'], 'test@example.com')
+
+    def test_login_fetches_user_and_token_together(self):
+        """Test that a login with an existing token is a single query"""
+        token = Token.objects.create(user=self.user)
+        data = {
+            'email': 'test@example.com',
+            'password': 'testpass123'
+        }
+        with self.assertNumQueries(1):
+            response = self.client.post('/api/login/', data)
+        self.assertEqual(response.data['token'], token.key)
+
+    def test_login_creates_missing_token_once(self):
+        """Test that the first login creates the token and later ones reuse it"""
+        data = {
+            'email': 'test@example.com',
+            'password': 'testpass123'
+        }
+        first = self.client.post('/api/login/', data)
+        second = self.client.post('/api/login/', data)
+        self.assertEqual(first.data['token'], second.data['token'])
+        self.assertEqual(Token.objects.filter(user=self.user).count(), 1)
     
     def test_login_wrong_password(self):
         """Test login with wrong password"""
@@ -219,6 +300,39 @@ class EmailCheckAPITest(TestCase):
             response.status_code, status.HTTP_404_NOT_FOUND
         )
 
+    def test_email_check_ignores_case(self):
+        """Test that emails are matched case-insensitively."""
+        response = self.client.get('/api/email-check/?email=Test@Example.COM')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.user.id)
+
+    def test_email_check_ignores_non_ascii_case(self):
+        """Test that emails with non-ASCII uppercase letters are found."""
+        user = User.objects.create_user(username='emile', email='emile@École.fr')
+        response = self.client.get('/api/email-check/?email=EMILE@ÉCOLE.fr')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], user.id)
+
+    def test_batch_email_check(self):
+        """Test that a batch is resolved with one query, in request order."""
+        other = User.objects.create_user(username='other', email='other@example.com')
+        emails = ['unknown@example.com', 'OTHER@example.com', 'test@example.com']
+        # The token lookup and the email lookup
+        with self.assertNumQueries(2):
+            response = self.client.post('/api/email-check/', {'emails': emails}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([result['email'] for result in results], emails)
+        self.assertIsNone(results[0]['user'])
+        self.assertEqual(results[1]['user']['id'], other.id)
+        self.assertEqual(results[2]['user']['fullname'], 'Test User')
+
+    def test_batch_email_check_validation(self):
+        """Test that invalid or oversized batches are rejected."""
+        for emails in ([], ['not-an-email'], [f'user{i}@example.com' for i in range(101)]):
+            response = self.client.post('/api/email-check/', {'emails': emails}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_email_check_unauthorized(self):
         """Test email check without authentication."""
         self.client.credentials()
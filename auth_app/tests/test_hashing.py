@@ -0,0 +1,70 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class PasswordHashingTest(TestCase):
+    """Test hashing on the pool and hash upgrades on login"""
+
+    def setUp(self):
+        """Create a user whose password uses an older hasher"""
+        self.client = APIClient()
+        self.user = User.objects.create(
+            username='old@example.com', email='old@example.com',
+            password=make_password('testpass123', hasher='pbkdf2_sha1'),
+        )
+
+    def login(self, password='testpass123'):
+        """Log in the user and return the response"""
+        return self.client.post('/api/login/', {'email': 'old@example.com', 'password': password})
+
+    def test_login_upgrades_hash(self):
+        """Test that a login rehashes with the preferred hasher"""
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        preferred = make_password('x').split('$')[0]
+        self.assertTrue(self.user.password.startswith(preferred + '$'))
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    def test_wrong_password_keeps_hash(self):
+        """Test that failed logins do not touch the stored hash"""
+        old = self.user.password
+        self.assertEqual(self.login('wrong').status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, old)
+
+    def test_hashing_runs_on_the_pool(self):
+        """Test that hashes are computed off the request thread"""
+        threads = []
+
+        def spy(*args):
+            threads.append(threading.current_thread().name)
+            return make_password(*args)
+
+        with mock.patch('auth_app.hashing.make_password', spy):
+            response = self.client.post('/api/registration/', {
+                'fullname': 'New User', 'email': 'new@example.com',
+                'password': 'secure123', 'repeated_password': 'secure123',
+            })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(threads[0].startswith('password-hashing'))
+        self.assertTrue(User.objects.get(email='new@example.com').check_password('secure123'))
+
+    @override_settings(PASSWORD_HASHING_THREADS=0)
+    def test_inline_hashing(self):
+        """Test that 0 threads hashes on the request thread"""
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    def test_full_pool_returns_503(self):
+        """Test that logins are shed when no slot frees up in time"""
+        slots = mock.Mock(acquire=mock.Mock(return_value=False))
+        with mock.patch('auth_app.hashing._get_pool', return_value=(None, slots)):
+            response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
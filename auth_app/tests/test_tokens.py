@@ -0,0 +1,110 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from auth_app import authentication
+from auth_app.models import TokenUsage
+
+
+DAY = 24 * 60 * 60
+
+
+@override_settings(TOKEN_TTL=DAY, TOKEN_TOUCH_INTERVAL=60, TOKEN_USAGE_FLUSH_INTERVAL=0)
+class ExpiringTokenTest(TestCase):
+    """Test token expiry, sliding refresh and usage flushing"""
+
+    def setUp(self):
+        """Create a user with a token"""
+        cache.clear()
+        authentication._touched.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def get_me(self, at):
+        """Request /api/users/me/ at the given time"""
+        with mock.patch('auth_app.authentication.time.time', return_value=at):
+            return self.client.get('/api/users/me/')
+
+    def set_last_used(self, at):
+        """Store a last use of the token in the database"""
+        TokenUsage.objects.filter(token=self.token).update(
+            last_used=timezone.now() - timedelta(seconds=time.time() - at)
+        )
+
+    def test_new_token_is_tracked(self):
+        """Test that creating a token stores its first use"""
+        self.assertEqual(TokenUsage.objects.get(token=self.token).last_used, self.token.created)
+
+    def test_expired_token_is_rejected(self):
+        """Test that a token unused for longer than TOKEN_TTL fails"""
+        now = time.time()
+        self.set_last_used(now - DAY - 10)
+        response = self.get_me(now)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(str(response.data['detail']), 'Token has expired.')
+
+    def test_use_slides_expiry_without_db_writes(self):
+        """Test that a use extends the token's life through the cache only"""
+        now = time.time()
+        self.set_last_used(now - DAY + 100)
+        with mock.patch('auth_app.authentication.flush_usage'), CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_me(now).status_code, status.HTTP_200_OK)
+        self.assertTrue(all(q['sql'].startswith('SELECT') for q in queries))
+        self.assertEqual(self.get_me(now + 200).status_code, status.HTTP_200_OK)
+
+    def test_usage_is_flushed_in_a_batch(self):
+        """Test that touched tokens are written with one upsert"""
+        now = time.time()
+        self.set_last_used(now - 3600)
+        with mock.patch('auth_app.authentication.flush_usage'):
+            self.get_me(now)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(authentication.flush_usage(), 1)
+        self.assertEqual(sum(q['sql'].startswith('INSERT') for q in queries), 1)
+        last_used = TokenUsage.objects.get(token=self.token).last_used.timestamp()
+        self.assertAlmostEqual(last_used, now, places=3)
+
+    def test_login_replaces_expired_token(self):
+        """Test that logging in with an expired token issues a new one"""
+        self.set_last_used(time.time() - DAY - 10)
+        response = self.client.post('/api/login/', {'email': 'test@example.com', 'password': 'testpass123'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['token'], self.token.key)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+
+    def test_purge_deletes_expired_tokens(self):
+        """Test that the cleanup command deletes expired tokens and their usage"""
+        other = Token.objects.create(user=User.objects.create_user(username='other'))
+        self.set_last_used(time.time() - DAY - 10)
+        call_command('purge_expired_tokens', stdout=mock.Mock())
+        self.assertEqual(list(Token.objects.values_list('key', flat=True)), [other.key])
+        self.assertEqual(list(TokenUsage.objects.values_list('token_id', flat=True)), [other.key])
+
+    def test_purge_counts_tokens_without_usage_from_creation(self):
+        """Test that tokens created without a usage row still expire"""
+        TokenUsage.objects.filter(token=self.token).delete()
+        Token.objects.filter(pk=self.token.pk).update(created=timezone.now() - timedelta(days=2))
+        call_command('purge_expired_tokens', stdout=mock.Mock())
+        self.assertFalse(Token.objects.filter(pk=self.token.pk).exists())
+
+    def test_purge_keeps_tokens_used_since_the_last_flush(self):
+        """Test that a use only recorded in the cache keeps the token"""
+        now = time.time()
+        self.set_last_used(now - DAY - 10)
+        cache.set(f'token-used:{self.token.key}', now - 10)
+        call_command('purge_expired_tokens', stdout=mock.Mock())
+        self.assertTrue(Token.objects.filter(pk=self.token.pk).exists())
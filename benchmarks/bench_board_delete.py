@@ -0,0 +1,65 @@
+"""Compare deleting a big board through the ORM collector with kanban_app.deletion."""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.utils import report, setup, test_database
+
+
+def populate(tickets):
+    """Create a board with tickets, each with a subticket, two comments and an assignee."""
+    from django.contrib.auth.models import User
+    from kanban_app.models import Board, Comment, Subticket, Ticket
+
+    user = User.objects.get_or_create(username='bench', email='bench@example.com')[0]
+    board = Board.objects.create(title='Bench', owner=user)
+    board.members.add(user)
+    Ticket.objects.bulk_create(
+        (Ticket(board=board, title=f'Ticket {i}', rank=f'{i:06d}1') for i in range(tickets)),
+        batch_size=5000,
+    )
+    ids = list(Ticket.objects.filter(board=board).values_list('id', flat=True))
+    Subticket.objects.bulk_create((Subticket(ticket_id=i, title='Step') for i in ids), batch_size=5000)
+    Comment.objects.bulk_create(
+        (Comment(ticket_id=i, author=user, text=f'Comment {n}') for i in ids for n in range(2)),
+        batch_size=5000,
+    )
+    Ticket.assigned_to.through.objects.bulk_create(
+        (Ticket.assigned_to.through(ticket_id=i, user_id=user.id) for i in ids), batch_size=5000,
+    )
+    return board
+
+
+def run(label, delete, tickets, repeat):
+    """Time ``delete(board)`` on fresh boards and report time and peak memory."""
+    timings, peaks = [], []
+    for _ in range(repeat):
+        board = populate(tickets)
+        tracemalloc.start()
+        start = time.perf_counter()
+        delete(board)
+        timings.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024 / 1024)
+        tracemalloc.stop()
+    timings.sort()
+    report(label, {'min': timings[0], 'median': timings[len(timings) // 2], 'max': timings[-1]})
+    print(f"{'':<40} peak memory {max(peaks):8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickets', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup()
+    from kanban_app.deletion import delete_board
+
+    with test_database():
+        print(f"{args.tickets} tickets, {args.tickets * 4} child rows")
+        run('board.delete() (collector)', lambda board: board.delete(), args.tickets, args.repeat)
+        run('kanban_app.deletion.delete_board', lambda board: delete_board(board.id), args.tickets, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
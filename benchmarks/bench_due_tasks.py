@@ -0,0 +1,74 @@
+"""Compare the indexed due date query with fetching all tickets and filtering in Python."""
+import argparse
+import random
+from datetime import timedelta
+
+from benchmarks.utils import measure, report, setup, test_database
+
+
+def populate(tickets, boards):
+    """Insert tickets spread over boards, with due dates over two years."""
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+    from kanban_app.models import Board, Ticket
+
+    rng = random.Random(42)
+    today = timezone.localdate()
+    user = User.objects.create(username='bench', email='bench@example.com')
+    board_ids = [Board.objects.create(title=f'Bench {i}', owner=user).id for i in range(boards)]
+    statuses = [choice for choice, _ in Ticket.STATUS_CHOICES]
+    Ticket.objects.bulk_create(
+        (Ticket(
+            board_id=rng.choice(board_ids),
+            title=f'Ticket {i}',
+            status=rng.choice(statuses),
+            due_date=today + timedelta(days=rng.randint(-365, 365)) if rng.random() < 0.8 else None,
+        ) for i in range(tickets)),
+        batch_size=5000,
+    )
+    return user
+
+
+def fetch_all_then_filter(user, start, end):
+    """What clients do today: load /api/tasks/ and filter locally."""
+    from kanban_app.api.filters import select_ticket_fields
+    from kanban_app.api.serializers import TicketSerializer
+    from kanban_app.models import Board, Ticket
+
+    boards = Board.objects.filter(owner=user) | Board.objects.filter(members=user)
+    tickets = select_ticket_fields(Ticket.objects.filter(board__in=boards), None)
+    data = TicketSerializer(tickets, many=True).data
+    return [t for t in data if t['due_date'] and start <= t['due_date'] <= end]
+
+
+def indexed_query(user, start, end):
+    """The /api/tasks/due/ query."""
+    from kanban_app.api.filters import filter_due_tickets
+    from kanban_app.api.views import accessible_tickets, build_ticket_data
+
+    params = {'due_after': start, 'due_before': end}
+    return [build_ticket_data(t) for t in filter_due_tickets(accessible_tickets(user), params)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickets', type=int, default=20000)
+    parser.add_argument('--boards', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    from django.utils import timezone
+
+    with test_database():
+        user = populate(args.tickets, args.boards)
+        today = timezone.localdate()
+        start, end = str(today), str(today + timedelta(days=7))
+        expected = len(indexed_query(user, start, end))
+        assert len(fetch_all_then_filter(user, start, end)) == expected
+        print(f"{args.tickets} tickets, {expected} due this week")
+        report('indexed /api/tasks/due/', measure(lambda: indexed_query(user, start, end)))
+        report('fetch all, filter in Python', measure(lambda: fetch_all_then_filter(user, start, end), repeat=3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Simulate a login storm and measure how it slows down other requests.
+
+Login threads post to /api/login/ in a loop while one thread keeps
+requesting a cheap endpoint. This runs once with hashing on the request
+threads (PASSWORD_HASHING_THREADS=0) and once on the bounded hashing
+pool, like a threaded gunicorn worker would.
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from benchmarks.utils import setup, test_database
+
+
+def populate(users):
+    """Create users with tokens, hashed with the preferred hasher."""
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+
+    password = make_password('storm-password')
+    User.objects.bulk_create(
+        User(username=f'user{i}@example.com', email=f'user{i}@example.com', password=password)
+        for i in range(users)
+    )
+    Token.objects.bulk_create(Token(user=user, key=Token.generate_key()) for user in User.objects.all())
+    return Token.objects.first().key
+
+
+def storm(login_threads, users, duration, token):
+    """Run the storm; return login count, login errors and cheap request latencies."""
+    from django.db import connections
+    from django.test import Client
+
+    stop = threading.Event()
+    logins, errors, latencies = [0], [0], []
+
+    def log_in(n):
+        client = Client()
+        i = n
+        while not stop.is_set():
+            response = client.post('/api/login/', {
+                'email': f'user{i % users}@example.com', 'password': 'storm-password',
+            })
+            if response.status_code == 200:
+                logins[0] += 1
+            else:
+                errors[0] += 1
+            i += login_threads
+        connections.close_all()
+
+    def cheap_requests():
+        client = Client(HTTP_AUTHORIZATION=f'Token {token}')
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get('/api/users/me/')
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+        connections.close_all()
+
+    threads = [threading.Thread(target=log_in, args=(n,)) for n in range(login_threads)]
+    threads.append(threading.Thread(target=cheap_requests))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return logins[0], errors[0], latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--login-threads', type=int, default=8)
+    parser.add_argument('--pool-threads', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.test.utils import override_settings
+
+    from auth_app import hashing
+
+    print(f"{args.login_threads} login threads for {args.duration:.0f} s, hasher {settings.PASSWORD_HASHERS[0]}")
+    with test_database():
+        token = populate(args.users)
+        for label, threads in (('hashing on request threads', 0), ('bounded hashing pool', args.pool_threads)):
+            hashing._pool = None
+            with override_settings(THROTTLE_CAPACITY=0, MAX_CONCURRENT_REQUESTS=0,
+                                   PASSWORD_HASHING_THREADS=threads, ALLOWED_HOSTS=['*']):
+                logins, errors, latencies = storm(args.login_threads, args.users, args.duration, token)
+            latencies.sort()
+            print(
+                f"{label:<28} {logins / args.duration:7.1f} logins/s  {errors} errors   "
+                f"/api/users/me/ median {statistics.median(latencies):7.1f} ms  "
+                f"p95 {latencies[int(len(latencies) * 0.95)]:7.1f} ms"
+            )
+
+
+if __name__ == '__main__':
+    main()
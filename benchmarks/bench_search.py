@@ -0,0 +1,66 @@
+"""Compare FTS5 search with the icontains fallback on a generated corpus."""
+import argparse
+import itertools
+import random
+
+from benchmarks.utils import measure, report, setup, test_database
+
+SYLLABLES = 'ka lo mi ne ru sa ti vo be da fe gi ho ju'.split()
+WORDS = [''.join(parts) for parts in itertools.product(SYLLABLES, repeat=3)]
+random.Random(7).shuffle(WORDS)
+# Zipf-like weights so a few words are common and most are rare.
+WEIGHTS = [1 / (rank + 1) for rank in range(len(WORDS))]
+
+
+def sentence(rng, length):
+    """Return a random sentence drawn from the vocabulary."""
+    return ' '.join(rng.choices(WORDS, WEIGHTS, k=length))
+
+
+def populate(tickets, comments_per_ticket, boards, accessible):
+    """Insert a corpus spread over many boards and build the index once."""
+    from django.contrib.auth.models import User
+    from kanban_app.models import Board, Comment, Ticket
+    from kanban_app.search import get_search_backend
+
+    rng = random.Random(42)
+    user = User.objects.create(username='bench', email='bench@example.com')
+    board_ids = [Board.objects.create(title=f'Bench {i}', owner=user).id for i in range(boards)]
+    Ticket.objects.bulk_create(
+        (Ticket(board_id=board_ids[i % boards], title=sentence(rng, 4), description=sentence(rng, 20))
+         for i in range(tickets)),
+        batch_size=5000,
+    )
+    ticket_ids = list(Ticket.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create(
+        (Comment(ticket_id=ticket_id, author=user, text=sentence(rng, 12))
+         for ticket_id in ticket_ids for _ in range(comments_per_ticket)),
+        batch_size=5000,
+    )
+    get_search_backend().rebuild()
+    return board_ids[:accessible]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickets', type=int, default=50000)
+    parser.add_argument('--comments', type=int, default=3, help='Comments per ticket')
+    parser.add_argument('--boards', type=int, default=100)
+    parser.add_argument('--accessible', type=int, default=5, help='Boards the searching user can access')
+    args = parser.parse_args()
+
+    setup()
+    from kanban_app.search import ORMSearchBackend, SQLiteFTSBackend
+
+    with test_database():
+        board_ids = populate(args.tickets, args.comments, args.boards, args.accessible)
+        rows = args.tickets * (1 + args.comments)
+        print(f"Corpus: {rows} indexed rows")
+        queries = (WORDS[0], WORDS[50], f'{WORDS[1]} {WORDS[200]}', WORDS[2000][:4] + '*', WORDS[2500])
+        for query in queries:
+            report(f"fts5 '{query}'", measure(lambda: SQLiteFTSBackend().search(query, board_ids)))
+            report(f"icontains '{query}'", measure(lambda: ORMSearchBackend().search(query, board_ids), repeat=3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Hammer ticket creation and comment posting on SQLite from several processes.
+
+Every worker process creates tickets and posts comments through the API
+against a shared temporary SQLite file. The script reports throughput and
+the number of "database is locked" errors and exits with status 1 if any
+request failed::
+
+    python -m benchmarks.stress_sqlite --processes 8 --iterations 200
+
+``--baseline`` runs the same load with SQLite's defaults (rollback
+journal, deferred transactions, 5 s timeout) for comparison.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.utils import setup
+
+BASELINE_OPTIONS = 'init_command=PRAGMA+journal_mode%3DDELETE&transaction_mode=DEFERRED&timeout=5'
+
+
+def prepare():
+    """Migrate the database and return (token key, board id)."""
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from rest_framework.authtoken.models import Token
+    from kanban_app.models import Board
+
+    call_command('migrate', verbosity=0)
+    user = User.objects.create(username='stress', email='stress@example.com')
+    board = Board.objects.create(title='Stress', owner=user)
+    return Token.objects.create(user=user).key, board.id
+
+
+def worker(token, board_id, iterations, ready, go, results):
+    """Create a ticket and comment on it ``iterations`` times."""
+    setup()
+    from django.db import OperationalError
+    from django.test import Client
+
+    client = Client(SERVER_NAME='localhost', HTTP_AUTHORIZATION=f'Token {token}')
+    ready.release()
+    go.wait()
+    done, locked, failed = 0, 0, 0
+    for i in range(iterations):
+        try:
+            response = client.post(
+                '/api/tasks/', {'board': board_id, 'title': f'Ticket {os.getpid()}-{i}'},
+                content_type='application/json',
+            )
+            if response.status_code != 201:
+                failed += 1
+                continue
+            response = client.post(
+                f"/api/tasks/{response.json()['id']}/comments/", {'content': 'Stress'},
+                content_type='application/json',
+            )
+            if response.status_code != 201:
+                failed += 1
+                continue
+            done += 1
+        except OperationalError as exc:
+            if 'locked' not in str(exc):
+                raise
+            locked += 1
+    results.put((done, locked, failed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--baseline', action='store_true', help='Use SQLite defaults instead of the tuned options')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'stress.sqlite3')
+    url = f'sqlite:///{path}'
+    os.environ['DATABASE_URL'] = f'{url}?{BASELINE_OPTIONS}' if args.baseline else url
+    setup()
+    token, board_id = prepare()
+    from django.db import connections
+    connections.close_all()
+
+    # spawn, so that no process inherits an open SQLite connection
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    ready, go = context.Semaphore(0), context.Event()
+    processes = [
+        context.Process(target=worker, args=(token, board_id, args.iterations, ready, go, results))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    # measure the load only, not the start-up of the worker processes
+    for _ in processes:
+        ready.acquire()
+    start = time.perf_counter()
+    go.set()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    done = sum(t[0] for t in totals)
+    locked = sum(t[1] for t in totals)
+    failed = sum(t[2] for t in totals)
+    mode = 'baseline' if args.baseline else 'tuned'
+    print(f'{mode}: {args.processes} processes, {done} ticket+comment pairs in {elapsed:.1f} s '
+          f'({done * 2 / elapsed:.0f} writes/s), {locked} locked, {failed} failed')
+    os.remove(path)
+    sys.exit(1 if locked or failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Helpers shared by the benchmark scripts.
+
+Run a benchmark from the project root, e.g.::
+
+    python -m benchmarks.bench_search --tickets 100000
+
+Each script works on a throw-away test database, never on db.sqlite3.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup():
+    """Configure Django for a standalone script."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create a migrated test database and destroy it afterwards."""
+    from django.db import connection
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def measure(func, repeat=20):
+    """Call func repeatedly and return timings in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'max': max(timings),
+    }
+
+
+def report(label, timings):
+    """Print one line of benchmark results."""
+    print(
+        f"{label:<40} min {timings['min']:8.2f} ms   "
+        f"median {timings['median']:8.2f} ms   max {timings['max']:8.2f} ms"
+    )
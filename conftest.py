@@ -0,0 +1,13 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache.
+
+    Rate limits and cached data are keyed by user id, and ids are reused
+    from test to test.
+    """
+    cache.clear()
+    yield
@@ -0,0 +1,63 @@
+"""Build the ``CACHES`` setting from environment variables.
+
+``CACHE_URL`` selects the default cache:
+
+- ``redis://host:6379/0`` (or ``rediss://``) uses Django's Redis cache,
+  which needs the ``redis`` package
+- ``memcached://host:11211`` uses pymemcache, comma separated hosts are
+  allowed
+- ``locmem://`` (the default) keeps the cache in each process
+
+Board versions, cached stats and directories, rate limits and token
+usage all live in the default cache. They only stay consistent across
+several worker processes with a shared cache (Redis or Memcached).
+"""
+from urllib.parse import urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+
+# Caches that are not shared between processes.
+LOCAL_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def parse_cache_url(url):
+    """Return a ``CACHES`` entry for a cache URL."""
+    parts = urlsplit(url)
+    backend = BACKENDS.get(parts.scheme)
+    if backend is None:
+        raise ImproperlyConfigured(f"Unsupported cache URL scheme: {parts.scheme!r}.")
+    if parts.scheme in ('redis', 'rediss'):
+        return {'BACKEND': backend, 'LOCATION': url}
+    if parts.scheme == 'memcached':
+        return {'BACKEND': backend, 'LOCATION': parts.netloc.split(',')}
+    return {'BACKEND': backend, 'LOCATION': parts.netloc}
+
+
+def cache_config(environ):
+    """Return the default cache settings for the given environment."""
+    return parse_cache_url(environ.get('CACHE_URL') or 'locmem://')
+
+
+def is_shared(config):
+    """Return whether a cache is shared by all worker processes."""
+    return config['BACKEND'] not in LOCAL_BACKENDS
+
+
+def require_shared_cache(config, feature):
+    """Raise ImproperlyConfigured unless the cache is shared by all processes."""
+    if not is_shared(config):
+        raise ImproperlyConfigured(
+            f"{feature} needs a cache shared by all worker processes; set CACHE_URL "
+            "to a Redis or Memcached URL."
+        )
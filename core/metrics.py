@@ -0,0 +1,220 @@
+"""In-process metrics in the Prometheus text format.
+
+Metrics live in memory per process. When ``METRICS_DIR`` is set, every
+process also dumps its values to ``<METRICS_DIR>/metrics-<pid>.json`` (at
+most once per ``METRICS_FLUSH_INTERVAL`` seconds) and the ``/metrics``
+endpoint sums the files of all processes, so any gunicorn worker can
+answer a scrape for the whole server. A process removes its file when it
+exits, and files of processes that no longer run are deleted at the next
+scrape, so counters of workers that died do not stay in the totals. The
+directory has to be local to the host, as processes are looked up by pid.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Counter:
+    """Monotonic counter with labels."""
+    type = 'counter'
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        """Increase the counter for the given label values."""
+        key = tuple(str(labels[label]) for label in self.labels)
+        with registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dump(self):
+        """Return the values as JSON serializable data."""
+        return [[list(key), value] for key, value in self.values.items()]
+
+    @staticmethod
+    def merge(total, data):
+        """Add dumped values to ``total``."""
+        for key, value in data:
+            total[tuple(key)] = total.get(tuple(key), 0) + value
+
+    def samples(self, values):
+        """Yield (suffix, labels, value) exposition samples."""
+        for key, value in sorted(values.items()):
+            yield '', dict(zip(self.labels, key)), value
+
+    def lines(self, values):
+        """Return the exposition lines for the given values."""
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.type}']
+        for suffix, labels, value in self.samples(values):
+            label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+            labels = f'{{{label_text}}}' if labels else ''
+            lines.append(f'{self.name}{suffix}{labels} {value}')
+        return lines
+
+
+class Histogram(Counter):
+    """Histogram with fixed buckets and labels."""
+    type = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """Record one observation for the given label values."""
+        key = tuple(str(labels[label]) for label in self.labels)
+        with registry.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                # one count per bucket plus +Inf, then the sum
+                entry = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[bisect_left(self.buckets, value)] += 1
+            entry[-1] += value
+
+    @staticmethod
+    def merge(total, data):
+        """Add dumped values to ``total`` bucket by bucket."""
+        for key, value in data:
+            entry = total.setdefault(tuple(key), [0] * len(value))
+            for i, v in enumerate(value):
+                entry[i] += v
+
+    def samples(self, values):
+        """Yield cumulative bucket, sum and count samples."""
+        for key, entry in sorted(values.items()):
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), entry[:-1]):
+                cumulative += count
+                yield '_bucket', {**labels, 'le': bound}, cumulative
+            yield '_sum', labels, entry[-1]
+            yield '_count', labels, cumulative
+
+
+def process_alive(pid):
+    """Return whether a process with this pid runs on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Runs, but as another user.
+        return True
+    return True
+
+
+class Registry:
+    """Holds the metrics of this process and collects those of others."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.last_flush = 0.0
+        self.path = None
+        atexit.register(self.remove_file)
+
+    def register(self, metric):
+        """Add a metric and return it."""
+        self.metrics[metric.name] = metric
+        return metric
+
+    def _directory(self):
+        """Return the shared multi-process directory, if configured."""
+        directory = getattr(settings, 'METRICS_DIR', None)
+        return Path(directory) if directory else None
+
+    def flush(self, force=False):
+        """Write this process' values to the shared directory."""
+        directory = self._directory()
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+        if directory is None or (not force and time.monotonic() - self.last_flush < interval):
+            return
+        self.last_flush = time.monotonic()
+        with self.lock:
+            data = {name: metric.dump() for name, metric in self.metrics.items()}
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        path = directory / f'metrics-{os.getpid()}.json'
+        os.replace(tmp, path)
+        self.path = path
+
+    def remove_file(self):
+        """Delete this process' file, so its values leave the totals."""
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+            self.path = None
+
+    def collect(self):
+        """Return {name: values} summed over all processes."""
+        directory = self._directory()
+        if directory is None:
+            with self.lock:
+                return {
+                    name: {key: list(v) if isinstance(v, list) else v for key, v in metric.values.items()}
+                    for name, metric in self.metrics.items()
+                }
+        self.flush(force=True)
+        totals = {name: {} for name in self.metrics}
+        for path in directory.glob('metrics-*.json'):
+            pid = path.stem.removeprefix('metrics-')
+            if pid.isdigit() and not process_alive(int(pid)):
+                # Left behind by a worker that was killed. Idle workers keep
+                # their file however old it is, so their counters never drop.
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, values in data.items():
+                if name in self.metrics:
+                    self.metrics[name].merge(totals[name], values)
+        return totals
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, values in self.collect().items():
+            lines.extend(self.metrics[name].lines(values))
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    'http_request_duration_seconds', 'Request latency by route.',
+    labels=('method', 'route', 'status'),
+))
+REQUEST_QUERIES = registry.register(Histogram(
+    'http_request_db_queries', 'SQL queries per request by route.',
+    labels=('route',), buckets=QUERY_COUNT_BUCKETS,
+))
+RESPONSE_SIZE = registry.register(Histogram(
+    'http_response_size_bytes', 'Response body size by route.',
+    labels=('route',), buckets=SIZE_BUCKETS,
+))
+AUTH_CACHE = registry.register(Counter(
+    'auth_cache_requests_total', 'Token authentication cache lookups.',
+    labels=('result',),
+))
+BOARD_CACHE = registry.register(Counter(
+    'board_cache_requests_total', 'Per-board cache lookups.',
+    labels=('name', 'result'),
+))
@@ -0,0 +1,215 @@
+"""Project wide middleware."""
+import cProfile
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core.metrics import REQUEST_LATENCY, REQUEST_QUERIES, RESPONSE_SIZE, registry
+from core.profiling import save_profile
+from core.routers import begin_request, end_request
+
+
+logger = logging.getLogger('core.queries')
+
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def sql_shape(sql):
+    """Return the SQL with literals and IN lists collapsed, for grouping."""
+    return _LITERAL.sub('?', _IN_LIST.sub('(...)', sql))
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that counts queries, their time and SQL shapes."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def repeated(self, threshold):
+        """Return (shape, count) pairs executed more than ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+class QueryInstrumentationMiddleware:
+    """Count SQL queries per request and report budget overruns and N+1s.
+
+    Adds a ``Server-Timing`` header with the database time and query
+    count. Budgets come from ``QUERY_BUDGETS`` (URL name to maximum query
+    count) with ``QUERY_BUDGET_DEFAULT`` as fallback. A SQL shape that
+    repeats more than ``QUERY_REPEAT_THRESHOLD`` times is logged as a
+    likely N+1 together with the view that issued it.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+        request.query_stats = recorder
+
+        response['Server-Timing'] = (
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries", '
+            f'total;dur={total * 1000:.1f}'
+        )
+        self._check(request, recorder)
+        return response
+
+    def _check(self, request, recorder):
+        """Log requests over their query budget and repeated SQL shapes."""
+        match = request.resolver_match
+        if match is None:
+            return
+        view = match._func_path
+        budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        budget = budgets.get(match.view_name, getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
+        if budget is not None and recorder.count > budget:
+            logger.warning(
+                "%s %s (%s) ran %d queries, budget is %d",
+                request.method, request.path, view, recorder.count, budget,
+            )
+        threshold = getattr(settings, 'QUERY_REPEAT_THRESHOLD', 10)
+        for shape, count in recorder.repeated(threshold):
+            logger.warning(
+                "Possible N+1 in %s (%s %s): query repeated %d times: %s",
+                view, request.method, request.path, count, shape,
+            )
+
+
+class ProfilingMiddleware:
+    """Profile a sample of requests with cProfile.
+
+    ``PROFILING_SAMPLE_RATE`` (0 to 1, default 0) picks requests at
+    random. A request carrying the ``PROFILING_HEADER`` header is profiled
+    too if its credentials belong to a staff user; they are checked with
+    the DRF authenticators before profiling starts, so other clients
+    cannot make requests more expensive by sending the header. Profiles
+    go to ``PROFILING_DIR``, see ``core.profiling`` and the
+    ``profile_summary`` command.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sampled = random.random() < getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+        header = getattr(settings, 'PROFILING_HEADER', 'X-Profile')
+        requested = not sampled and bool(request.headers.get(header)) and self.is_staff(request)
+        if not (sampled or requested):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread.
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - start
+        response['X-Profile-Id'] = save_profile(profiler, request, response, duration)
+        return response
+
+    def is_staff(self, request):
+        """Return whether the request's credentials belong to a staff user."""
+        authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+        try:
+            user = Request(request, authenticators=authenticators).user
+        except APIException:
+            return False
+        return user.is_staff
+
+
+class MetricsMiddleware:
+    """Record latency, query count and response size per route.
+
+    Routes are URL names, so the number of label values stays bounded.
+    Must come before ``QueryInstrumentationMiddleware`` to see its
+    ``request.query_stats``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        route = match.view_name if match else 'unmatched'
+        REQUEST_LATENCY.observe(duration, method=request.method, route=route, status=response.status_code)
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            REQUEST_QUERIES.observe(stats.count, route=route)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(len(response.content), route=route)
+        registry.flush()
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Let ``core.routers.ReplicaRouter`` know which requests may use a replica."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = begin_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            end_request(request, token)
+
+
+class ConcurrencyLimitMiddleware:
+    """Give back the in-flight count taken by ``core.throttling.ConcurrencyThrottle``.
+
+    The count is released once the whole response, including the other
+    middleware, is done.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            key = getattr(request, 'in_flight_key', None)
+            if key is not None:
+                try:
+                    cache.decr(key)
+                except ValueError:
+                    pass
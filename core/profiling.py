@@ -0,0 +1,75 @@
+"""Helpers for the sampling profiler in ``core.middleware``.
+
+Each profiled request is written to ``PROFILING_DIR`` as a ``.prof``
+file (readable with ``pstats`` or snakeviz) plus a ``.json`` file with
+the view, the timings and the time spent in each request phase.
+"""
+import json
+import os
+import pstats
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+
+# Entry points of each phase as (file path suffix, function name). A phase
+# takes the largest cumulative time among its entry points, since they may
+# call each other (e.g. ListSerializer and Serializer.to_representation).
+# Queries issued while serializing count towards both phases.
+PHASES = {
+    'auth': [('rest_framework/views.py', 'perform_authentication')],
+    'permissions': [
+        ('rest_framework/views.py', 'check_permissions'),
+        ('rest_framework/views.py', 'check_object_permissions'),
+    ],
+    'queryset': [('django/db/models/sql/compiler.py', 'execute_sql')],
+    'serialization': [('rest_framework/serializers.py', 'to_representation')],
+    'rendering': [('rest_framework/response.py', 'rendered_content')],
+}
+
+
+def profile_dir():
+    """Return the directory profiles are written to."""
+    return Path(getattr(settings, 'PROFILING_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+def phase_times(stats):
+    """Return the cumulative seconds spent in each phase of a pstats.Stats."""
+    times = dict.fromkeys(PHASES, 0.0)
+    for (filename, _, funcname), (_, _, _, cumulative, _) in stats.stats.items():
+        path = filename.replace(os.sep, '/')
+        for phase, entries in PHASES.items():
+            if any(path.endswith(suffix) and funcname == name for suffix, name in entries):
+                times[phase] = max(times[phase], cumulative)
+    return times
+
+
+def save_profile(profiler, request, response, duration):
+    """Write a profile and its metadata, returning the file name stem."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    match = request.resolver_match
+    view = match._func_path if match else 'unresolved'
+    stem = f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{time.perf_counter_ns()}'
+    profiler.dump_stats(directory / f'{stem}.prof')
+    stats = pstats.Stats(str(directory / f'{stem}.prof'))
+    meta = {
+        'view': view,
+        'method': request.method,
+        'path': request.path,
+        'status': response.status_code,
+        'duration': duration,
+        'phases': phase_times(stats),
+    }
+    (directory / f'{stem}.json').write_text(json.dumps(meta))
+    return stem
+
+
+def load_profiles(directory=None):
+    """Yield (metadata, .prof path) for every saved profile."""
+    directory = Path(directory) if directory else profile_dir()
+    for meta_path in sorted(directory.glob('*.json')):
+        prof_path = meta_path.with_suffix('.prof')
+        if prof_path.exists():
+            yield json.loads(meta_path.read_text()), prof_path
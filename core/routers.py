@@ -0,0 +1,78 @@
+"""Route reads of safe requests to read replicas.
+
+Replicas are the database aliases listed in ``DATABASE_REPLICAS``. During
+a GET, HEAD or OPTIONS request, reads of models in ``REPLICA_APPS`` go to a
+random replica; everything else, writes and reads outside of requests use
+``default``. After a client writes, its reads stay on ``default`` for
+``REPLICA_STICKY_SECONDS`` so it sees its own changes despite replication
+lag. Clients are told apart by their Authorization header or session.
+The sticky flag is kept in the default cache, which therefore has to be
+shared by all workers; settings refuse replicas without ``CACHE_URL``.
+"""
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def client_id(request):
+    """Return a hash identifying the client of a request by its credentials, or None."""
+    credential = request.headers.get('Authorization') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return hashlib.sha256(credential.encode()).hexdigest()
+
+
+def _client_key(request):
+    """Return the stickiness cache key of the client of a request, or None."""
+    client = client_id(request)
+    return client and 'replica-sticky:' + client
+
+
+def begin_request(request):
+    """Decide whether the reads of a request may use a replica.
+
+    Returns a token for ``end_request``.
+    """
+    key = _client_key(request)
+    replica = (
+        bool(getattr(settings, 'DATABASE_REPLICAS', ()))
+        and request.method in SAFE_METHODS
+        and not (key and cache.get(key))
+    )
+    return _read_from_replica.set(replica)
+
+
+def end_request(request, token):
+    """Make the client sticky to the primary after a write."""
+    _read_from_replica.reset(token)
+    if request.method not in SAFE_METHODS and getattr(settings, 'DATABASE_REPLICAS', ()):
+        key = _client_key(request)
+        if key:
+            cache.set(key, True, getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+
+
+class ReplicaRouter:
+    """Send reads of safe requests to a replica, everything else to default."""
+
+    def db_for_read(self, model, **hints):
+        """Return a random replica when the current request allows it."""
+        replicas = getattr(settings, 'DATABASE_REPLICAS', ())
+        if replicas and _read_from_replica.get() and model._meta.app_label in settings.REPLICA_APPS:
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        """Always write to the primary, even for objects read from a replica."""
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Replicas hold the same data as the primary."""
+        return True
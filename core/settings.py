@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 import os
 from pathlib import Path
 
+from core.caches import cache_config, require_shared_cache
+from core.database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,9 +48,16 @@ INSTALLED_APPS = [
     'corsheaders',
     'auth_app',
     'kanban_app',
+    'jobs_app',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ConcurrencyLimitMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'kanban_app.middleware.ActivityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -82,17 +92,65 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Configured through DATABASE_URL and the DB_* variables, see core/database.py.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(os.environ, f"sqlite:///{(BASE_DIR / 'db.sqlite3').as_posix()}"),
+}
+
+# Read replicas: comma separated URLs in DATABASE_REPLICA_URLS. Reads of
+# GET requests in REPLICA_APPS are routed to them, see core/routers.py.
+DATABASE_REPLICAS = []
+for index, url in enumerate(u for u in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if u):
+    alias = f'replica{index}'
+    DATABASES[alias] = database_config({**os.environ, 'DATABASE_URL': url}, url)
+    # Tests run against the primary's test database only.
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+REPLICA_APPS = ['kanban_app', 'auth_app', 'auth']
+REPLICA_STICKY_SECONDS = 5
+
+# Cache: CACHE_URL, see core/caches.py. Must be Redis or Memcached when
+# running several worker processes; the per-process default only suits a
+# single process.
+CACHES = {
+    'default': cache_config(os.environ),
 }
+# The read-your-writes window is kept in the cache; with a per-process
+# cache a write on one worker would not pin the next read on another.
+if DATABASE_REPLICAS:
+    require_shared_cache(CACHES['default'], 'DATABASE_REPLICA_URLS')
 
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
+# Password hashing
+# Argon2 is preferred when argon2-cffi is installed. Stored hashes of the
+# other hashers keep working and are upgraded on the next login.
+try:
+    import argon2  # noqa: F401
+except ImportError:
+    _PREFERRED_HASHERS = []
+else:
+    _PREFERRED_HASHERS = ['django.contrib.auth.hashers.Argon2PasswordHasher']
+PASSWORD_HASHERS = _PREFERRED_HASHERS + [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_HASHERS = list(dict.fromkeys(PASSWORD_HASHERS))
+
+# Hashes run on a pool of PASSWORD_HASHING_THREADS threads per process
+# (auth_app.hashing); at most PASSWORD_HASHING_QUEUE more wait up to
+# PASSWORD_HASHING_TIMEOUT seconds, later logins get a 503.
+PASSWORD_HASHING_THREADS = int(os.environ.get('PASSWORD_HASHING_THREADS', 2))
+PASSWORD_HASHING_QUEUE = 32
+PASSWORD_HASHING_TIMEOUT = 5
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -144,13 +202,104 @@ CORS_ALLOW_CREDENTIALS = True
 # Django REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.authentication.ExpiringTokenAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.TokenBucketThrottle',
+        'core.throttling.ConcurrencyThrottle',
+    ],
 }
 
 # Disable trailing slash requirement for API simplicity
-APPEND_SLASH = False
\ No newline at end of file
+APPEND_SLASH = False
+
+# Query instrumentation (core.middleware.QueryInstrumentationMiddleware)
+# Requests running more queries than their budget are logged. Budgets are
+# keyed by URL name; SQL repeated more often than the threshold is logged
+# as a possible N+1.
+QUERY_BUDGET_DEFAULT = 50
+QUERY_BUDGETS = {
+    'board-detail': 20,
+    'ticket-list': 20,
+}
+QUERY_REPEAT_THRESHOLD = 10
+
+# Request profiling (core.middleware.ProfilingMiddleware)
+# A random share of requests is profiled; staff users can also profile a
+# single request by sending the X-Profile header.
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+PROFILING_HEADER = 'X-Profile'
+PROFILING_DIR = BASE_DIR / 'profiles'
+
+# Metrics (core.metrics, served at /metrics)
+# With several worker processes set METRICS_DIR to a directory shared by
+# all of them. If METRICS_TOKEN is set, scrapers must send it as a bearer
+# token.
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Background jobs (jobs_app, run with `manage.py run_worker`)
+# Workers poll every JOBS_POLL_INTERVAL seconds. Failed jobs are retried
+# after JOBS_RETRY_DELAY seconds, doubling per attempt; jobs running
+# longer than JOBS_LOCK_TIMEOUT are assumed lost and queued again.
+# purge_jobs deletes finished jobs after JOBS_RETENTION_DAYS.
+JOBS_POLL_INTERVAL = 1
+JOBS_MAX_ATTEMPTS = 3
+JOBS_RETRY_DELAY = 10
+JOBS_LOCK_TIMEOUT = 600
+JOBS_RETENTION_DAYS = 30
+
+# Board deletion (kanban_app.deletion)
+# With BOARD_DELETE_ASYNC a deleted board is hidden at once and its rows
+# are removed by a background job.
+BOARD_DELETE_ASYNC = os.environ.get('BOARD_DELETE_ASYNC', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Search indexing of imported boards (kanban_app.importers)
+# With SEARCH_INDEX_ASYNC imported boards are indexed by a background job
+# instead of inside the import request.
+SEARCH_INDEX_ASYNC = os.environ.get('SEARCH_INDEX_ASYNC', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Ticket archive (archive_done_tickets)
+# Tickets done and unchanged for this many days are archived.
+TICKET_ARCHIVE_AFTER_DAYS = 30
+
+# Activity log (kanban_app.activity, trimmed by compact_activity)
+# Entries older than ACTIVITY_RETENTION_DAYS are deleted, and every board
+# keeps at most ACTIVITY_MAX_PER_BOARD entries.
+ACTIVITY_RETENTION_DAYS = 180
+ACTIVITY_MAX_PER_BOARD = 10000
+
+# Rate limiting (core.throttling.TokenBucketThrottle)
+# Every client has a bucket of THROTTLE_CAPACITY tokens per endpoint,
+# refilled at THROTTLE_REFILL_RATE tokens per second. A request takes the
+# cost of its URL name (default 1). 0 disables throttling.
+THROTTLE_CAPACITY = int(os.environ.get('THROTTLE_CAPACITY', 60))
+THROTTLE_REFILL_RATE = 1.0
+THROTTLE_COSTS = {
+    'board-detail': 5,
+    'ticket-list': 5,
+    'board-stats': 2,
+    'board-import': 20,
+    'board-archive': 2,
+    'search': 3,
+}
+
+# Concurrency limit (core.throttling.ConcurrencyThrottle)
+# Requests beyond MAX_CONCURRENT_REQUESTS in flight per client get a 429.
+# Both limits use the default cache, which has to be shared by all
+# processes (CACHE_URL) when running several workers.
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('MAX_CONCURRENT_REQUESTS', 8))
+CONCURRENCY_KEY_TIMEOUT = 60
+
+# Token expiry (auth_app.authentication, cleaned up by purge_expired_tokens)
+# Tokens unused for TOKEN_TTL seconds expire. Uses are tracked in the
+# cache, refreshed at most every TOKEN_TOUCH_INTERVAL seconds, and saved
+# in batches at most every TOKEN_USAGE_FLUSH_INTERVAL seconds per process.
+TOKEN_TTL = int(os.environ.get('TOKEN_TTL', 14 * 24 * 60 * 60))
+TOKEN_TOUCH_INTERVAL = 5 * 60
+TOKEN_USAGE_FLUSH_INTERVAL = 60
@@ -0,0 +1,37 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from core.caches import cache_config, is_shared, parse_cache_url, require_shared_cache
+
+
+class CacheConfigTest(SimpleTestCase):
+    """Test building the default cache from the environment"""
+
+    def test_default_is_local(self):
+        """Test that without CACHE_URL each process has its own cache"""
+        config = cache_config({})
+        self.assertEqual(config['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+        self.assertFalse(is_shared(config))
+
+    def test_redis(self):
+        """Test that Redis URLs are passed on whole"""
+        config = parse_cache_url('redis://cache.local:6379/1')
+        self.assertEqual(config['BACKEND'], 'django.core.cache.backends.redis.RedisCache')
+        self.assertEqual(config['LOCATION'], 'redis://cache.local:6379/1')
+        self.assertTrue(is_shared(config))
+
+    def test_memcached_hosts(self):
+        """Test that several Memcached hosts are split"""
+        config = cache_config({'CACHE_URL': 'memcached://a:11211,b:11211'})
+        self.assertEqual(config['LOCATION'], ['a:11211', 'b:11211'])
+
+    def test_unknown_scheme(self):
+        """Test that unsupported schemes are rejected"""
+        with self.assertRaises(ImproperlyConfigured):
+            parse_cache_url('file:///tmp/cache')
+
+    def test_require_shared_cache(self):
+        """Test that features needing a shared cache reject the local one"""
+        with self.assertRaisesMessage(ImproperlyConfigured, 'DATABASE_REPLICA_URLS'):
+            require_shared_cache(cache_config({}), 'DATABASE_REPLICA_URLS')
+        require_shared_cache(cache_config({'CACHE_URL': 'redis://localhost'}), 'DATABASE_REPLICA_URLS')
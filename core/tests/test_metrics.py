@@ -0,0 +1,136 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.metrics import BOARD_CACHE, Histogram, registry
+from kanban_app.models import Board
+
+
+def sample(text, name):
+    """Return the value of an exposition line starting with ``name``."""
+    match = re.search(rf'^{re.escape(name)} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+class MetricsTest(TestCase):
+    """Test request metrics and the /metrics endpoint"""
+
+    def setUp(self):
+        """Create and authenticate a user with a board"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+
+    def metrics(self):
+        """Return the current exposition text"""
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_request_metrics(self):
+        """Test that latency, query count and size are recorded per route"""
+        count = 'http_request_duration_seconds_count{method="GET",route="my-tasks",status="200"}'
+        before = sample(self.metrics(), count)
+        self.client.get('/api/tasks/mine/')
+        text = self.metrics()
+        self.assertEqual(sample(text, count), before + 1)
+        self.assertIn('http_request_db_queries_bucket{route="my-tasks",le="2"}', text)
+        self.assertIn('http_response_size_bytes_count{route="my-tasks"}', text)
+
+    def test_board_cache_hits(self):
+        """Test that board stats cache lookups are counted"""
+        hit = 'board_cache_requests_total{name="stats",result="hit"}'
+        before = sample(self.metrics(), hit)
+        self.client.get(f'/api/boards/{self.board.id}/stats/')
+        self.client.get(f'/api/boards/{self.board.id}/stats/')
+        self.assertEqual(sample(self.metrics(), hit), before + 1)
+
+    def test_user_directory_cache_hits(self):
+        """Test that user directory cache lookups are counted"""
+        hit = 'board_cache_requests_total{name="users",result="hit"}'
+        not_modified = 'board_cache_requests_total{name="users",result="not_modified"}'
+        text = self.metrics()
+        before = sample(text, hit), sample(text, not_modified)
+        self.client.get('/api/users/')
+        etag = self.client.get('/api/users/')['ETag']
+        self.client.get('/api/users/', HTTP_IF_NONE_MATCH=etag)
+        text = self.metrics()
+        self.assertEqual((sample(text, hit), sample(text, not_modified)), (before[0] + 1, before[1] + 1))
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test the exposition of a histogram"""
+        histogram = Histogram('test_seconds', 'Test.', buckets=(1, 5))
+        histogram.observe(0.5)
+        histogram.observe(3)
+        histogram.observe(7)
+        self.assertEqual(histogram.lines(histogram.values)[2:], [
+            'test_seconds_bucket{le="1"} 1',
+            'test_seconds_bucket{le="5"} 2',
+            'test_seconds_bucket{le="+Inf"} 3',
+            'test_seconds_sum 10.5',
+            'test_seconds_count 3',
+        ])
+
+    def test_multiprocess_aggregation(self):
+        """Test that values written by other workers are summed"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        hit = 'board_cache_requests_total{name="stats",result="hit"}'
+        key = ('stats', 'hit')
+        local = BOARD_CACHE.values.get(key, 0)
+        # The parent process stands in for another live worker.
+        Path(directory, f'metrics-{os.getppid()}.json').write_text(
+            json.dumps({BOARD_CACHE.name: [[list(key), 5]]})
+        )
+        with override_settings(METRICS_DIR=directory):
+            text = registry.render()
+        self.assertEqual(sample(text, hit), local + 5)
+        self.assertTrue(Path(directory, f'metrics-{os.getpid()}.json').exists())
+
+    def test_files_of_dead_workers_are_dropped(self):
+        """Test that only files of dead workers leave the totals and exiting workers remove theirs"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        hit = 'board_cache_requests_total{name="stats",result="hit"}'
+        key = ('stats', 'hit')
+        local = BOARD_CACHE.values.get(key, 0)
+        exited = subprocess.Popen([sys.executable, '-c', ''])
+        exited.wait()
+        dead = Path(directory, f'metrics-{exited.pid}.json')
+        dead.write_text(json.dumps({BOARD_CACHE.name: [[list(key), 5]]}))
+        idle = Path(directory, f'metrics-{os.getppid()}.json')
+        idle.write_text(json.dumps({BOARD_CACHE.name: [[list(key), 3]]}))
+        old = time.time() - 600
+        os.utime(idle, (old, old))
+        with override_settings(METRICS_DIR=directory):
+            text = registry.render()
+            self.assertEqual(sample(text, hit), local + 3)
+            self.assertFalse(dead.exists())
+            own = Path(directory, f'metrics-{os.getpid()}.json')
+            self.assertTrue(own.exists())
+            registry.remove_file()
+        self.assertFalse(own.exists())
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_required(self):
+        """Test that a configured token protects the endpoint"""
+        self.client.credentials()
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
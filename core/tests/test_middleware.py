@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.middleware import sql_shape
+from kanban_app.models import Board, Ticket, Comment
+
+
+class SQLShapeTest(TestCase):
+    """Test grouping of SQL statements by shape"""
+
+    def test_literals_and_in_lists_collapse(self):
+        """Test that statements differing in literals share a shape"""
+        first = sql_shape('SELECT * FROM t WHERE id IN (%s, %s) AND x = 1')
+        second = sql_shape('SELECT * FROM t WHERE id IN (%s) AND x = 22')
+        self.assertEqual(first, second)
+
+
+class QueryInstrumentationMiddlewareTest(TestCase):
+    """Test query counting, budgets and N+1 detection"""
+
+    def setUp(self):
+        """Create a board with commented tickets"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+        self.ticket = Ticket.objects.create(board=self.board, title='Ticket')
+        for i in range(3):
+            Comment.objects.create(ticket=self.ticket, author=self.user, text=f'Comment {i}')
+
+    def test_server_timing_header(self):
+        """Test that the response reports database time and query count"""
+        response = self.client.get('/api/tasks/mine/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="2 queries", total;dur=')
+
+    @override_settings(QUERY_BUDGETS={'my-tasks': 1})
+    def test_budget_exceeded(self):
+        """Test that requests over their route budget are logged"""
+        with self.assertLogs('core.queries', 'WARNING') as logs:
+            self.client.get('/api/tasks/mine/')
+        self.assertIn('ran 2 queries, budget is 1', logs.output[0])
+
+    @override_settings(QUERY_REPEAT_THRESHOLD=2)
+    def test_repeated_queries_are_reported(self):
+        """Test that the same query shape repeated per row is logged with the view"""
+        with self.assertLogs('core.queries', 'WARNING') as logs:
+            self.client.get(f'/api/tasks/{self.ticket.id}/comments/')
+        self.assertIn('Possible N+1 in kanban_app.api.views.TicketViewSet', logs.output[0])
+
+    def test_no_report_within_limits(self):
+        """Test that nothing is logged for well behaved requests"""
+        with self.assertNoLogs('core.queries', 'WARNING'):
+            self.client.get('/api/tasks/mine/')
@@ -0,0 +1,84 @@
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.profiling import PHASES, load_profiles
+from kanban_app.models import Board, Ticket
+
+
+class ProfilingMiddlewareTest(TestCase):
+    """Test sampled and header triggered request profiling"""
+
+    def setUp(self):
+        """Create a board and a temporary profile directory"""
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+        Ticket.objects.create(board=self.board, title='Ticket')
+        self.url = f'/api/boards/{self.board.id}/'
+
+    def profiles(self):
+        """Return the metadata of all saved profiles"""
+        return [meta for meta, _ in load_profiles(self.directory)]
+
+    def test_sampled_request(self):
+        """Test that sampled requests are written with their phases"""
+        with self.settings(PROFILING_DIR=self.directory, PROFILING_SAMPLE_RATE=1):
+            response = self.client.get(self.url)
+        self.assertIn('X-Profile-Id', response)
+        [meta] = self.profiles()
+        self.assertEqual(meta['view'], 'kanban_app.api.views.BoardDetailView')
+        self.assertEqual(set(meta['phases']), set(PHASES))
+        self.assertGreater(meta['phases']['queryset'], 0)
+        self.assertGreater(meta['phases']['serialization'], 0)
+
+    def test_not_sampled(self):
+        """Test that nothing is profiled by default"""
+        with self.settings(PROFILING_DIR=self.directory):
+            response = self.client.get(self.url)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(self.profiles(), [])
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_header_requires_staff(self):
+        """Test that the profiling header is honoured for staff users only"""
+        with self.settings(PROFILING_DIR=self.directory):
+            self.client.get(self.url, HTTP_X_PROFILE='1')
+            self.assertEqual(self.profiles(), [])
+            self.user.is_staff = True
+            self.user.save()
+            self.client.get(self.url, HTTP_X_PROFILE='1')
+        self.assertEqual(len(self.profiles()), 1)
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_header_without_staff_is_not_profiled(self):
+        """Test that non-staff and anonymous requests with the header run without the profiler"""
+        with self.settings(PROFILING_DIR=self.directory), mock.patch('core.middleware.cProfile.Profile') as profile:
+            self.client.get(self.url, HTTP_X_PROFILE='1')
+            APIClient().get(self.url, HTTP_X_PROFILE='1')
+            APIClient(HTTP_AUTHORIZATION='Token made-up').get(self.url, HTTP_X_PROFILE='1')
+        profile.assert_not_called()
+
+    def test_summary_command(self):
+        """Test that the summary lists views with phases and top functions"""
+        with self.settings(PROFILING_DIR=self.directory, PROFILING_SAMPLE_RATE=1):
+            self.client.get(self.url)
+            self.client.get(self.url)
+        out = StringIO()
+        call_command('profile_summary', dir=self.directory, limit=5, stdout=out)
+        output = out.getvalue()
+        self.assertIn('kanban_app.api.views.BoardDetailView: 2 requests', output)
+        self.assertIn('serialization', output)
+        self.assertIn('cumulative', output)
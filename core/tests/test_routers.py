@@ -0,0 +1,100 @@
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.routers import ReplicaRouter
+from kanban_app.models import Board
+
+
+REPLICA = 'replica'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTest(TransactionTestCase):
+    """Test read routing against a second SQLite database acting as replica
+
+    The replica is not replicated, so reads that see only replica rows
+    prove that they were routed there.
+    """
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        """Add a migrated SQLite file database under the replica alias"""
+        cls.directory = tempfile.mkdtemp()
+        path = str(Path(cls.directory) / 'replica.sqlite3')
+        connections.settings[REPLICA] = {
+            **connections['default'].settings_dict, 'NAME': path,
+            'TEST': {**connections['default'].settings_dict['TEST'], 'NAME': path},
+        }
+        call_command('migrate', database=REPLICA, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the replica alias and its file"""
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        shutil.rmtree(cls.directory)
+
+    def setUp(self):
+        """Create the same user on both databases, with different boards"""
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        User.objects.using(REPLICA).create(id=self.user.id, username='testuser')
+        token = Token.objects.create(user=self.user)
+        Board.objects.create(title='Primary Board', owner=self.user)
+        Board.objects.using(REPLICA).create(title='Replica Board', owner_id=self.user.id)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def board_titles(self):
+        """Return the titles of the board list"""
+        return [board['title'] for board in self.client.get('/api/boards/').data]
+
+    def test_reads_use_replica(self):
+        """Test that GET requests read from the replica"""
+        self.assertEqual(self.board_titles(), ['Replica Board'])
+
+    def test_reads_after_write_stick_to_primary(self):
+        """Test that a client reads its own writes during the sticky window"""
+        response = self.client.post('/api/boards/', {'title': 'New Board', 'members': []}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sorted(self.board_titles()), ['New Board', 'Primary Board'])
+        self.assertFalse(Board.objects.using(REPLICA).filter(title='New Board').exists())
+
+    def test_stickiness_is_per_client(self):
+        """Test that other clients keep reading from the replica"""
+        self.client.post('/api/boards/', {'title': 'New Board', 'members': []}, format='json')
+        other = User.objects.create_user(username='other')
+        User.objects.using(REPLICA).create(id=other.id, username='other')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=other).key}')
+        self.assertEqual(client.get('/api/boards/').data, [])
+        self.assertEqual(sorted(self.board_titles()), ['New Board', 'Primary Board'])
+
+    @override_settings(REPLICA_STICKY_SECONDS=0.05)
+    def test_stickiness_expires(self):
+        """Test that reads return to the replica after the sticky window"""
+        self.client.post('/api/boards/', {'title': 'New Board', 'members': []}, format='json')
+        time.sleep(0.1)
+        self.assertEqual(self.board_titles(), ['Replica Board'])
+
+    def test_outside_requests(self):
+        """Test that reads outside of requests and all writes use the primary"""
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Board))
+        self.assertEqual(router.db_for_write(Board), 'default')
+        self.assertEqual(list(Board.objects.values_list('title', flat=True)), ['Primary Board'])
@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from kanban_app.models import Board
+
+
+@override_settings(THROTTLE_CAPACITY=10, THROTTLE_REFILL_RATE=1.0, THROTTLE_COSTS={'ticket-list': 4})
+class TokenBucketThrottleTest(TestCase):
+    """Test weighted token buckets per client and endpoint"""
+
+    def setUp(self):
+        """Create an authenticated client"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+
+    def test_expensive_endpoint_drains_faster(self):
+        """Test that a cost of 4 allows two calls from a bucket of 10"""
+        with mock.patch('core.throttling.time.time', return_value=1000.0):
+            self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_200_OK)
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # 2 tokens left, 2 more needed at 1 token per second
+        self.assertEqual(response['Retry-After'], '2')
+
+    def test_bucket_refills(self):
+        """Test that tokens come back over time"""
+        with mock.patch('core.throttling.time.time', return_value=1000.0):
+            self.client.get('/api/tasks/')
+            self.client.get('/api/tasks/')
+        with mock.patch('core.throttling.time.time', return_value=1002.0):
+            self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_200_OK)
+
+    def test_buckets_per_endpoint_and_client(self):
+        """Test that other endpoints and other clients are not affected"""
+        with mock.patch('core.throttling.time.time', return_value=1000.0):
+            self.client.get('/api/tasks/')
+            self.client.get('/api/tasks/')
+            self.assertEqual(self.client.get('/api/boards/').status_code, status.HTTP_200_OK)
+            other = User.objects.create_user(username='other')
+            self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=other).key}')
+            self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_200_OK)
+
+    def test_tokens_of_one_user_share_a_bucket(self):
+        """Test that a second token of the same user does not get a new budget"""
+        with mock.patch('core.throttling.time.time', return_value=1000.0):
+            self.client.get('/api/tasks/')
+            self.client.get('/api/tasks/')
+            self.token.delete()
+            self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(THROTTLE_COSTS={'login': 4})
+    def test_made_up_credentials_do_not_reset_the_bucket(self):
+        """Test that anonymous clients are throttled by IP whatever header they send"""
+        client = APIClient()
+        with mock.patch('core.throttling.time.time', return_value=1000.0):
+            for i in range(3):
+                client.credentials(HTTP_AUTHORIZATION=f'Token bogus{i}')
+                response = client.post('/api/login/', {'email': 'test@example.com', 'password': 'wrong'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(THROTTLE_CAPACITY=0)
+    def test_disabled(self):
+        """Test that a capacity of 0 turns throttling off"""
+        for _ in range(5):
+            self.assertEqual(self.client.get('/api/tasks/').status_code, status.HTTP_200_OK)
+
+
+@override_settings(MAX_CONCURRENT_REQUESTS=2)
+class ConcurrencyThrottleTest(TestCase):
+    """Test the cap on requests in flight per client"""
+
+    def setUp(self):
+        """Create an authenticated client"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.key = f'in-flight:user:{self.user.pk}'
+
+    def test_requests_beyond_limit_are_rejected(self):
+        """Test that a client with two requests in flight gets a 429"""
+        cache.set(self.key, 2)
+        response = self.client.get('/api/boards/')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(cache.get(self.key), 2)
+
+    def test_count_is_released_after_request(self):
+        """Test that finished requests no longer count"""
+        cache.set(self.key, 1)
+        self.assertEqual(self.client.get('/api/boards/').status_code, status.HTTP_200_OK)
+        self.assertEqual(cache.get(self.key), 1)
+
+    def test_anonymous_clients_are_counted_by_ip(self):
+        """Test that anonymous requests count against their IP address"""
+        cache.set('in-flight:ip:127.0.0.1', 2)
+        client = APIClient(HTTP_AUTHORIZATION='Token made-up')
+        response = client.post('/api/login/', {'email': 'test@example.com', 'password': 'wrong'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(cache.get('in-flight:ip:127.0.0.1'), 2)
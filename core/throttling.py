@@ -0,0 +1,98 @@
+"""Per-client rate limiting with token buckets kept in Django's cache.
+
+Every client has one bucket per endpoint (URL name) holding up to
+``THROTTLE_CAPACITY`` tokens, refilled at ``THROTTLE_REFILL_RATE`` tokens
+per second. A request takes ``THROTTLE_COSTS[url name]`` tokens (default
+1), so expensive endpoints allow fewer calls in the same time. Clients
+are authenticated users, told apart by their id however many tokens or
+sessions they have, and anonymous callers by IP address; the raw
+credentials are not used, as anyone can make up a new one per request.
+``ConcurrencyThrottle`` caps the requests in flight per client the same
+way.
+
+A bucket is read and written without a lock, so concurrent requests of
+one client may occasionally both take the last tokens. With several
+server processes the default cache must be shared (Redis, Memcached).
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rest_framework.throttling import BaseThrottle
+
+
+def take_tokens(key, cost, capacity, rate):
+    """Take ``cost`` tokens from a bucket; return 0 or the seconds until they are available."""
+    now = time.time()
+    tokens, last = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - last) * rate)
+    if tokens < cost:
+        return (cost - tokens) / rate
+    # An untouched bucket is full again after capacity / rate seconds.
+    cache.set(key, (tokens - cost, now), math.ceil(capacity / rate))
+    return 0
+
+
+def throttle_client(request, throttle):
+    """Return the key of the client of an authenticated DRF request."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{throttle.get_ident(request)}'
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle each client and endpoint with a weighted token bucket."""
+
+    def allow_request(self, request, view):
+        """Take the endpoint's cost from the client's bucket."""
+        capacity = getattr(settings, 'THROTTLE_CAPACITY', 0)
+        if not capacity:
+            return True
+        match = request.resolver_match
+        endpoint = match.url_name if match and match.url_name else type(view).__name__
+        cost = min(getattr(settings, 'THROTTLE_COSTS', {}).get(endpoint, 1), capacity)
+        client = throttle_client(request, self)
+        self.wait_seconds = take_tokens(
+            f'throttle:{client}:{endpoint}', cost, capacity, settings.THROTTLE_REFILL_RATE,
+        )
+        return not self.wait_seconds
+
+    def wait(self):
+        """Return the seconds until the request would be allowed, for Retry-After."""
+        return self.wait_seconds
+
+
+class ConcurrencyThrottle(BaseThrottle):
+    """Reject requests of clients that have too many requests in flight.
+
+    The in-flight count per client lives in the cache and expires after
+    ``CONCURRENCY_KEY_TIMEOUT`` seconds, so counts left behind by a killed
+    worker do not block a client forever. The count is taken here, after
+    authentication, and given back by ``core.middleware.ConcurrencyLimitMiddleware``
+    when the response is done.
+    """
+
+    def allow_request(self, request, view):
+        """Count the request in and allow it unless the client is over the limit."""
+        limit = getattr(settings, 'MAX_CONCURRENT_REQUESTS', 0)
+        django_request = request._request
+        if not limit or getattr(django_request, 'in_flight_key', None):
+            return True
+        key = f'in-flight:{throttle_client(request, self)}'
+        timeout = getattr(settings, 'CONCURRENCY_KEY_TIMEOUT', 60)
+        cache.add(key, 0, timeout)
+        try:
+            in_flight = cache.incr(key)
+        except ValueError:
+            # expired between add() and incr()
+            cache.set(key, 1, timeout)
+            in_flight = 1
+        django_request.in_flight_key = key
+        return in_flight <= limit
+
+    def wait(self):
+        """Ask the client to retry after a second."""
+        return 1
@@ -17,9 +17,13 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from core.views import metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
     # auth_app first so its URLs (like users/me/) are not caught by the kanban_app router
     path('api/', include('auth_app.api.urls')),
     path('api/', include('kanban_app.api.urls')),
+    path('api/', include('jobs_app.api.urls')),
 ]
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from jobs_app.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Admin configuration for Job model."""
+    list_display = [
+        'name', 'status', 'attempts', 'created_by', 'created_at', 'finished_at',
+    ]
+    list_filter = ['status', 'name', 'created_at']
+    search_fields = ['name', 'error', 'created_by__username']
+    readonly_fields = ['created_at', 'finished_at', 'locked_by', 'locked_at']
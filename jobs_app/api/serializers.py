@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+from jobs_app.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Serializer for the status of a Job."""
+
+    class Meta:
+        """Meta options for JobSerializer."""
+        model = Job
+        fields = [
+            'id', 'name', 'status', 'attempts', 'max_attempts', 'run_after',
+            'result', 'error', 'created_at', 'finished_at',
+        ]
+        read_only_fields = fields
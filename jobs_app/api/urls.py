@@ -0,0 +1,12 @@
+from django.urls import path, include
+
+from rest_framework.routers import DefaultRouter
+
+from jobs_app.api.views import JobViewSet
+
+router = DefaultRouter()
+router.register(r'jobs', JobViewSet, basename='job')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,38 @@
+from django.utils import timezone
+
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from jobs_app.api.serializers import JobSerializer
+from jobs_app.models import Job
+from kanban_app.api.pagination import OptionalPageNumberPagination
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Status of the background jobs started by the user."""
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = OptionalPageNumberPagination
+
+    def get_queryset(self):
+        """Return the user's jobs, newest first, optionally by ?status=."""
+        jobs = Job.objects.filter(created_by=self.request.user).order_by('-created_at', '-id')
+        if self.request.query_params.get('status'):
+            jobs = jobs.filter(status=self.request.query_params['status'])
+        return jobs
+
+    @action(detail=True, methods=['post'])
+    def retry(self, request, pk=None):
+        """Queue a failed job again with a fresh set of attempts."""
+        job = self.get_object()
+        retried = Job.objects.filter(pk=job.pk, status=Job.FAILED).update(
+            status=Job.QUEUED, attempts=0, run_after=timezone.now(), finished_at=None,
+        )
+        if not retried:
+            return Response(
+                {"detail": "Only failed jobs can be retried."}, status=status.HTTP_409_CONFLICT,
+            )
+        job.refresh_from_db()
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
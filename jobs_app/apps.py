@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class JobsAppConfig(AppConfig):
+    name = 'jobs_app'
+
+    def ready(self):
+        """Import the ``tasks`` module of every app so its tasks are registered."""
+        from django.utils.module_loading import autodiscover_modules
+
+        autodiscover_modules('tasks')
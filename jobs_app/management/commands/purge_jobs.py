@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs_app.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Deletes succeeded and failed jobs that finished longer ago than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.JOBS_RETENTION_DAYS,
+                            help='Keep finished jobs for this many days')
+        parser.add_argument('--chunk-size', type=int, default=900,
+                            help='Jobs deleted per statement')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        finished = Job.objects.filter(
+            status__in=[Job.SUCCEEDED, Job.FAILED], finished_at__lt=cutoff,
+        ).order_by('id').values_list('id', flat=True)
+        deleted = 0
+        while True:
+            ids = list(finished[:options['chunk_size']])
+            if ids:
+                deleted += Job.objects.filter(pk__in=ids).delete()[0]
+            if len(ids) < options['chunk_size']:
+                break
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} finished jobs.'))
@@ -0,0 +1,51 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs_app.worker import requeue_stale_jobs, run_next_job, worker_id
+
+
+class Command(BaseCommand):
+    help = 'Runs queued background jobs until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Run the jobs that are due now, then exit')
+        parser.add_argument('--max-jobs', type=int, help='Exit after running this many jobs')
+        parser.add_argument('--sleep', type=float, default=None,
+                            help='Seconds to wait when no job is due (default JOBS_POLL_INTERVAL)')
+
+    def handle(self, *args, **options):
+        sleep = options['sleep'] if options['sleep'] is not None else getattr(settings, 'JOBS_POLL_INTERVAL', 1)
+        worker = worker_id()
+        self.stopping = False
+        # Finish the current job on SIGTERM/SIGINT instead of abandoning it.
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.stop)
+        self.stdout.write(f'Worker {worker} started.')
+
+        done = 0
+        last_requeue = 0.0
+        while not self.stopping:
+            if time.monotonic() - last_requeue > 60:
+                requeue_stale_jobs()
+                last_requeue = time.monotonic()
+            close_old_connections()
+            job = run_next_job(worker)
+            if job is not None:
+                done += 1
+                self.stdout.write(f'Job {job.pk} ({job.name}) {job.status}.')
+                if options['max_jobs'] and done >= options['max_jobs']:
+                    break
+            elif options['once']:
+                break
+            else:
+                time.sleep(sleep)
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker} stopped after {done} jobs.'))
+
+    def stop(self, signum, frame):
+        """Signal handler: stop after the current job."""
+        self.stopping = True
@@ -0,0 +1,51 @@
+"""Registry of background tasks and the function to enqueue them.
+
+Apps register tasks in a ``tasks`` module, which is imported when Django
+starts::
+
+    @task('kanban.delete_board')
+    def delete_board(board_id):
+        ...
+
+    enqueue('kanban.delete_board', {'board_id': board.id}, user=request.user)
+
+The payload is passed as keyword arguments and must be JSON
+serializable; the return value is stored as the job result. A job is
+enqueued in the caller's transaction, so workers only see it once that
+transaction commits.
+"""
+from django.conf import settings
+from django.utils import timezone
+
+from jobs_app.models import Job
+
+
+TASKS = {}
+
+
+def task(name):
+    """Register the decorated function as the task ``name``."""
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def get_task(name):
+    """Return the function of a registered task; raises LookupError if unknown."""
+    try:
+        return TASKS[name]
+    except KeyError:
+        raise LookupError(f"Unknown task: {name!r}.")
+
+
+def enqueue(name, payload=None, user=None, max_attempts=None, run_after=None):
+    """Create a queued job for a registered task and return it."""
+    get_task(name)
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        created_by=user,
+        max_attempts=max_attempts or getattr(settings, 'JOBS_MAX_ATTEMPTS', 3),
+        run_after=run_after or timezone.now(),
+    )
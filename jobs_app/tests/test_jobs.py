@@ -0,0 +1,161 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from jobs_app.models import Job
+from jobs_app.tasks import enqueue, task
+from jobs_app.worker import claim_job, requeue_stale_jobs, run_next_job
+
+
+CALLS = []
+
+
+@task('tests.add')
+def add(a, b):
+    """Return the sum of two numbers"""
+    CALLS.append((a, b))
+    return a + b
+
+
+@task('tests.fail')
+def fail():
+    """Always raise"""
+    raise RuntimeError('boom')
+
+
+class WorkerTest(TestCase):
+    """Test claiming, running and retrying jobs"""
+
+    def setUp(self):
+        """Forget earlier task calls"""
+        CALLS.clear()
+
+    def test_enqueue_unknown_task(self):
+        """Test that only registered tasks can be enqueued"""
+        with self.assertRaises(LookupError):
+            enqueue('tests.unknown')
+        self.assertFalse(Job.objects.exists())
+
+    def test_run_job(self):
+        """Test that a job runs once and stores its result"""
+        job = enqueue('tests.add', {'a': 2, 'b': 3})
+        self.assertEqual(run_next_job('w1').pk, job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.attempts), (Job.SUCCEEDED, 5, 1))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(job.locked_by, '')
+        self.assertIsNone(run_next_job('w1'))
+        self.assertEqual(CALLS, [(2, 3)])
+
+    def test_claimed_job_is_not_claimed_again(self):
+        """Test that a running job is skipped by other workers"""
+        enqueue('tests.add', {'a': 1, 'b': 1})
+        job = claim_job('w1')
+        self.assertEqual((job.status, job.locked_by), (Job.RUNNING, 'w1'))
+        self.assertIsNone(claim_job('w2'))
+
+    def test_jobs_run_in_order_and_not_before_run_after(self):
+        """Test that future jobs wait"""
+        later = enqueue('tests.add', {'a': 1, 'b': 0}, run_after=timezone.now() + timedelta(minutes=5))
+        first = enqueue('tests.add', {'a': 2, 'b': 0})
+        self.assertEqual(run_next_job('w1').pk, first.pk)
+        self.assertIsNone(run_next_job('w1'))
+        later.refresh_from_db()
+        self.assertEqual(later.status, Job.QUEUED)
+
+    @override_settings(JOBS_RETRY_DELAY=10)
+    def test_failed_job_is_retried_with_backoff(self):
+        """Test that a failing job is queued again until max_attempts"""
+        job = enqueue('tests.fail', max_attempts=2)
+        run_next_job('w1')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn('RuntimeError: boom', job.error)
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=5))
+        self.assertIsNone(run_next_job('w1'))
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        run_next_job('w1')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    @override_settings(JOBS_LOCK_TIMEOUT=60)
+    def test_stale_jobs_are_requeued(self):
+        """Test that jobs of dead workers run again"""
+        job = enqueue('tests.add', {'a': 1, 'b': 2})
+        claim_job('w1')
+        self.assertEqual(requeue_stale_jobs(), 0)
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(run_next_job('w2').pk, job.pk)
+
+    def test_run_worker_once(self):
+        """Test that the command runs the due jobs and exits"""
+        enqueue('tests.add', {'a': 1, 'b': 2})
+        enqueue('tests.add', {'a': 3, 'b': 4})
+        out = StringIO()
+        call_command('run_worker', '--once', stdout=out)
+        self.assertIn('stopped after 2 jobs', out.getvalue())
+        self.assertEqual(Job.objects.filter(status=Job.SUCCEEDED).count(), 2)
+
+    def test_purge_finished_jobs(self):
+        """Test that only old succeeded and failed jobs are deleted"""
+        old = timezone.now() - timedelta(days=40)
+        succeeded, failed, queued, recent = (enqueue('tests.add', {'a': 1, 'b': 1}) for _ in range(4))
+        Job.objects.filter(pk=succeeded.pk).update(status=Job.SUCCEEDED, finished_at=old)
+        Job.objects.filter(pk=failed.pk).update(status=Job.FAILED, finished_at=old)
+        Job.objects.filter(pk=queued.pk).update(finished_at=old)
+        Job.objects.filter(pk=recent.pk).update(status=Job.SUCCEEDED, finished_at=timezone.now())
+        out = StringIO()
+        call_command('purge_jobs', '--days', '30', '--chunk-size', '1', stdout=out)
+        self.assertIn('Deleted 2 finished jobs', out.getvalue())
+        self.assertEqual(set(Job.objects.values_list('pk', flat=True)), {queued.pk, recent.pk})
+
+
+class JobAPITest(TestCase):
+    """Test the job status endpoints"""
+
+    def setUp(self):
+        """Create a user with a failed and a queued job and a job of someone else"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.failed = enqueue('tests.fail', user=self.user)
+        Job.objects.filter(pk=self.failed.pk).update(status=Job.FAILED, attempts=3)
+        self.queued = enqueue('tests.add', {'a': 1, 'b': 1}, user=self.user)
+        other = User.objects.create_user(username='other')
+        self.foreign = enqueue('tests.add', {'a': 1, 'b': 1}, user=other)
+
+    def test_list_own_jobs(self):
+        """Test that users only see their own jobs"""
+        response = self.client.get('/api/jobs/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([j['id'] for j in response.data], [self.queued.id, self.failed.id])
+        response = self.client.get('/api/jobs/', {'status': 'failed'})
+        self.assertEqual([j['id'] for j in response.data], [self.failed.id])
+
+    def test_job_detail(self):
+        """Test the status of a single job"""
+        response = self.client.get(f'/api/jobs/{self.queued.id}/')
+        self.assertEqual(response.data['status'], Job.QUEUED)
+        response = self.client.get(f'/api/jobs/{self.foreign.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_retry_failed_job(self):
+        """Test that failed jobs can be queued again"""
+        response = self.client.post(f'/api/jobs/{self.failed.id}/retry/')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual((response.data['status'], response.data['attempts']), (Job.QUEUED, 0))
+        response = self.client.post(f'/api/jobs/{self.queued.id}/retry/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
@@ -0,0 +1,93 @@
+"""Claiming and running jobs.
+
+Workers poll the job table. On PostgreSQL and MySQL the next due job is
+selected with ``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent
+workers never wait for each other's rows. The claim itself is an UPDATE
+conditional on the job still being queued, which keeps two workers from
+running the same job on databases without row locks (SQLite).
+
+A failed job is queued again with an exponential backoff starting at
+``JOBS_RETRY_DELAY`` seconds until it used ``max_attempts`` attempts.
+Jobs whose worker died are queued again once they have been running for
+``JOBS_LOCK_TIMEOUT`` seconds.
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs_app.models import Job
+from jobs_app.tasks import get_task
+
+
+logger = logging.getLogger(__name__)
+
+
+def worker_id():
+    """Return an identifier of this worker process."""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_job(worker):
+    """Mark the next due job as running for ``worker`` and return it, or None."""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.QUEUED, run_after__lte=now)
+            .order_by('run_after', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        claimed = Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F('attempts') + 1,
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    """Run a claimed job and record its result or error."""
+    now = timezone.now()
+    try:
+        result = get_task(job.name)(**job.payload)
+    except Exception:
+        logger.exception("Job %s (%s) failed, attempt %s of %s", job.pk, job.name, job.attempts, job.max_attempts)
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            delay = getattr(settings, 'JOBS_RETRY_DELAY', 10) * 2 ** (job.attempts - 1)
+            job.status, job.run_after = Job.QUEUED, now + timedelta(seconds=delay)
+        else:
+            job.status, job.finished_at = Job.FAILED, now
+    else:
+        job.status, job.result, job.error, job.finished_at = Job.SUCCEEDED, result, '', timezone.now()
+    job.locked_by, job.locked_at = '', None
+    job.save(update_fields=['status', 'result', 'error', 'run_after', 'finished_at', 'locked_by', 'locked_at'])
+    return job
+
+
+def requeue_stale_jobs():
+    """Queue jobs again whose worker stopped without finishing them."""
+    timeout = timedelta(seconds=getattr(settings, 'JOBS_LOCK_TIMEOUT', 600))
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=timezone.now() - timeout)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED, error='Worker timed out.', finished_at=timezone.now(), locked_by='', locked_at=None,
+    )
+    return failed + stale.update(status=Job.QUEUED, locked_by='', locked_at=None)
+
+
+def run_next_job(worker):
+    """Claim and run one job; return it, or None if nothing was due."""
+    job = claim_job(worker)
+    if job is not None:
+        run_job(job)
+    return job
@@ -0,0 +1,51 @@
+"""Recording of the board activity log.
+
+Signal receivers call ``record`` for ticket, comment and membership
+changes. During a request the entries are only collected, and
+``ActivityMiddleware`` writes them with a single bulk INSERT when the
+request ends, filling in the request's user as the actor. Outside of
+requests (commands, jobs) entries are written at once.
+
+The table only grows at the end; ``compact_activity`` keeps it bounded.
+"""
+from contextvars import ContextVar
+
+from kanban_app.models import Activity
+
+
+_pending = ContextVar('activity_pending', default=None)
+
+
+def record(board_id, verb, ticket_id=None, actor=None, **data):
+    """Log an activity on a board."""
+    entry = Activity(board_id=board_id, verb=verb, ticket_id=ticket_id, actor=actor, data=data)
+    pending = _pending.get()
+    if pending is None:
+        entry.save()
+    else:
+        pending.append(entry)
+
+
+def discard_board(board_id):
+    """Drop collected entries of a board that is being deleted."""
+    pending = _pending.get()
+    if pending:
+        pending[:] = [entry for entry in pending if entry.board_id != board_id]
+
+
+def begin_request():
+    """Start collecting entries; returns a token for ``end_request``."""
+    return _pending.set([])
+
+
+def end_request(token, user=None):
+    """Write the collected entries, ``user`` being the actor of those without one."""
+    pending = _pending.get()
+    _pending.reset(token)
+    if not pending:
+        return
+    if user is not None and user.is_authenticated:
+        for entry in pending:
+            if entry.actor_id is None:
+                entry.actor = user
+    Activity.objects.bulk_create(pending)
@@ -0,0 +1,186 @@
+from django.db.models import Count, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from rest_framework.exceptions import ValidationError
+
+
+TICKET_ORDERING_FIELDS = [
+    'id', 'title', 'status', 'priority', 'due_date', 'created_at', 'updated_at', 'rank',
+]
+
+# Model columns each serializer field needs when ``fields`` prunes the SELECT.
+TICKET_FIELD_COLUMNS = {
+    'id': ['id'],
+    'board': ['board'],
+    'title': ['title'],
+    'description': ['description'],
+    'status': ['status'],
+    'priority': ['priority'],
+    'due_date': ['due_date'],
+    'assignee': ['assignee'],
+    'reviewer': ['reviewer'],
+    'assigned_to': [],
+    'assigned_to_data': [],
+    'comments_count': [],
+    'subtickets': [],
+}
+
+
+def _parse_id(params, name):
+    """Return an integer query parameter or raise a 400 error."""
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: ["A valid integer is required."]})
+
+
+def _parse_date(params, name):
+    """Return a date query parameter or raise a 400 error."""
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        date = parse_date(value)
+    except ValueError:
+        date = None
+    if date is None:
+        raise ValidationError({name: ["Date must have the format YYYY-MM-DD."]})
+    return date
+
+
+def _parse_choices(params, name, choices):
+    """Return a list of comma separated choice values or raise a 400 error."""
+    value = params.get(name)
+    if value is None:
+        return None
+    values = [v for v in value.split(',') if v]
+    allowed = dict(choices)
+    invalid = [v for v in values if v not in allowed]
+    if invalid:
+        raise ValidationError({name: [f"Invalid choice: {', '.join(invalid)}."]})
+    return values
+
+
+def filter_tickets(queryset, params):
+    """Apply board, status, priority, user and due date filters."""
+    model = queryset.model
+    filters = {
+        'board_id': _parse_id(params, 'board'),
+        'assignee_id': _parse_id(params, 'assignee'),
+        'reviewer_id': _parse_id(params, 'reviewer'),
+        'status__in': _parse_choices(params, 'status', model.STATUS_CHOICES),
+        'priority__in': _parse_choices(params, 'priority', model.PRIORITY_CHOICES),
+        'due_date__lte': _parse_date(params, 'due_before'),
+        'due_date__gte': _parse_date(params, 'due_after'),
+    }
+    return queryset.filter(**{k: v for k, v in filters.items() if v is not None})
+
+
+def filter_due_tickets(queryset, params):
+    """Limit to tickets with a due date in range, or overdue ones.
+
+    ``overdue=true`` keeps tickets due before today that are not done.
+    Together with the board scope the filters use the
+    ``(board, due_date, status)`` index.
+    """
+    queryset = queryset.filter(due_date__isnull=False)
+    due_after = _parse_date(params, 'due_after')
+    due_before = _parse_date(params, 'due_before')
+    if due_after:
+        queryset = queryset.filter(due_date__gte=due_after)
+    if due_before:
+        queryset = queryset.filter(due_date__lte=due_before)
+    overdue = params.get('overdue', '').lower()
+    if overdue in ('1', 'true'):
+        queryset = queryset.filter(due_date__lt=timezone.localdate()).exclude(status='done')
+    elif overdue not in ('', '0', 'false'):
+        raise ValidationError({'overdue': ["Must be true or false."]})
+    return queryset.order_by('due_date', 'id')
+
+
+def order_tickets(queryset, params):
+    """Order by the comma separated ``ordering`` parameter."""
+    value = params.get('ordering')
+    if not value:
+        return queryset
+    ordering = [v for v in value.split(',') if v]
+    invalid = [v for v in ordering if v.lstrip('-') not in TICKET_ORDERING_FIELDS]
+    if invalid:
+        raise ValidationError({'ordering': [f"Invalid field: {', '.join(invalid)}."]})
+    return queryset.order_by(*ordering, 'id')
+
+
+def parse_ticket_fields(params):
+    """Return the requested sparse fieldset, or None for all fields."""
+    value = params.get('fields')
+    if not value:
+        return None
+    fields = [v for v in value.split(',') if v]
+    invalid = [v for v in fields if v not in TICKET_FIELD_COLUMNS]
+    if invalid:
+        raise ValidationError({'fields': [f"Invalid field: {', '.join(invalid)}."]})
+    return fields
+
+
+def select_ticket_fields(queryset, fields):
+    """Load only what the given serializer fields need, in as few queries as possible."""
+    wanted = TICKET_FIELD_COLUMNS if fields is None else fields
+    if fields is not None:
+        columns = {'id'}
+        for field in fields:
+            columns.update(TICKET_FIELD_COLUMNS[field])
+        queryset = queryset.only(*columns)
+    related = [f for f in ('assignee', 'reviewer') if f in wanted]
+    if related:
+        queryset = queryset.select_related(*related)
+    prefetch = [f for f in ('assigned_to', 'subtickets') if f in wanted]
+    if 'assigned_to_data' in wanted and 'assigned_to' not in prefetch:
+        prefetch.append('assigned_to')
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if 'comments_count' in wanted:
+        queryset = queryset.annotate(comments_count=Count('comments', distinct=True))
+    return queryset
+
+
+def _prefix(field, prefix):
+    """Return a condition matching values that start with ``prefix``.
+
+    A range instead of LIKE, so indexes on the field can be used on every
+    backend.
+    """
+    condition = Q(**{f'{field}__gte': prefix})
+    if ord(prefix[-1]) < 0x10FFFF:
+        condition &= Q(**{f'{field}__lt': prefix[:-1] + chr(ord(prefix[-1]) + 1)})
+    return condition
+
+
+def search_users(queryset, params):
+    """Filter users whose email, first or last name starts with ``search``.
+
+    ``search=ada lo`` also matches the first name ada with a last name
+    starting with lo. Matching is case-insensitive: emails are stored
+    lowercased and names are compared through the LOWER() indexes of the
+    auth_app migrations.
+    """
+    term = ' '.join(params.get('search', '').lower().split())
+    if not term:
+        return queryset
+    queryset = queryset.alias(
+        first_lower=Lower('first_name'), last_lower=Lower('last_name'),
+    )
+    # The email index is partial, without empty emails; the condition has
+    # to be repeated for it to be used.
+    condition = (
+        (_prefix('email', term) & ~Q(email=''))
+        | _prefix('first_lower', term) | _prefix('last_lower', term)
+    )
+    if ' ' in term:
+        first, last = term.split(' ', 1)
+        condition |= Q(first_lower=first) & _prefix('last_lower', last)
+    return queryset.filter(condition)
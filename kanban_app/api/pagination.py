@@ -0,0 +1,34 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class OptionalPageNumberPagination(PageNumberPagination):
+    """Paginate only when the client asks for ``page`` or ``page_size``.
+
+    Without either parameter the full list is returned as before, so
+    existing clients keep working.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return a page, or None when pagination was not requested."""
+        params = request.query_params
+        if self.page_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class ArchivePagination(PageNumberPagination):
+    """Always paginate, archives grow without bound."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class ActivityCursorPagination(CursorPagination):
+    """Newest first; cursors stay stable while new entries are appended."""
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
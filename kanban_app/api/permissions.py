@@ -47,6 +47,8 @@ class IsBoardMember(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         """Check if user is owner or member of the task's board."""
         board = obj.board
-        if board.owner == request.user:
+        if board.is_deleted:
+            return False
+        if board.owner_id == request.user.id:
             return True
-        return request.user in board.members.all()
+        return board.members.filter(id=request.user.id).exists()
@@ -84,23 +84,35 @@ class TicketSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
 
+    def __init__(self, *args, fields=None, **kwargs):
+        """Optionally limit the serialized output to the given fields."""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                if not self.fields[name].write_only:
+                    self.fields.pop(name)
+
     def validate(self, data):
         """Check that assignee and reviewer are board members."""
         board = data.get('board') or getattr(self.instance, 'board', None)
-        if not board:
+        users = {field: data[field] for field in ('assignee', 'reviewer') if data.get(field)}
+        if not board or not users:
             return data
-        board_user_ids = set(board.members.values_list('id', flat=True))
-        board_user_ids.add(board.owner_id)
-        for field in ('assignee', 'reviewer'):
-            user = data.get(field)
-            if user and user.id not in board_user_ids:
+        user_ids = {user.id for user in users.values()} - {board.owner_id}
+        board_user_ids = {board.owner_id}
+        if user_ids:
+            board_user_ids.update(board.members.filter(id__in=user_ids).values_list('id', flat=True))
+        for field, user in users.items():
+            if user.id not in board_user_ids:
                 raise serializers.ValidationError(
                     {f"{field}_id": f"User must be a member of the board."}
                 )
         return data
 
     def get_comments_count(self, obj):
-        """Return the number of comments on this ticket."""
+        """Return the number of comments, using the annotation if present."""
+        if hasattr(obj, 'comments_count'):
+            return obj.comments_count
         return obj.comments.count()
 
 
@@ -120,7 +132,9 @@ class TicketNestedSerializer(serializers.ModelSerializer):
         ]
 
     def get_comments_count(self, obj):
-        """Return the number of comments on this ticket."""
+        """Return the number of comments, using the annotation if present."""
+        if hasattr(obj, 'comments_count'):
+            return obj.comments_count
         return obj.comments.count()
 
 
@@ -144,15 +158,16 @@ class BoardListSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         """
         Returns the data in the format required for the list overview.
-        Includes membership and ticket statistics.
+        Includes membership and ticket statistics; archived tickets are not counted.
         """
+        tickets = instance.tickets.filter(is_archived=False)
         return {
             "id": instance.id,
             "title": instance.title,
             "member_count": instance.members.count(),
-            "ticket_count": instance.tickets.count(),
-            "tasks_to_do_count": instance.tickets.filter(status='to-do').count(),
-            "tasks_high_prio_count": instance.tickets.filter(priority='high').count(),
+            "ticket_count": tickets.count(),
+            "tasks_to_do_count": tickets.filter(status='to-do').count(),
+            "tasks_high_prio_count": tickets.filter(priority='high').count(),
             "owner_id": instance.owner_id,
         }
 
@@ -185,7 +200,7 @@ class BoardDetailSerializer(serializers.ModelSerializer):
             "title": instance.title,
             "owner_id": instance.owner_id,
             "members": UserSerializer(instance.members.all(), many=True).data,
-            "tasks": TicketNestedSerializer(instance.tickets.all(), many=True).data,
+            "tasks": TicketNestedSerializer(instance.tickets.filter(is_archived=False).order_by('rank', 'id'), many=True).data,
         }
 
 
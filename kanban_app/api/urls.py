@@ -3,9 +3,10 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from kanban_app.api.views import (
-    BoardListCreateView, BoardDetailView,
+    BoardListCreateView, BoardDetailView, BoardActivityView, BoardArchiveView, BoardImportView, BoardMoveView, BoardStatsView,
     TicketViewSet, CommentViewSet, SubticketViewSet,
-    UserViewSet, AssignedToMeView, ReviewingTasksView,
+    UserViewSet, AssignedToMeView, ReviewingTasksView, MyTasksView, DueTasksView,
+    SearchView,
 )
 
 router = DefaultRouter()
@@ -16,7 +17,12 @@ router.register(r'users', UserViewSet, basename='user')
 
 urlpatterns = [
     path('boards/', BoardListCreateView.as_view(), name='board-list'),
+    path('boards/import/', BoardImportView.as_view(), name='board-import'),
     path('boards/<int:pk>/', BoardDetailView.as_view(), name='board-detail'),
+    path('boards/<int:pk>/stats/', BoardStatsView.as_view(), name='board-stats'),
+    path('boards/<int:pk>/move/', BoardMoveView.as_view(), name='board-move'),
+    path('boards/<int:pk>/archive/', BoardArchiveView.as_view(), name='board-archive'),
+    path('boards/<int:pk>/activity/', BoardActivityView.as_view(), name='board-activity'),
 
     # Nested URL for deleting comments on a specific ticket
     path(
@@ -33,5 +39,8 @@ urlpatterns = [
         ReviewingTasksView.as_view(),
         name='reviewing-tasks',
     ),
+    path('tasks/mine/', MyTasksView.as_view(), name='my-tasks'),
+    path('tasks/due/', DueTasksView.as_view(), name='due-tasks'),
+    path('search/', SearchView.as_view(), name='search'),
     path('', include(router.urls)),
 ]
@@ -1,19 +1,96 @@
+import codecs
+import hashlib
+from contextlib import nullcontext
+
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Case, Count, ExpressionWrapper, F, Q, Value, When
+from django.db.models.signals import post_save
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
 
 from rest_framework import viewsets, status, generics
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.metrics import BOARD_CACHE
+from kanban_app.api.filters import (
+    filter_due_tickets, filter_tickets, order_tickets,
+    parse_ticket_fields, search_users, select_ticket_fields,
+)
+from kanban_app.api.pagination import ActivityCursorPagination, ArchivePagination, OptionalPageNumberPagination
 from kanban_app.api.permissions import IsBoardMember, IsOwner, IsOwnerOrMember
 from kanban_app.api.serializers import (
     BoardListSerializer, BoardDetailSerializer,
     TicketSerializer, CommentSerializer, UserSerializer,
     UserListSerializer, SubticketSerializer,
 )
-from kanban_app.models import Board, Ticket, Comment, Subticket
+from kanban_app.caching import BOARD_CACHE_TIMEOUT, board_cache_key, user_directory_cache_key
+from kanban_app.deletion import schedule_board_deletion
+from kanban_app.importers import BoardImporter, BoardImportError, READERS, guess_format
+from kanban_app.models import Activity, Board, Ticket, Comment, Subticket
+from kanban_app.ranking import (
+    RankError, column_tickets, last_rank, neighbour_ranks, rank_between, ranks_between, rebalance_column,
+)
+from kanban_app.search import get_search_backend
+from kanban_app.signals import tickets_moved
+from kanban_app.stats import compute_board_stats
+
+
+def accessible_tickets(user):
+    """Return tickets on the user's boards with users and comment count loaded."""
+    all_boards = (
+        Board.objects.filter(owner=user) | Board.objects.filter(members=user)
+    )
+    return (
+        Ticket.objects.filter(board__in=all_boards, is_archived=False)
+        .select_related('assignee', 'reviewer')
+        .annotate(comments_count=Count('comments'))
+    )
+
+
+def parse_neighbour_ids(data):
+    """Return the ``after_id`` and ``before_id`` of a move request."""
+    try:
+        return tuple(
+            None if data.get(name) in (None, '') else int(data[name])
+            for name in ('after_id', 'before_id')
+        )
+    except (TypeError, ValueError):
+        raise ValidationError({"detail": "Neighbour ids must be integers."})
+
+
+def check_neighbour_order(prev_rank, next_rank):
+    """Reject neighbours given the wrong way round, no rank fits between them."""
+    if prev_rank is not None and next_rank is not None and prev_rank > next_rank:
+        raise ValidationError({"detail": "after_id must come before before_id."})
+
+
+def build_user_data(user):
+    """Build user dict for ticket response."""
+    if not user:
+        return None
+    return {"id": user.id, "email": user.email, "fullname": UserSerializer().get_fullname(user)}
+
+
+def build_ticket_data(ticket):
+    """Build the ticket dict shared by the ticket list endpoints."""
+    return {
+        "id": ticket.id,
+        "board": ticket.board_id,
+        "title": ticket.title,
+        "description": ticket.description,
+        "status": ticket.status,
+        "priority": ticket.priority,
+        "assignee": build_user_data(ticket.assignee),
+        "reviewer": build_user_data(ticket.reviewer),
+        "due_date": str(ticket.due_date) if ticket.due_date else None,
+        "comments_count": ticket.comments_count,
+    }
 
 
 class BoardListCreateView(generics.ListCreateAPIView):
@@ -72,8 +149,9 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
                 {"detail": "Only the board owner can delete this board."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        self.perform_destroy(instance)
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        job = schedule_board_deletion(instance.pk, user=request.user)
+        headers = {'Location': f'/api/jobs/{job.pk}/'} if job else {}
+        return Response(status=status.HTTP_204_NO_CONTENT, headers=headers)
 
     def update(self, request, *args, **kwargs):
         """Update board and return PATCH-specific response format."""
@@ -85,6 +163,174 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
         return Response(self._build_patch_response(instance))
 
 
+class BoardStatsView(APIView):
+    """Return ticket statistics for a board."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """Return cached stats; they are recomputed after any ticket change."""
+        user = request.user
+        if not Board.objects.filter(Q(owner=user) | Q(members=user), pk=pk).exists():
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        today = timezone.localdate()
+        key = board_cache_key(pk, 'stats', today)
+        etag = f'"{key}"'
+        if request.headers.get('If-None-Match') == etag:
+            BOARD_CACHE.inc(name='stats', result='not_modified')
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        stats = cache.get(key)
+        BOARD_CACHE.inc(name='stats', result='miss' if stats is None else 'hit')
+        if stats is None:
+            stats = compute_board_stats(pk, today)
+            cache.set(key, stats, BOARD_CACHE_TIMEOUT)
+        return Response(stats, headers={'ETag': etag})
+
+
+class BoardMoveView(APIView):
+    """Move several tickets of a board into one position of a column."""
+    permission_classes = [IsAuthenticated]
+    max_tickets = 500
+
+    def post(self, request, pk):
+        """Move the tickets with one UPDATE, in the given order.
+
+        Takes ``ticket_ids``, the target ``status`` and optionally
+        ``after_id``/``before_id`` like the single ticket move.
+        """
+        user = request.user
+        if not Board.objects.filter(Q(owner=user) | Q(members=user), pk=pk).exists():
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        status_value = request.data.get('status')
+        if status_value not in dict(Ticket.STATUS_CHOICES):
+            return Response({"status": [f"Invalid choice: {status_value}."]}, status=status.HTTP_400_BAD_REQUEST)
+        ticket_ids = request.data.get('ticket_ids')
+        if (
+            not isinstance(ticket_ids, list) or not ticket_ids
+            or not all(isinstance(i, int) for i in ticket_ids)
+            or len(set(ticket_ids)) != len(ticket_ids)
+        ):
+            return Response(
+                {"ticket_ids": ["A non-empty list of distinct ticket ids is required."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ticket_ids) > self.max_tickets:
+            return Response(
+                {"ticket_ids": [f"At most {self.max_tickets} tickets can be moved at once."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        after_id, before_id = parse_neighbour_ids(request.data)
+
+        tickets = Ticket.objects.filter(board_id=pk, pk__in=ticket_ids)
+        column = column_tickets(pk, status_value).exclude(pk__in=ticket_ids)
+        with transaction.atomic():
+            if tickets.count() != len(ticket_ids):
+                return Response(
+                    {"ticket_ids": ["All tickets must belong to this board."]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                gap = neighbour_ranks(column, after_id, before_id)
+            except LookupError as exc:
+                return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            check_neighbour_order(*gap)
+            try:
+                ranks = ranks_between(*gap, len(ticket_ids))
+            except RankError:
+                rebalance_column(pk, status_value)
+                # Equal ranks are ordered by id now, which may swap the neighbours.
+                gap = neighbour_ranks(column, after_id, before_id)
+                check_neighbour_order(*gap)
+                ranks = ranks_between(*gap, len(ticket_ids))
+            archived = {} if status_value == 'done' else {'is_archived': False}
+            tickets.update(
+                status=status_value,
+                rank=Case(*(When(pk=i, then=Value(r)) for i, r in zip(ticket_ids, ranks))),
+                **archived,
+                version=F('version') + 1,
+                updated_at=timezone.now(),
+            )
+        tickets_moved.send(
+            sender=Ticket, board_id=pk, ticket_ids=ticket_ids, status=status_value, user=user,
+        )
+        return Response({
+            "status": status_value,
+            "tickets": [{"id": i, "rank": r} for i, r in zip(ticket_ids, ranks)],
+        })
+
+
+class BoardArchiveView(APIView):
+    """List the archived tickets of a board."""
+    permission_classes = [IsAuthenticated]
+    pagination_class = ArchivePagination
+
+    def get(self, request, pk):
+        """Return archived tickets page by page, most recently changed first."""
+        user = request.user
+        if not Board.objects.filter(Q(owner=user) | Q(members=user), pk=pk).exists():
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        tickets = (
+            Ticket.objects.filter(board_id=pk, is_archived=True)
+            .select_related('assignee', 'reviewer')
+            .annotate(comments_count=Count('comments'))
+            .order_by('-updated_at', '-id')
+        )
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(tickets, request, view=self)
+        return paginator.get_paginated_response([build_ticket_data(t) for t in page])
+
+
+class BoardActivityView(APIView):
+    """Feed of the activity log of a board."""
+    permission_classes = [IsAuthenticated]
+    pagination_class = ActivityCursorPagination
+
+    def get(self, request, pk):
+        """Return activity entries newest first, paginated with ``?cursor=``."""
+        user = request.user
+        if not Board.objects.filter(Q(owner=user) | Q(members=user), pk=pk).exists():
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        entries = Activity.objects.filter(board_id=pk).select_related('actor')
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(entries, request, view=self)
+        return paginator.get_paginated_response([
+            {
+                "id": entry.id,
+                "verb": entry.verb,
+                "actor": build_user_data(entry.actor),
+                "ticket_id": entry.ticket_id,
+                "data": entry.data,
+                "created_at": entry.created_at,
+            }
+            for entry in page
+        ])
+
+
+class BoardImportView(APIView):
+    """Import boards from an uploaded NDJSON or CSV dump."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Stream the uploaded dump into new boards owned by the user."""
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"file": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        dump_format = request.data.get('format') or guess_format(upload.name)
+        if dump_format not in READERS:
+            return Response(
+                {"format": [f"Must be one of: {', '.join(sorted(READERS))}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        importer = BoardImporter(request.user)
+        try:
+            stats = importer.run(READERS[dump_format](codecs.iterdecode(upload, 'utf-8')))
+        except (BoardImportError, UnicodeDecodeError) as exc:
+            return Response(
+                {"detail": str(exc), "imported_boards": importer.stats['boards']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(stats, status=status.HTTP_201_CREATED)
+
+
 class TicketViewSet(viewsets.ModelViewSet):
     """CRUD for tickets."""
     serializer_class = TicketSerializer
@@ -94,12 +340,23 @@ class TicketViewSet(viewsets.ModelViewSet):
         """Return filtered tickets for list, all tickets for detail actions."""
         if self.action == 'list':
             user = self.request.user
+            params = self.request.query_params
             all_boards = (
                 Board.objects.filter(owner=user) | Board.objects.filter(members=user)
             )
-            return Ticket.objects.filter(board__in=all_boards)
+            tickets = Ticket.objects.filter(board__in=all_boards, is_archived=False)
+            tickets = order_tickets(filter_tickets(tickets, params), params)
+            return select_ticket_fields(tickets, parse_ticket_fields(params))
+        if self.action in ('update', 'partial_update', 'move'):
+            return Ticket.objects.select_related('board', 'assignee', 'reviewer')
         return Ticket.objects.all()
 
+    def get_serializer(self, *args, **kwargs):
+        """Pass the sparse fieldset from ``?fields=`` to list serializers."""
+        if self.action == 'list':
+            kwargs.setdefault('fields', parse_ticket_fields(self.request.query_params))
+        return super().get_serializer(*args, **kwargs)
+
     def _check_board_access(self, board_id, user):
         """Return error Response if board not found or user is not a member."""
         try:
@@ -147,8 +404,64 @@ class TicketViewSet(viewsets.ModelViewSet):
             "comments_count": instance.comments.count(),
         }
 
+    def retrieve(self, request, *args, **kwargs):
+        """Return a ticket with its version as ETag."""
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers={'ETag': self._etag(instance)})
+
+    def _etag(self, ticket):
+        """Return the ETag of a ticket version."""
+        return f'"{ticket.version}"'
+
+    def _matches(self, request, ticket):
+        """Return True if the If-Match header allows changing the ticket."""
+        header = request.headers.get('If-Match')
+        if header is None:
+            return True
+        tags = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+        return '*' in tags or self._etag(ticket) in tags
+
+    def _save_changes(self, ticket, data, check_version):
+        """Write only the changed columns with a single UPDATE.
+
+        The version is incremented in the same statement. With
+        ``check_version`` the UPDATE only matches the version that was
+        read, so a concurrent change makes it return False.
+        """
+        assigned_to = data.pop('assigned_to', None)
+        changed = {field: value for field, value in data.items() if getattr(ticket, field) != value}
+        if ticket.is_archived and changed.get('status', 'done') != 'done':
+            # Only done tickets stay archived; reopening brings it back to the board.
+            changed['is_archived'] = False
+        if not changed and assigned_to is None:
+            return True
+        tickets = Ticket.objects.filter(pk=ticket.pk)
+        if check_version:
+            tickets = tickets.filter(version=ticket.version)
+        now = timezone.now()
+        with transaction.atomic() if assigned_to is not None else nullcontext():
+            if not tickets.update(**changed, updated_at=now, version=F('version') + 1):
+                return False
+            if assigned_to is not None:
+                ticket.assigned_to.set(assigned_to)
+        for field, value in changed.items():
+            setattr(ticket, field, value)
+        ticket.updated_at = now
+        ticket.version += 1
+        # update() bypasses signals; receivers use update_fields to skip work.
+        post_save.send(
+            sender=Ticket, instance=ticket, created=False, raw=False, using=tickets.db,
+            update_fields=frozenset(changed) | {'updated_at', 'version'},
+        )
+        return True
+
     def update(self, request, *args, **kwargs):
-        """Update a ticket and return only spec-required fields."""
+        """Update only the changed fields and return spec-required fields.
+
+        An ``If-Match`` header with the ETag of the ticket makes the update
+        conditional; it fails with 412 if the ticket changed meanwhile.
+        """
         if 'board' in request.data:
             return Response(
                 {"detail": "Changing the board is not allowed."},
@@ -156,9 +469,22 @@ class TicketViewSet(viewsets.ModelViewSet):
             )
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
+        conflict = Response(
+            {"detail": "The ticket was changed by someone else."},
+            status=status.HTTP_412_PRECONDITION_FAILED,
+            headers={'ETag': self._etag(instance)},
+        )
+        if not self._matches(request, instance):
+            return conflict
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
+        check_version = 'If-Match' in request.headers
+        changes = dict(serializer.validated_data)
+        if changes.get('status', instance.status) != instance.status:
+            # The old rank belongs to the old column; append to the new one.
+            changes['rank'] = rank_between(last_rank(instance.board_id, changes['status']), None)
+        if not self._save_changes(instance, changes, check_version):
+            return conflict
         return Response({
             "id": instance.id,
             "title": instance.title,
@@ -168,7 +494,53 @@ class TicketViewSet(viewsets.ModelViewSet):
             "assignee": self._build_user_data(instance.assignee),
             "reviewer": self._build_user_data(instance.reviewer),
             "due_date": str(instance.due_date) if instance.due_date else None,
-        })
+        }, headers={'ETag': self._etag(instance)})
+
+    def _neighbour_ranks(self, ticket, status_value, after_id, before_id):
+        """Return the ranks the moved ticket must sort between."""
+        column = column_tickets(ticket.board_id, status_value).exclude(pk=ticket.pk)
+        try:
+            gap = neighbour_ranks(column, after_id, before_id)
+        except LookupError as exc:
+            raise ValidationError({"detail": str(exc)})
+        check_neighbour_order(*gap)
+        return gap
+
+    @action(detail=True, methods=['post'])
+    def move(self, request, pk=None):
+        """Move a ticket within or between columns by writing only its rank.
+
+        ``after_id`` and ``before_id`` are the tickets that end up directly
+        above and below it, ``status`` selects the column. Without
+        neighbours the ticket goes to the end of the column.
+        """
+        ticket = self.get_object()
+        if not self._matches(request, ticket):
+            return Response(
+                {"detail": "The ticket was changed by someone else."},
+                status=status.HTTP_412_PRECONDITION_FAILED,
+                headers={'ETag': self._etag(ticket)},
+            )
+        status_value = request.data.get('status', ticket.status)
+        if status_value not in dict(Ticket.STATUS_CHOICES):
+            return Response({"status": [f"Invalid choice: {status_value}."]}, status=status.HTTP_400_BAD_REQUEST)
+        after_id, before_id = parse_neighbour_ids(request.data)
+        try:
+            rank = rank_between(*self._neighbour_ranks(ticket, status_value, after_id, before_id))
+        except RankError:
+            # Neighbours with equal ranks, e.g. unranked rows: respace the column once.
+            rebalance_column(ticket.board_id, status_value)
+            rank = rank_between(*self._neighbour_ranks(ticket, status_value, after_id, before_id))
+        changes = {'status': status_value, 'rank': rank}
+        if not self._save_changes(ticket, changes, 'If-Match' in request.headers):
+            return Response(
+                {"detail": "The ticket was changed by someone else."},
+                status=status.HTTP_412_PRECONDITION_FAILED,
+            )
+        return Response(
+            {"id": ticket.id, "status": ticket.status, "rank": ticket.rank},
+            headers={'ETag': self._etag(ticket)},
+        )
 
     def perform_create(self, serializer):
         """Set the current user as ticket creator."""
@@ -268,34 +640,8 @@ class AssignedToMeView(APIView):
     def get(self, request):
         """Return tickets where the user is the assignee or reviewer."""
         user = request.user
-        all_boards = (
-            Board.objects.filter(owner=user) | Board.objects.filter(members=user)
-        )
-        tickets = Ticket.objects.filter(
-            board__in=all_boards
-        ).filter(Q(assignee=user) | Q(reviewer=user))
-        data = [
-            {
-                "id": t.id,
-                "board": t.board_id,
-                "title": t.title,
-                "description": t.description,
-                "status": t.status,
-                "priority": t.priority,
-                "assignee": self._build_user_data(t.assignee),
-                "reviewer": self._build_user_data(t.reviewer),
-                "due_date": str(t.due_date) if t.due_date else None,
-                "comments_count": t.comments.count(),
-            }
-            for t in tickets
-        ]
-        return Response(data)
-
-    def _build_user_data(self, user):
-        """Build user dict for ticket response."""
-        if not user:
-            return None
-        return {"id": user.id, "email": user.email, "fullname": UserSerializer().get_fullname(user)}
+        tickets = accessible_tickets(user).filter(Q(assignee=user) | Q(reviewer=user))
+        return Response([build_ticket_data(t) for t in tickets])
 
 
 class ReviewingTasksView(APIView):
@@ -304,33 +650,84 @@ class ReviewingTasksView(APIView):
 
     def get(self, request):
         """Return tickets with status review from accessible boards."""
+        tickets = accessible_tickets(request.user).filter(reviewer=request.user)
+        return Response([build_ticket_data(t) for t in tickets])
+
+
+class MyTasksView(APIView):
+    """Return the current user's tickets from all boards, tagged by role."""
+    permission_classes = [IsAuthenticated]
+    pagination_class = OptionalPageNumberPagination
+
+    def get(self, request):
+        """Return assigned, reviewing and created tickets in one query.
+
+        Each ticket carries a ``roles`` list with ``assignee``,
+        ``reviewer`` and/or ``creator``. ``?role=`` limits the result to
+        one role; ``?page=`` or ``?page_size=`` paginate it.
+        """
         user = request.user
-        all_boards = (
-            Board.objects.filter(owner=user) | Board.objects.filter(members=user)
+        roles = {
+            'assignee': Q(assignee=user),
+            'reviewer': Q(reviewer=user),
+            'creator': Q(created_by=user),
+        }
+        role = request.query_params.get('role')
+        if role is not None and role not in roles:
+            return Response(
+                {"role": [f"Invalid choice: {role}."]}, status=status.HTTP_400_BAD_REQUEST,
+            )
+        condition = roles[role] if role else roles['assignee'] | roles['reviewer'] | roles['creator']
+        tickets = (
+            accessible_tickets(user)
+            .filter(condition)
+            .annotate(**{
+                f'is_{name}': ExpressionWrapper(q, output_field=BooleanField())
+                for name, q in roles.items()
+            })
+            .order_by('-updated_at', '-id')
         )
-        tickets = Ticket.objects.filter(board__in=all_boards, reviewer=user)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(tickets, request, view=self)
         data = [
-            {
-                "id": t.id,
-                "board": t.board_id,
-                "title": t.title,
-                "description": t.description,
-                "status": t.status,
-                "priority": t.priority,
-                "assignee": self._build_user_data(t.assignee),
-                "reviewer": self._build_user_data(t.reviewer),
-                "due_date": str(t.due_date) if t.due_date else None,
-                "comments_count": t.comments.count(),
-            }
-            for t in tickets
+            {**build_ticket_data(t), "roles": [name for name in roles if getattr(t, f'is_{name}')]}
+            for t in (tickets if page is None else page)
         ]
-        return Response(data)
+        if page is None:
+            return Response(data)
+        return paginator.get_paginated_response(data)
 
-    def _build_user_data(self, user):
-        """Build user dict for ticket response."""
-        if not user:
-            return None
-        return {"id": user.id, "email": user.email, "fullname": UserSerializer().get_fullname(user)}
+
+class DueTasksView(APIView):
+    """Return tickets by due date from the user's boards."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Return tickets due in a date range, or overdue with ?overdue=true."""
+        tickets = filter_due_tickets(accessible_tickets(request.user), request.query_params)
+        return Response([build_ticket_data(t) for t in tickets])
+
+
+class SearchView(APIView):
+    """Full-text search across tickets, subtickets and comments."""
+    permission_classes = [IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request):
+        """Return ranked matches from the boards the user can access."""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"q": ["This parameter is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+        except ValueError:
+            return Response({"limit": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        user = request.user
+        board_ids = (
+            Board.objects.filter(Q(owner=user) | Q(members=user))
+            .values_list('id', flat=True).distinct()
+        )
+        return Response(get_search_backend().search(query, board_ids, limit=max(limit, 1)))
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -361,8 +758,44 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user)
 
 
+def directory_users(user):
+    """Return the user and everyone sharing a board with them."""
+    boards = Board.objects.filter(Q(owner=user) | Q(members=user))
+    return User.objects.filter(
+        Q(pk=user.pk)
+        | Q(pk__in=boards.values('owner_id'))
+        | Q(pk__in=Board.members.through.objects.filter(board__in=boards.values('pk')).values('user_id'))
+    )
+
+
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
-    """Read-only list of users."""
-    queryset = User.objects.all()
+    """Read-only directory of the users sharing a board with the caller."""
     serializer_class = UserListSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalPageNumberPagination
+
+    def get_queryset(self):
+        """Return the caller's directory, filtered by ``search``."""
+        users = directory_users(self.request.user)
+        return search_users(users, self.request.query_params).order_by('first_name', 'last_name', 'id')
+
+    def list(self, request, *args, **kwargs):
+        """Return the directory, cached per caller and query until their boards' members change."""
+        user = request.user
+        board_ids = set(Board.objects.filter(Q(owner=user) | Q(members=user)).values_list('pk', flat=True))
+        query = hashlib.sha256(request.GET.urlencode().encode()).hexdigest()
+        key = user_directory_cache_key(user.pk, board_ids, query)
+        etag = f'"{key}"'
+        if request.headers.get('If-None-Match') == etag:
+            BOARD_CACHE.inc(name='users', result='not_modified')
+            response = Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        else:
+            data = cache.get(key)
+            BOARD_CACHE.inc(name='users', result='miss' if data is None else 'hit')
+            if data is None:
+                data = super().list(request, *args, **kwargs).data
+                cache.set(key, data, BOARD_CACHE_TIMEOUT)
+            response = Response(data, headers={'ETag': etag})
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization'])
+        return response
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class KanbanAppConfig(AppConfig):
     name = 'kanban_app'
+
+    def ready(self):
+        """Connect the signal handlers."""
+        import kanban_app.signals  # noqa: F401
@@ -0,0 +1,86 @@
+"""Versioned caching of per-board data and of the user directory.
+
+Every change to a board's tickets, and to the name or email of one of
+its assignees, bumps the board's version. Cached data
+is stored under a key that contains the version, so it never has to be
+deleted explicitly: after a change readers simply miss and recompute.
+The user directory of a caller is keyed by the member versions of the
+caller's boards, bumped when a board's members, owner or their names
+change, so a change only invalidates the directories of that board's
+users.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+
+BOARD_CACHE_TIMEOUT = 60 * 60
+
+
+def _version_key(board_id):
+    """Return the cache key holding a board's version."""
+    return f'board-version:{board_id}'
+
+
+def _fresh_version():
+    """Return a version that is newer than any previously handed out."""
+    return time.time_ns() // 1000
+
+
+def _get_version(key):
+    """Return the version stored under a key, creating it if missing."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key):
+    """Increment the version stored under a key."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), None)
+
+
+def get_board_version(board_id):
+    """Return the current version of a board."""
+    return _get_version(_version_key(board_id))
+
+
+def bump_board_version(board_id):
+    """Invalidate everything cached for a board."""
+    _bump_version(_version_key(board_id))
+
+
+def board_cache_key(board_id, name, *parts):
+    """Return a cache key for board data that changes with the board version."""
+    version = get_board_version(board_id)
+    suffix = ':'.join(str(part) for part in parts)
+    return f'board:{board_id}:{name}:{version}:{suffix}'
+
+
+def _members_version_key(board_id):
+    """Return the cache key holding the version of a board's member list."""
+    return f'board-members-version:{board_id}'
+
+
+def bump_board_members_version(*board_ids):
+    """Invalidate the cached directories of the users of these boards."""
+    for board_id in board_ids:
+        _bump_version(_members_version_key(board_id))
+
+
+def user_directory_cache_key(user_id, board_ids, *parts):
+    """Return a cache key for a user's directory, given the ids of the user's boards."""
+    keys = {board_id: _members_version_key(board_id) for board_id in sorted(board_ids)}
+    versions = cache.get_many(keys.values())
+    state = ','.join(
+        f'{board_id}.{versions[key] if key in versions else _get_version(key)}'
+        for board_id, key in keys.items()
+    )
+    digest = hashlib.sha256(state.encode()).hexdigest()
+    suffix = ':'.join(str(part) for part in parts)
+    return f'user-directory:{user_id}:{digest}:{suffix}'
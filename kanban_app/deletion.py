@@ -0,0 +1,89 @@
+"""Fast deletion of whole boards.
+
+Deleting a board through the ORM makes Django's collector load every
+ticket, subticket, comment and assignment row into memory first, because
+those models have delete signals. ``delete_board`` deletes the rows with
+set-based DELETE statements in dependency order instead, one chunk of
+tickets per transaction so no lock is held for long. The per-object
+signals are skipped; the search index and the board cache are cleaned up
+directly.
+
+With ``BOARD_DELETE_ASYNC`` the API only flags the board as deleted,
+which hides it everywhere, and a ``kanban.delete_board`` background job
+deletes it. Boards whose job failed for good are removed by
+``purge_deleted_boards``.
+"""
+from django.conf import settings
+from django.db import connection, transaction
+
+from jobs_app.tasks import enqueue
+from kanban_app.activity import discard_board
+from kanban_app.caching import bump_board_version
+from kanban_app.models import Activity, Board, Ticket, Subticket, Comment
+from kanban_app.search import get_search_backend
+
+# Below the 999 bound parameters older SQLite builds allow per statement.
+DELETE_CHUNK_SIZE = 900
+
+
+def _delete_rows(model, field, values):
+    """Delete the rows whose ``field`` is in ``values`` without the collector.
+
+    One DELETE per ``max_query_params`` values, usually a single one.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.get_field(field).column)
+    values = list(values)
+    size = connection.features.max_query_params or len(values)
+    deleted = 0
+    with connection.cursor() as cursor:
+        for start in range(0, len(values), size):
+            chunk = values[start:start + size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", chunk)
+            deleted += cursor.rowcount
+    return deleted
+
+
+def delete_board(board_id, chunk_size=DELETE_CHUNK_SIZE):
+    """Delete a board with everything on it and return the number of deleted tickets."""
+    get_search_backend().remove_board(board_id, chunk_size)
+    tickets = Ticket.objects.filter(board_id=board_id).order_by('id').values_list('id', flat=True)
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(tickets[:chunk_size])
+            if not ids:
+                break
+            _delete_rows(Comment, 'ticket', ids)
+            _delete_rows(Subticket, 'ticket', ids)
+            _delete_rows(Ticket.assigned_to.through, 'ticket', ids)
+            _delete_rows(Ticket, 'id', ids)
+        deleted += len(ids)
+        if len(ids) < chunk_size:
+            break
+    activities = Activity.objects.filter(board_id=board_id).values_list('id', flat=True)
+    while True:
+        ids = list(activities[:chunk_size])
+        if ids:
+            _delete_rows(Activity, 'id', ids)
+        if len(ids) < chunk_size:
+            break
+    discard_board(board_id)
+    with transaction.atomic():
+        _delete_rows(Board.members.through, 'board', [board_id])
+        _delete_rows(Board, 'id', [board_id])
+    bump_board_version(board_id)
+    return deleted
+
+
+def schedule_board_deletion(board_id, user=None):
+    """Delete a board now or, with BOARD_DELETE_ASYNC, hide it and return the deletion job."""
+    if not getattr(settings, 'BOARD_DELETE_ASYNC', False):
+        delete_board(board_id)
+        return None
+    with transaction.atomic():
+        Board.all_objects.filter(pk=board_id).update(is_deleted=True)
+        job = enqueue('kanban.delete_board', {'board_id': board_id}, user=user)
+    bump_board_version(board_id)
+    return job
@@ -0,0 +1,278 @@
+"""Streaming import of board dumps in NDJSON or CSV format.
+
+A dump is a flat stream of records, each with a ``type`` key:
+
+- ``board``: starts a new board (``title``, ``description``, ``members``)
+- ``ticket``: belongs to the current board and may carry an ``id`` that
+  subtickets and comments refer to
+- ``subticket``: ``ticket``, ``title``, ``done``
+- ``comment``: ``ticket``, ``author``, ``text``
+
+Users are referenced by email. Board members must exist; other unknown
+users are left empty. In CSV dumps list columns (``members``,
+``assigned_to``) are separated by ``;``.
+"""
+import csv
+import json
+from itertools import groupby
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from auth_app.models import normalize_email
+from jobs_app.tasks import enqueue
+from kanban_app.models import Board, Ticket, Subticket, Comment
+from kanban_app.ranking import rank_between
+from kanban_app.search import get_search_backend
+
+
+LIST_FIELDS = ('members', 'assigned_to')
+RECORD_TYPES = ('ticket', 'subticket', 'comment')
+
+
+class BoardImportError(ValueError):
+    """Raised when a board dump contains an invalid record."""
+
+
+def read_ndjson(lines):
+    """Yield one record per non-empty NDJSON line."""
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise BoardImportError(f"Line {number}: invalid JSON ({exc.msg}).")
+        if not isinstance(record, dict):
+            raise BoardImportError(f"Line {number}: expected a JSON object.")
+        yield record
+
+
+def read_csv(lines):
+    """Yield one record per CSV row, splitting list columns on ';'."""
+    for row in csv.DictReader(lines):
+        record = {key: value for key, value in row.items() if value not in (None, '')}
+        for field in LIST_FIELDS:
+            if field in record:
+                record[field] = [v.strip() for v in record[field].split(';') if v.strip()]
+        yield record
+
+
+READERS = {
+    'ndjson': read_ndjson,
+    'csv': read_csv,
+}
+
+
+def guess_format(filename):
+    """Return the dump format for a file name, defaulting to NDJSON."""
+    return 'csv' if str(filename).lower().endswith('.csv') else 'ndjson'
+
+
+def _as_bool(value):
+    """Interpret JSON booleans and CSV strings like 'true' or '1'."""
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+def _parse_date(value):
+    """Return a date for an ISO date string, or None if it is invalid."""
+    try:
+        return parse_date(str(value))
+    except ValueError:
+        return None
+
+
+class _BoardCounter:
+    """groupby key that starts a new group at every board record."""
+
+    def __init__(self):
+        self.index = 0
+
+    def __call__(self, record):
+        if record.get('type') == 'board':
+            self.index += 1
+        return self.index
+
+
+class BoardImporter:
+    """Import boards from a stream of records using batched inserts."""
+
+    def __init__(self, owner, batch_size=1000):
+        self.owner = owner
+        self.batch_size = batch_size
+        self.user_ids = {}
+        self.stats = {'boards': [], 'tickets': 0, 'subtickets': 0, 'comments': 0, 'jobs': []}
+
+    def run(self, records):
+        """Import every board in the stream, one transaction per board."""
+        for _, group in groupby(records, key=_BoardCounter()):
+            header = next(group)
+            if header.get('type') != 'board':
+                raise BoardImportError("The dump must start with a board record.")
+            with transaction.atomic():
+                board = self._import_board(header, group)
+            self.stats['boards'].append(board.id)
+        return self.stats
+
+    def _import_board(self, header, records):
+        """Create the board, then insert its records batch by batch."""
+        if not header.get('title'):
+            raise BoardImportError("Board records need a title.")
+        board = Board.objects.create(
+            title=header['title'],
+            description=header.get('description', ''),
+            owner=self.owner,
+        )
+        members = header.get('members', [])
+        if not isinstance(members, list) or not all(isinstance(email, str) and email.strip() for email in members):
+            raise BoardImportError("Board members must be a list of emails.")
+        self._resolve_users(members)
+        for email in members:
+            if self.user_ids[email] is None:
+                raise BoardImportError(f"Unknown board member: {email!r}.")
+        member_ids = {self.user_ids[email] for email in members} - {self.owner.id}
+        Board.members.through.objects.bulk_create(
+            Board.members.through(board_id=board.id, user_id=user_id)
+            for user_id in member_ids
+        )
+
+        self.ticket_ids = {}
+        self.last_ranks = {}
+        self.pending = {kind: [] for kind in RECORD_TYPES}
+        for record in records:
+            kind = record.get('type')
+            if kind not in self.pending:
+                raise BoardImportError(f"Unknown record type: {kind!r}.")
+            self.pending[kind].append(record)
+            if len(self.pending[kind]) >= self.batch_size:
+                self._flush(board)
+        self._flush(board)
+        if getattr(settings, 'SEARCH_INDEX_ASYNC', False):
+            # Enqueued in the board's transaction, so it only runs for boards that were imported.
+            job = enqueue('kanban.index_board', {'board_id': board.id}, user=self.owner)
+            self.stats['jobs'].append(job.pk)
+        else:
+            get_search_backend().index_board(board.id)
+        return board
+
+    def _flush(self, board):
+        """Insert all pending records, tickets first so references resolve."""
+        emails = set()
+        for record in self.pending['ticket']:
+            emails.update((record.get('assignee'), record.get('reviewer'), record.get('created_by')))
+            emails.update(record.get('assigned_to', []))
+        for record in self.pending['comment']:
+            emails.add(record.get('author'))
+        self._resolve_users(emails)
+
+        self._insert_tickets(board, self.pending['ticket'])
+        self._insert_subtickets(self.pending['subticket'])
+        self._insert_comments(self.pending['comment'])
+        self.pending = {kind: [] for kind in RECORD_TYPES}
+
+    def _resolve_users(self, emails):
+        """Map unseen emails to user ids with a single query."""
+        unknown = {email for email in emails if email and email not in self.user_ids}
+        if not unknown:
+            return
+        found = dict(
+            User.objects.filter(email__in={normalize_email(email) for email in unknown})
+            .values_list('email', 'id')
+        )
+        for email in unknown:
+            self.user_ids[email] = found.get(normalize_email(email))
+
+    def _user_id(self, email):
+        """Return the id of an already resolved email, or None."""
+        return self.user_ids.get(email) if email else None
+
+    def _ticket_id(self, record):
+        """Return the new primary key of the ticket a record refers to."""
+        ref = record.get('ticket')
+        try:
+            return self.ticket_ids[str(ref)]
+        except KeyError:
+            raise BoardImportError(f"Unknown ticket reference: {ref!r}.")
+
+    def _build_ticket(self, board, record):
+        """Build an unsaved ticket from a validated record."""
+        status = record.get('status', 'to-do')
+        priority = record.get('priority', 'medium')
+        if status not in dict(Ticket.STATUS_CHOICES):
+            raise BoardImportError(f"Invalid ticket status: {status!r}.")
+        if priority not in dict(Ticket.PRIORITY_CHOICES):
+            raise BoardImportError(f"Invalid ticket priority: {priority!r}.")
+        if not record.get('title'):
+            raise BoardImportError("Ticket records need a title.")
+        due_date = record.get('due_date') or None
+        if due_date and _parse_date(due_date) is None:
+            raise BoardImportError(f"Invalid due date: {due_date!r}.")
+        # bulk_create skips the pre_save signal, so rank in dump order here
+        rank = self.last_ranks[status] = rank_between(self.last_ranks.get(status), None)
+        return Ticket(
+            board=board,
+            title=record['title'],
+            description=record.get('description', ''),
+            status=status,
+            priority=priority,
+            assignee_id=self._user_id(record.get('assignee')),
+            reviewer_id=self._user_id(record.get('reviewer')),
+            created_by_id=self._user_id(record.get('created_by')) or self.owner.id,
+            due_date=due_date,
+            rank=rank,
+        )
+
+    def _insert_tickets(self, board, records):
+        """Bulk insert tickets and their assigned_to through rows."""
+        if not records:
+            return
+        tickets = [self._build_ticket(board, record) for record in records]
+        Ticket.objects.bulk_create(tickets, batch_size=self.batch_size)
+
+        through = Ticket.assigned_to.through
+        links = []
+        for ticket, record in zip(tickets, records):
+            if 'id' in record:
+                self.ticket_ids[str(record['id'])] = ticket.pk
+            user_ids = {self._user_id(email) for email in record.get('assigned_to', [])}
+            links.extend(
+                through(ticket_id=ticket.pk, user_id=user_id)
+                for user_id in user_ids if user_id
+            )
+        through.objects.bulk_create(links, batch_size=self.batch_size)
+        self.stats['tickets'] += len(tickets)
+
+    def _insert_subtickets(self, records):
+        """Bulk insert subtickets for already inserted tickets."""
+        if not records:
+            return
+        subtickets = [
+            Subticket(
+                ticket_id=self._ticket_id(record),
+                title=record.get('title', ''),
+                done=_as_bool(record.get('done', False)),
+            )
+            for record in records
+        ]
+        Subticket.objects.bulk_create(subtickets, batch_size=self.batch_size)
+        self.stats['subtickets'] += len(subtickets)
+
+    def _insert_comments(self, records):
+        """Bulk insert comments, falling back to the importer as author."""
+        if not records:
+            return
+        comments = [
+            Comment(
+                ticket_id=self._ticket_id(record),
+                author_id=self._user_id(record.get('author')) or self.owner.id,
+                text=record.get('text', ''),
+            )
+            for record in records
+        ]
+        Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+        self.stats['comments'] += len(comments)
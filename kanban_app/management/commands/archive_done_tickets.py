@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.utils import timezone
+
+from kanban_app.caching import bump_board_version
+from kanban_app.models import Ticket
+
+
+class Command(BaseCommand):
+    help = 'Archives tickets that have been done for longer than the given number of days'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.TICKET_ARCHIVE_AFTER_DAYS,
+                            help='Archive done tickets not changed for this many days')
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Tickets archived per UPDATE')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        stale = Ticket.objects.filter(status='done', is_archived=False, updated_at__lt=cutoff)
+        board_ids = list(stale.values_list('board_id', flat=True).distinct().order_by())
+        archived = 0
+        for board_id in board_ids:
+            while True:
+                ids = list(stale.filter(board_id=board_id).values_list('id', flat=True)[:options['chunk_size']])
+                if not ids:
+                    break
+                archived += Ticket.objects.filter(pk__in=ids).update(
+                    is_archived=True, version=F('version') + 1,
+                )
+            bump_board_version(board_id)
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {archived} tickets on {len(board_ids)} boards.'
+        ))
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from kanban_app.models import Activity
+
+
+class Command(BaseCommand):
+    help = 'Deletes old activity entries and caps the activity log of every board'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ACTIVITY_RETENTION_DAYS,
+                            help='Delete entries older than this many days')
+        parser.add_argument('--max-per-board', type=int, default=settings.ACTIVITY_MAX_PER_BOARD,
+                            help='Keep at most this many entries per board')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Entries deleted per statement')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted = self.delete(Activity.objects.filter(created_at__lt=cutoff), options['chunk_size'])
+
+        limit = max(options['max_per_board'], 1)
+        boards = (
+            Activity.objects.values('board_id').annotate(entries=Count('id'))
+            .filter(entries__gt=limit).order_by().values_list('board_id', flat=True)
+        )
+        for board_id in list(boards):
+            entries = Activity.objects.filter(board_id=board_id)
+            # Entries share timestamps when bulk-inserted, so the id breaks ties.
+            created_at, pk = entries.order_by('-created_at', '-id').values_list('created_at', 'id')[limit - 1]
+            older = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            deleted += self.delete(entries.filter(older), options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} activity entries.'))
+
+    def delete(self, entries, chunk_size):
+        """Delete the entries oldest first, ``chunk_size`` rows per statement."""
+        ids = entries.order_by('created_at', 'id').values_list('id', flat=True)
+        deleted = 0
+        while True:
+            chunk = list(ids[:chunk_size])
+            if chunk:
+                deleted += Activity.objects.filter(pk__in=chunk).delete()[0]
+            if len(chunk) < chunk_size:
+                return deleted
@@ -0,0 +1,35 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.models import normalize_email, users_with_email
+from kanban_app.importers import BoardImporter, BoardImportError, READERS, guess_format
+
+
+class Command(BaseCommand):
+    help = 'Imports boards from an NDJSON or CSV dump using batched inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the dump file')
+        parser.add_argument('--owner', required=True, help='Email of the user who will own the boards')
+        parser.add_argument('--format', choices=sorted(READERS), help='Dump format (default: from file extension)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        owner = users_with_email(User.objects).filter(email=normalize_email(options['owner'])).first()
+        if owner is None:
+            raise CommandError(f"No user with email {options['owner']}.")
+
+        reader = READERS[options['format'] or guess_format(options['path'])]
+        importer = BoardImporter(owner, batch_size=options['batch_size'])
+        with open(options['path'], encoding='utf-8', newline='') as dump:
+            try:
+                stats = importer.run(reader(dump))
+            except BoardImportError as exc:
+                raise CommandError(
+                    f"{exc} Boards imported before the error: {importer.stats['boards']}"
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {len(stats['boards'])} boards, {stats['tickets']} tickets, "
+            f"{stats['subtickets']} subtickets and {stats['comments']} comments."
+        ))
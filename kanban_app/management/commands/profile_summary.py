@@ -0,0 +1,47 @@
+import pstats
+from collections import defaultdict
+from io import StringIO
+
+from django.core.management.base import BaseCommand
+
+from core.profiling import PHASES, load_profiles, profile_dir
+
+
+class Command(BaseCommand):
+    help = 'Summarizes saved request profiles per view, slowest views first'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', help='Profile directory (default: PROFILING_DIR)')
+        parser.add_argument('--view', help='Only show views whose dotted path contains this text')
+        parser.add_argument('--limit', type=int, default=10, help='Functions to list per view')
+        parser.add_argument('--sort', choices=['cumulative', 'tottime', 'ncalls'], default='cumulative')
+
+    def handle(self, *args, **options):
+        by_view = defaultdict(list)
+        for meta, path in load_profiles(options['dir']):
+            if options['view'] and options['view'] not in meta['view']:
+                continue
+            by_view[meta['view']].append((meta, path))
+        if not by_view:
+            self.stdout.write(f"No profiles found in {options['dir'] or profile_dir()}.")
+            return
+
+        def average(profiles, key):
+            return sum(key(meta) for meta, _ in profiles) / len(profiles)
+
+        views = sorted(by_view.items(), key=lambda item: -average(item[1], lambda m: m['duration']))
+        for view, profiles in views:
+            duration = average(profiles, lambda m: m['duration'])
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{view}: {len(profiles)} requests, {duration * 1000:.1f} ms on average'
+            ))
+            phases = ', '.join(
+                f"{phase} {average(profiles, lambda m: m['phases'][phase]) * 1000:.1f} ms"
+                for phase in PHASES
+            )
+            self.stdout.write(f'  {phases}')
+            # OutputWrapper ends every write() with a newline, so buffer pstats output.
+            buffer = StringIO()
+            stats = pstats.Stats(*(str(path) for _, path in profiles), stream=buffer)
+            stats.strip_dirs().sort_stats(options['sort']).print_stats(options['limit'])
+            self.stdout.write(buffer.getvalue())
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from kanban_app.deletion import DELETE_CHUNK_SIZE, delete_board
+from kanban_app.models import Board
+
+
+class Command(BaseCommand):
+    help = 'Deletes boards that were flagged as deleted but not removed yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DELETE_CHUNK_SIZE,
+                            help='Tickets deleted per transaction')
+
+    def handle(self, *args, **options):
+        board_ids = list(Board.all_objects.filter(is_deleted=True).values_list('id', flat=True))
+        tickets = 0
+        for board_id in board_ids:
+            tickets += delete_board(board_id, options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {len(board_ids)} boards with {tickets} tickets.'
+        ))
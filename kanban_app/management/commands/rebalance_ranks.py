@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+from django.db.models.functions import Length
+
+from kanban_app.caching import bump_board_version
+from kanban_app.models import Ticket
+from kanban_app.ranking import MAX_RANK_LENGTH, rebalance_column
+
+
+class Command(BaseCommand):
+    help = 'Spreads ticket ranks evenly in columns whose ranks got long'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Only rebalance this board')
+        parser.add_argument('--max-length', type=int, default=MAX_RANK_LENGTH,
+                            help='Rebalance columns with longer ranks')
+        parser.add_argument('--all', action='store_true', help='Rebalance every column')
+
+    def handle(self, *args, **options):
+        columns = Ticket.objects.filter(is_archived=False).values('board_id', 'status').annotate(
+            longest=Max(Length('rank')), shortest=Min(Length('rank')),
+        ).order_by()
+        if options['board']:
+            columns = columns.filter(board_id=options['board'])
+        if not options['all']:
+            # too long, or unranked tickets
+            columns = [c for c in columns if c['longest'] > options['max_length'] or c['shortest'] == 0]
+
+        tickets = 0
+        for column in columns:
+            tickets += rebalance_column(column['board_id'], column['status'])
+            bump_board_version(column['board_id'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebalanced {len(columns)} columns with {tickets} tickets.'
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from jobs_app.tasks import enqueue
+from kanban_app.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--background', action='store_true',
+                            help='Queue the rebuild as a background job instead of running it now')
+
+    def handle(self, *args, **options):
+        if options['background']:
+            job = enqueue('kanban.rebuild_search_index')
+            self.stdout.write(self.style.SUCCESS(f'Queued search index rebuild as job {job.pk}.'))
+            return
+        backend = get_search_backend()
+        self.stdout.write(f'Rebuilding search index with {type(backend).__name__}...')
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
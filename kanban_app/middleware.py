@@ -0,0 +1,15 @@
+from kanban_app.activity import begin_request, end_request
+
+
+class ActivityMiddleware:
+    """Write the activity entries of a request with one INSERT at its end."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = begin_request()
+        try:
+            return self.get_response(request)
+        finally:
+            end_request(token, getattr(request, 'user', None))
@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """Create the FTS5 search table on SQLite; other backends need nothing."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS kanban_app_search USING fts5("
+        "title, body, board, kind UNINDEXED, object_id UNINDEXED, "
+        "ticket_id UNINDEXED, board_id UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO kanban_app_search "
+        "(rowid, title, body, board, kind, object_id, ticket_id, board_id) "
+        "SELECT id * 3, title, description, 'b' || board_id, 'ticket', id, id, board_id "
+        "FROM kanban_app_ticket"
+    )
+    schema_editor.execute(
+        "INSERT INTO kanban_app_search "
+        "(rowid, title, body, board, kind, object_id, ticket_id, board_id) "
+        "SELECT s.id * 3 + 1, s.title, '', 'b' || t.board_id, 'subticket', s.id, t.id, t.board_id "
+        "FROM kanban_app_subticket s JOIN kanban_app_ticket t ON s.ticket_id = t.id"
+    )
+    schema_editor.execute(
+        "INSERT INTO kanban_app_search "
+        "(rowid, title, body, board, kind, object_id, ticket_id, board_id) "
+        "SELECT c.id * 3 + 2, '', c.text, 'b' || t.board_id, 'comment', c.id, t.id, t.board_id "
+        "FROM kanban_app_comment c JOIN kanban_app_ticket t ON c.ticket_id = t.id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    """Drop the FTS5 search table."""
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS kanban_app_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0006_update_status_priority_choices'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
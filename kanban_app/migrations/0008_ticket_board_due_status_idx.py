@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 10:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0007_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['board', 'due_date', 'status'], name='ticket_board_due_status_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2 on 2026-10-19 11:25
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+
+# Copied from kanban_app.ranking, so later changes there cannot break this migration.
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+
+def encode(value, width):
+    """Return ``value`` as a base36 string of ``width`` digits, trailing zeros removed."""
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def even_ranks(count):
+    """Return ``count`` evenly spaced ranks for an empty column."""
+    width = 1
+    while BASE ** width <= 2 * (count + 1):
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [encode(step * (i + 1), width) for i in range(count)]
+
+
+def rank_existing_tickets(apps, schema_editor):
+    """Rank the tickets of every column in creation order."""
+    Ticket = apps.get_model('kanban_app', 'Ticket')
+    tickets = Ticket.objects.order_by('board_id', 'status', 'created_at', 'id').only('id', 'board_id', 'status')
+    for _, column in groupby(tickets.iterator(), key=lambda t: (t.board_id, t.status)):
+        column = list(column)
+        for ticket, rank in zip(column, even_ranks(len(column))):
+            ticket.rank = rank
+        Ticket.objects.bulk_update(column, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0009_ticket_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='rank',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(rank_existing_tickets, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['board', 'status', 'rank'], name='ticket_board_status_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-19 11:30
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0010_ticket_rank'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='board',
+            options={'base_manager_name': 'all_objects'},
+        ),
+        migrations.AlterModelManagers(
+            name='board',
+            managers=[
+                ('objects', django.db.models.manager.Manager()),
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='is_deleted',
+            field=models.BooleanField(default=False),
+        ),
+    ]
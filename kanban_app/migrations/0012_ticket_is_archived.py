@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-19 11:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0011_board_is_deleted'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='ticket_board_status_rank_idx',
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='is_archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['board', 'status', 'rank'], name='ticket_board_active_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('is_archived', True)), fields=['board', '-updated_at'], name='ticket_board_archived_idx'),
+        ),
+    ]
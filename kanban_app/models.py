@@ -2,6 +2,14 @@ from django.db import models
 from django.contrib.auth.models import User
 
 
+class BoardManager(models.Manager):
+    """Hide boards that are waiting for their deletion."""
+
+    def get_queryset(self):
+        """Exclude soft-deleted boards."""
+        return super().get_queryset().filter(is_deleted=False)
+
+
 class Board(models.Model):
     """A kanban board with an owner and members."""
     title = models.CharField(max_length=100)
@@ -18,6 +26,14 @@ class Board(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set while the board is deleted in the background, see kanban_app.deletion.
+    is_deleted = models.BooleanField(default=False)
+
+    objects = BoardManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        base_manager_name = 'all_objects'
 
     def __str__(self):
         """Return the board title."""
@@ -84,6 +100,26 @@ class Ticket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     due_date = models.DateField(null=True, blank=True)
+    # Incremented on every update, used for If-Match / ETag checks.
+    version = models.PositiveIntegerField(default=1)
+    # Position within the column (board and status), see kanban_app.ranking.
+    rank = models.CharField(max_length=255, blank=True, default='')
+    # Old done tickets, hidden from boards and lists (archive_done_tickets).
+    is_archived = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'due_date', 'status'], name='ticket_board_due_status_idx'),
+            # Partial indexes keep archived rows out of the hot board reads.
+            models.Index(
+                fields=['board', 'status', 'rank'], condition=models.Q(is_archived=False),
+                name='ticket_board_active_rank_idx',
+            ),
+            models.Index(
+                fields=['board', '-updated_at'], condition=models.Q(is_archived=True),
+                name='ticket_board_archived_idx',
+            ),
+        ]
 
     def __str__(self):
         """Return the ticket title."""
@@ -125,3 +161,36 @@ class Comment(models.Model):
     def __str__(self):
         """Return a short description of the comment."""
         return f"Comment by {self.author.username}"
+
+
+class Activity(models.Model):
+    """An entry of a board's activity log, see kanban_app.activity."""
+    # Covered by the (board, created_at) index; inserts maintain one index less.
+    board = models.ForeignKey(
+        Board,
+        on_delete=models.CASCADE,
+        related_name='activities',
+        db_index=False,
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activities',
+    )
+    # e.g. 'ticket.moved', 'comment.created', 'board.member_added'
+    verb = models.CharField(max_length=50)
+    # Not a foreign key: the log outlives deleted tickets.
+    ticket_id = models.BigIntegerField(null=True, blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'created_at'], name='activity_board_created_idx'),
+        ]
+
+    def __str__(self):
+        """Return the verb and board."""
+        return f"{self.verb} on board {self.board_id}"
@@ -0,0 +1,156 @@
+"""Lexicographic ranks for the manual order of tickets in a column.
+
+A rank is a base36 string ('0'-'9', 'a'-'z') and tickets of a column
+(board and status) are ordered by comparing ranks as plain strings. A
+rank strictly between any two ranks always exists, so moving a ticket
+only writes the moved row. Ranks never end in '0', otherwise nothing
+would fit between e.g. 'a' and 'a0'.
+
+Archived tickets keep their rank but are no longer part of a column.
+
+Inserting repeatedly at the same spot makes ranks longer; the
+``rebalance_ranks`` command spreads the ranks of such columns evenly
+again.
+"""
+from django.db import transaction
+from django.db.models import F, Max, Min
+
+from kanban_app.models import Ticket
+
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+# Appending to or prepending before a column steps by 36**2 on the
+# first four digits: about 600 steps from the middle before ranks grow.
+STEP_WIDTH = 4
+STEP = BASE ** 2
+# Ranks longer than this mark a column for rebalancing.
+MAX_RANK_LENGTH = 8
+
+
+class RankError(ValueError):
+    """Raised when no rank fits between two ranks."""
+
+
+def _encode(value, width):
+    """Return ``value`` as a base36 string of ``width`` digits, trailing zeros removed."""
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def _decode(rank, width):
+    """Return the integer value of the first ``width`` digits of a rank."""
+    value = 0
+    for char in rank[:width].ljust(width, '0'):
+        value = value * BASE + DIGITS.index(char)
+    return value
+
+
+def _midpoint(before, after):
+    """Return the shortest rank strictly between before and after ('' and None are open ends)."""
+    result = []
+    upper_open = after is None
+    for i in range(max(len(before), len(after or '')) + 1):
+        low = DIGITS.index(before[i]) if i < len(before) else 0
+        high = BASE if upper_open or i >= len(after) else DIGITS.index(after[i])
+        if high - low > 1:
+            result.append(DIGITS[(low + high) // 2])
+            return ''.join(result)
+        result.append(DIGITS[low])
+        if high - low == 1:
+            # the prefix is now below ``after``, any continuation fits
+            upper_open = True
+    # only reached if before >= after
+    raise RankError(f"No rank between {before!r} and {after!r}.")
+
+
+def rank_between(before=None, after=None):
+    """Return a rank that sorts after ``before`` and before ``after``.
+
+    Either side may be None for the start or end of the column.
+    """
+    if before is not None and after is not None and before >= after:
+        raise RankError(f"No rank between {before!r} and {after!r}.")
+    if before is not None and after is None:
+        value = _decode(before, STEP_WIDTH) + STEP
+        if value < BASE ** STEP_WIDTH:
+            return _encode(value, STEP_WIDTH)
+    if before is None and after is not None:
+        value = _decode(after, STEP_WIDTH) - STEP
+        if value > 0:
+            return _encode(value, STEP_WIDTH)
+    return _midpoint(before or '', after)
+
+
+def ranks_between(before, after, count):
+    """Return ``count`` evenly spaced ranks between two ranks (None for open ends)."""
+    if count <= 0:
+        return []
+    if before is None and after is None:
+        width = 1
+        while BASE ** width <= 2 * (count + 1):
+            width += 1
+        step = BASE ** width // (count + 1)
+        return [_encode(step * (i + 1), width) for i in range(count)]
+    middle = rank_between(before, after)
+    half = count // 2
+    return ranks_between(before, middle, half) + [middle] + ranks_between(middle, after, count - half - 1)
+
+
+def neighbour_ranks(column, after_id=None, before_id=None):
+    """Return the ranks a ticket placed between two tickets of ``column`` sorts between.
+
+    ``column`` is a queryset of the target column without the moved
+    tickets. If only one neighbour is given the other one is looked up
+    through the rank index; without neighbours the gap is the end of the
+    column. Raises LookupError if a neighbour is not in the column.
+    """
+    ids = [i for i in (after_id, before_id) if i is not None]
+    ranks = dict(column.filter(pk__in=ids).values_list('id', 'rank'))
+    if len(ranks) != len(set(ids)):
+        raise LookupError("Neighbours must be tickets of the target column.")
+    prev_rank = ranks.get(after_id)
+    next_rank = ranks.get(before_id)
+    if after_id is not None and before_id is None:
+        next_rank = column.filter(rank__gt=prev_rank).order_by('rank').values_list('rank', flat=True).first()
+    elif before_id is not None and after_id is None:
+        prev_rank = column.filter(rank__lt=next_rank).order_by('-rank').values_list('rank', flat=True).first()
+    elif after_id is None and before_id is None:
+        prev_rank = column.order_by('-rank').values_list('rank', flat=True).first()
+    return prev_rank or None, next_rank
+
+
+def column_tickets(board_id, status):
+    """Return the tickets of a column, without archived ones."""
+    return Ticket.objects.filter(board_id=board_id, status=status, is_archived=False)
+
+
+def last_rank(board_id, status):
+    """Return the highest rank in a column, or None if it is empty."""
+    return column_tickets(board_id, status).aggregate(rank=Max('rank'))['rank'] or None
+
+
+def first_rank(board_id, status):
+    """Return the lowest rank in a column, or None if it is empty."""
+    return column_tickets(board_id, status).aggregate(rank=Min('rank'))['rank'] or None
+
+
+def rebalance_column(board_id, status):
+    """Spread the ranks of a column evenly, keeping the current order.
+
+    The versions of the tickets are bumped, so their ETags change with the ranks.
+    """
+    with transaction.atomic():
+        tickets = list(
+            column_tickets(board_id, status).select_for_update()
+            .order_by('rank', 'id')
+            .only('id', 'rank')
+        )
+        for ticket, rank in zip(tickets, ranks_between(None, None, len(tickets))):
+            ticket.rank = rank
+            ticket.version = F('version') + 1
+        Ticket.objects.bulk_update(tickets, ['rank', 'version'], batch_size=500)
+    return len(tickets)
@@ -0,0 +1,246 @@
+"""Full-text search over tickets, subtickets and comments.
+
+The backend is chosen with the ``KANBAN_SEARCH_BACKEND`` setting (a dotted
+path). By default SQLite databases use an FTS5 index and every other
+database falls back to plain ``icontains`` queries.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from kanban_app.models import Ticket, Subticket, Comment
+
+
+KINDS = {Ticket: 'ticket', Subticket: 'subticket', Comment: 'comment'}
+KIND_CODES = {'ticket': 0, 'subticket': 1, 'comment': 2}
+
+
+def search_terms(query):
+    """Split a user query into word tokens; a trailing '*' marks a prefix."""
+    return re.findall(r'\w+\*?', query)
+
+
+def _row_fields(obj):
+    """Return (title, body, ticket_id) for an indexed object."""
+    if isinstance(obj, Ticket):
+        return obj.title, obj.description, obj.id
+    if isinstance(obj, Subticket):
+        return obj.title, '', obj.ticket_id
+    return '', obj.text, obj.ticket_id
+
+
+class BaseSearchBackend:
+    """Interface for search backends."""
+
+    def index(self, obj):
+        """Add or update a single ticket, subticket or comment."""
+
+    def remove(self, obj):
+        """Remove a single ticket, subticket or comment."""
+
+    def index_board(self, board_id):
+        """Add every object of a board, e.g. after a bulk import."""
+
+    def remove_board(self, board_id, chunk_size=1000):
+        """Remove every object of a board, e.g. before deleting it."""
+
+    def rebuild(self):
+        """Rebuild the whole index from the database."""
+
+    def search(self, query, board_ids, limit=20):
+        """Return ranked result dicts for the given boards."""
+        raise NotImplementedError
+
+
+class ORMSearchBackend(BaseSearchBackend):
+    """Fallback backend that searches with icontains, without an index."""
+
+    def search(self, query, board_ids, limit=20):
+        """Return matches, title matches ranked before body matches."""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        ticket_q, subticket_q, comment_q = Q(), Q(), Q()
+        terms = [term.rstrip('*') for term in terms]
+        for term in terms:
+            ticket_q &= Q(title__icontains=term) | Q(description__icontains=term)
+            subticket_q &= Q(title__icontains=term)
+            comment_q &= Q(text__icontains=term)
+
+        results = []
+        tickets = Ticket.objects.filter(ticket_q, board_id__in=board_ids)
+        for t in tickets.values('id', 'board_id', 'title', 'description')[:limit]:
+            in_title = all(term.lower() in t['title'].lower() for term in terms)
+            results.append(self._result('ticket', t['id'], t['id'], t['board_id'],
+                                        t['title'], t['description'], 0 if in_title else 1))
+        subtickets = Subticket.objects.filter(subticket_q, ticket__board_id__in=board_ids)
+        for s in subtickets.values('id', 'ticket_id', 'ticket__board_id', 'title')[:limit]:
+            results.append(self._result('subticket', s['id'], s['ticket_id'],
+                                        s['ticket__board_id'], s['title'], '', 0))
+        comments = Comment.objects.filter(comment_q, ticket__board_id__in=board_ids)
+        for c in comments.values('id', 'ticket_id', 'ticket__board_id', 'text')[:limit]:
+            results.append(self._result('comment', c['id'], c['ticket_id'],
+                                        c['ticket__board_id'], '', c['text'], 1))
+        results.sort(key=lambda r: r['rank'])
+        return results[:limit]
+
+    def _result(self, kind, object_id, ticket_id, board_id, title, body, rank):
+        """Build a result dict."""
+        return {
+            "type": kind,
+            "id": object_id,
+            "ticket_id": ticket_id,
+            "board_id": board_id,
+            "title": title,
+            "snippet": body[:200],
+            "rank": rank,
+        }
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """Backend that keeps an FTS5 virtual table in sync with the data.
+
+    Each object maps to a fixed rowid (``id * 3 + kind code``) so that
+    updates and deletes are rowid lookups instead of table scans. The
+    ``board`` column holds a ``b<id>`` token, which lets FTS5 intersect the
+    match with the accessible boards instead of filtering afterwards.
+    Queries matching more than ``max_ranked_matches`` rows are returned
+    newest first, because bm25 has to score every match. Terms match whole
+    words unless they end in ``*``; FTS5 cannot skip through prefix
+    doclists, so prefix queries are opt-in.
+    """
+    table = 'kanban_app_search'
+    max_ranked_matches = 1000
+
+    def _rowid(self, kind, object_id):
+        """Return the FTS rowid for an object."""
+        return object_id * len(KIND_CODES) + KIND_CODES[kind]
+
+    def index(self, obj):
+        """Insert or replace the row of a single object."""
+        title, body, ticket_id = _row_fields(obj)
+        if ticket_id is None:
+            return
+        if isinstance(obj, Ticket):
+            board_id = obj.board_id
+        else:
+            board_id = Ticket.objects.filter(pk=ticket_id).values_list('board_id', flat=True).first()
+        kind = KINDS[type(obj)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(rowid, title, body, board, kind, object_id, ticket_id, board_id) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+                [self._rowid(kind, obj.id), title, body or '', f'b{board_id}',
+                 kind, obj.id, ticket_id, board_id],
+            )
+
+    def remove(self, obj):
+        """Delete the row of a single object."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [self._rowid(KINDS[type(obj)], obj.id)],
+            )
+
+    def _insert_from_tables(self, cursor, where='', params=()):
+        """Copy rows from the model tables into the index with INSERT ... SELECT."""
+        tickets = Ticket._meta.db_table
+        subtickets = Subticket._meta.db_table
+        comments = Comment._meta.db_table
+        size = len(KIND_CODES)
+        statements = [
+            f"SELECT t.id * {size}, t.title, t.description, 'b' || t.board_id, "
+            f"'ticket', t.id, t.id, t.board_id FROM {tickets} t",
+            f"SELECT s.id * {size} + 1, s.title, '', 'b' || t.board_id, "
+            f"'subticket', s.id, t.id, t.board_id "
+            f"FROM {subtickets} s JOIN {tickets} t ON s.ticket_id = t.id",
+            f"SELECT c.id * {size} + 2, '', c.text, 'b' || t.board_id, "
+            f"'comment', c.id, t.id, t.board_id "
+            f"FROM {comments} c JOIN {tickets} t ON c.ticket_id = t.id",
+        ]
+        for select in statements:
+            cursor.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(rowid, title, body, board, kind, object_id, ticket_id, board_id) "
+                f"{select} {where}",
+                params,
+            )
+
+    def index_board(self, board_id):
+        """Index every object of one board."""
+        with connection.cursor() as cursor:
+            self._insert_from_tables(cursor, 'WHERE t.board_id = %s', [board_id])
+
+    def remove_board(self, board_id, chunk_size=1000):
+        """Delete the rows of one board, ``chunk_size`` rows per statement."""
+        with connection.cursor() as cursor:
+            while True:
+                cursor.execute(
+                    f"DELETE FROM {self.table} WHERE rowid IN ("
+                    f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s LIMIT %s)",
+                    [f'board : b{int(board_id)}', chunk_size],
+                )
+                if cursor.rowcount < chunk_size:
+                    break
+
+    def rebuild(self):
+        """Drop all rows and index every object again."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            self._insert_from_tables(cursor)
+
+    def search(self, query, board_ids, limit=20):
+        """Return bm25 ranked matches, title hits weighted higher."""
+        terms = search_terms(query)
+        board_ids = list(board_ids)
+        if not terms or not board_ids:
+            return []
+        words = ' '.join(
+            f'"{term[:-1]}"*' if term.endswith('*') else f'"{term}"' for term in terms
+        )
+        boards = ' OR '.join(f'b{int(board_id)}' for board_id in board_ids)
+        match = f'{{title body}} : ({words}) AND board : ({boards})'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT 1 FROM {self.table} WHERE {self.table} MATCH %s LIMIT 1 OFFSET %s",
+                [match, self.max_ranked_matches],
+            )
+            if cursor.fetchone():
+                # bm25 needs document counts over the whole index, skip it.
+                score, order = 'NULL', 'rowid DESC'
+            else:
+                score, order = f'bm25({self.table}, 10.0, 1.0, 0.0)', 'score'
+            cursor.execute(
+                f"SELECT kind, object_id, ticket_id, board_id, title, "
+                f"snippet({self.table}, 1, '', '', '...', 16), {score} AS score "
+                f"FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY {order} LIMIT %s",
+                [match, limit],
+            )
+            rows = cursor.fetchall()
+        return [
+            {
+                "type": kind,
+                "id": object_id,
+                "ticket_id": ticket_id,
+                "board_id": board_id,
+                "title": title,
+                "snippet": snippet,
+                "rank": score,
+            }
+            for kind, object_id, ticket_id, board_id, title, snippet, score in rows
+        ]
+
+
+def get_search_backend():
+    """Return the configured search backend instance."""
+    path = getattr(settings, 'KANBAN_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == 'sqlite':
+        return SQLiteFTSBackend()
+    return ORMSearchBackend()
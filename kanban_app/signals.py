@@ -0,0 +1,167 @@
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+
+from kanban_app.activity import record
+from kanban_app.caching import bump_board_members_version, bump_board_version
+from kanban_app.models import Board, Ticket, Subticket, Comment
+from kanban_app.ranking import last_rank, rank_between
+from kanban_app.search import get_search_backend
+
+
+# Sent once by bulk moves, which bypass post_save. Arguments: board_id,
+# ticket_ids, status and user.
+tickets_moved = Signal()
+
+# Saves that only touch other fields leave the search index alone.
+INDEXED_FIELDS = {'title', 'description', 'text', 'ticket', 'board'}
+# Bookkeeping fields left out of 'ticket.updated' entries.
+UNLOGGED_FIELDS = {'updated_at', 'version', 'rank', 'is_archived'}
+# User fields shown or searched in the user directory.
+DIRECTORY_FIELDS = {'username', 'email', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_save, sender=Subticket)
+@receiver(post_save, sender=Comment)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Keep the search index in sync with saved objects."""
+    if update_fields is not None and not INDEXED_FIELDS & set(update_fields):
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Ticket)
+@receiver(post_delete, sender=Subticket)
+@receiver(post_delete, sender=Comment)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Remove deleted objects from the search index."""
+    get_search_backend().remove(instance)
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def invalidate_board_cache(sender, instance, **kwargs):
+    """Bump the board version so cached board data is recomputed."""
+    bump_board_version(instance.board_id)
+
+
+@receiver(pre_save, sender=Ticket)
+def assign_rank(sender, instance, raw=False, **kwargs):
+    """Put new tickets at the end of their column."""
+    if not instance.rank and not raw:
+        instance.rank = rank_between(last_rank(instance.board_id, instance.status), None)
+
+
+@receiver(tickets_moved)
+def invalidate_board_cache_after_move(sender, board_id, **kwargs):
+    """Bump the board version once for a bulk move."""
+    bump_board_version(board_id)
+
+
+@receiver(post_save, sender=Ticket)
+def log_ticket_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Log created, moved and edited tickets."""
+    if raw:
+        return
+    if created:
+        record(instance.board_id, 'ticket.created', instance.id, title=instance.title, status=instance.status)
+        return
+    fields = set(update_fields or ()) - UNLOGGED_FIELDS
+    # Changing only the column or the position is a move.
+    if update_fields is not None and {'status', 'rank'} & set(update_fields) and fields <= {'status'}:
+        record(instance.board_id, 'ticket.moved', instance.id, status=instance.status)
+    elif update_fields is None or fields:
+        data = {'status': instance.status} if 'status' in fields else {}
+        record(instance.board_id, 'ticket.updated', instance.id, fields=sorted(fields), **data)
+
+
+@receiver(post_delete, sender=Ticket)
+def log_ticket_deleted(sender, instance, **kwargs):
+    """Log deleted tickets with their title."""
+    record(instance.board_id, 'ticket.deleted', instance.id, title=instance.title)
+
+
+@receiver(tickets_moved)
+def log_tickets_moved(sender, board_id, ticket_ids, status, user=None, **kwargs):
+    """Log every ticket of a bulk move."""
+    for ticket_id in ticket_ids:
+        record(board_id, 'ticket.moved', ticket_id, actor=user, status=status)
+
+
+@receiver(post_save, sender=Comment)
+def log_comment_created(sender, instance, created, raw=False, **kwargs):
+    """Log new comments."""
+    if created and not raw and instance.ticket_id is not None:
+        record(instance.ticket.board_id, 'comment.created', instance.ticket_id, comment_id=instance.id)
+
+
+@receiver(post_delete, sender=Comment)
+def log_comment_deleted(sender, instance, origin=None, **kwargs):
+    """Log deleted comments, unless they go with their ticket."""
+    if isinstance(origin, Comment) and instance.ticket_id is not None:
+        record(instance.ticket.board_id, 'comment.deleted', instance.ticket_id, comment_id=instance.id)
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def log_membership(sender, instance, action, pk_set, reverse, **kwargs):
+    """Log members added to or removed from a board."""
+    if reverse or action not in ('post_add', 'post_remove') or not pk_set:
+        return
+    verb = 'board.member_added' if action == 'post_add' else 'board.member_removed'
+    for user_id in sorted(pk_set):
+        record(instance.id, verb, user_id=user_id)
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def invalidate_user_directory_on_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh the directories of a board's users when its members change."""
+    if action in ('post_add', 'post_remove'):
+        bump_board_members_version(*(pk_set if reverse else [instance.pk]))
+    elif action == 'pre_clear':
+        bump_board_members_version(*(instance.boards.values_list('pk', flat=True) if reverse else [instance.pk]))
+
+
+@receiver(post_init, sender=Board)
+def remember_board_owner(sender, instance, **kwargs):
+    """Keep the loaded owner to notice owner changes on save."""
+    # __dict__ avoids a query for a deferred owner.
+    instance._loaded_owner_id = instance.__dict__.get('owner_id')
+
+
+@receiver(post_save, sender=Board)
+def invalidate_user_directory_on_owner(sender, instance, created, **kwargs):
+    """Refresh the directories of a board's users when its owner changes."""
+    owner_id = instance.__dict__.get('owner_id')
+    if not created and owner_id != instance._loaded_owner_id:
+        bump_board_members_version(instance.pk)
+    instance._loaded_owner_id = owner_id
+
+
+def bump_boards_of_user(user_id):
+    """Refresh the directories of everyone sharing a board with a user."""
+    boards = Board.all_objects.filter(Q(owner_id=user_id) | Q(members=user_id)).values_list('pk', flat=True)
+    bump_board_members_version(*set(boards))
+
+
+def bump_boards_assigned_to_user(user_id):
+    """Invalidate the cached stats of boards whose workload shows a user."""
+    boards = Ticket.objects.filter(assignee_id=user_id).values_list('board_id', flat=True)
+    for board_id in set(boards):
+        bump_board_version(board_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_directory_on_user(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh directories and board stats showing a user whose name or email changed."""
+    if not created and (update_fields is None or DIRECTORY_FIELDS & set(update_fields)):
+        bump_boards_of_user(instance.pk)
+        bump_boards_assigned_to_user(instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def invalidate_user_directory_on_delete(sender, instance, **kwargs):
+    """Refresh directories and board stats showing a user that is deleted."""
+    bump_boards_of_user(instance.pk)
+    bump_boards_assigned_to_user(instance.pk)
@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from kanban_app.api.serializers import UserSerializer
+from kanban_app.models import Ticket
+
+
+def compute_board_stats(board_id, today=None):
+    """Return ticket counts for a board from a single GROUP BY query.
+
+    Archived tickets are left out. The result contains counts by status and priority, the open, total
+    and overdue workload per assignee and the number of overdue tickets.
+    """
+    today = today or timezone.localdate()
+    rows = (
+        Ticket.objects.filter(board_id=board_id, is_archived=False)
+        .values('status', 'priority', 'assignee_id')
+        .annotate(
+            count=Count('id'),
+            overdue=Count('id', filter=Q(due_date__lt=today) & ~Q(status='done')),
+        )
+        .order_by()
+    )
+
+    by_status = {
+        status: {priority: 0 for priority, _ in Ticket.PRIORITY_CHOICES}
+        for status, _ in Ticket.STATUS_CHOICES
+    }
+    workload = {}
+    total = overdue = 0
+    for row in rows:
+        counts = by_status.setdefault(row['status'], {})
+        counts[row['priority']] = counts.get(row['priority'], 0) + row['count']
+        total += row['count']
+        overdue += row['overdue']
+        if row['assignee_id'] is not None:
+            load = workload.setdefault(row['assignee_id'], {'open': 0, 'total': 0, 'overdue': 0})
+            load['total'] += row['count']
+            load['overdue'] += row['overdue']
+            if row['status'] != 'done':
+                load['open'] += row['count']
+
+    return {
+        "board_id": board_id,
+        "ticket_count": total,
+        "overdue_count": overdue,
+        "by_status": by_status,
+        "workload": _workload_list(workload),
+    }
+
+
+def _workload_list(workload):
+    """Attach user data to the per-assignee counts."""
+    users = User.objects.in_bulk(list(workload)) if workload else {}
+    return [
+        {"user": UserSerializer(users[user_id]).data, **counts}
+        for user_id, counts in sorted(workload.items())
+        if user_id in users
+    ]
@@ -0,0 +1,22 @@
+"""Background tasks of the kanban app, run by jobs_app workers."""
+from jobs_app.tasks import task
+from kanban_app import deletion
+from kanban_app.search import get_search_backend
+
+
+@task('kanban.delete_board')
+def delete_board(board_id):
+    """Delete a board flagged as deleted."""
+    return {"tickets": deletion.delete_board(board_id)}
+
+
+@task('kanban.index_board')
+def index_board(board_id):
+    """Add every object of a board to the search index."""
+    get_search_backend().index_board(board_id)
+
+
+@task('kanban.rebuild_search_index')
+def rebuild_search_index():
+    """Rebuild the whole search index."""
+    get_search_backend().rebuild()
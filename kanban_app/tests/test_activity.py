@@ -0,0 +1,129 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from kanban_app.models import Activity, Board, Comment, Ticket
+
+
+class ActivityLogTest(TestCase):
+    """Test recording of the activity log and the activity feed"""
+
+    def setUp(self):
+        """Create a board with a member and two tickets"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.member = User.objects.create_user(username='member', email='member@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+        self.a = Ticket.objects.create(board=self.board, title='A')
+        self.b = Ticket.objects.create(board=self.board, title='B')
+        Activity.objects.all().delete()
+        self.url = f'/api/boards/{self.board.id}/activity/'
+
+    def verbs(self):
+        """Return (verb, ticket_id) of all entries in insertion order"""
+        return list(Activity.objects.order_by('id').values_list('verb', 'ticket_id'))
+
+    def test_request_entries_are_written_at_once(self):
+        """Test that a request's entries are inserted in one statement with the actor"""
+        data = {'ticket_ids': [self.a.id, self.b.id], 'status': 'done'}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(f'/api/boards/{self.board.id}/move/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        inserts = [q['sql'] for q in queries if 'kanban_app_activity' in q['sql']]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(self.verbs(), [('ticket.moved', self.a.id), ('ticket.moved', self.b.id)])
+        self.assertEqual(set(Activity.objects.values_list('actor_id', flat=True)), {self.user.id})
+        self.assertEqual(Activity.objects.first().data, {'status': 'done'})
+
+    def test_ticket_comment_and_member_changes(self):
+        """Test the verbs logged for the different changes"""
+        self.client.patch(f'/api/tasks/{self.a.id}/', {'title': 'A2'}, format='json')
+        self.client.post(f'/api/tasks/{self.a.id}/move/', {'status': 'review'}, format='json')
+        response = self.client.post(f'/api/tasks/{self.a.id}/comments/', {'content': 'Hi'}, format='json')
+        comment_id = response.data['id']
+        self.client.delete(f'/api/tasks/{self.a.id}/comments/{comment_id}/')
+        self.client.patch(f'/api/boards/{self.board.id}/', {'members': [self.member.id]}, format='json')
+        self.client.delete(f'/api/tasks/{self.b.id}/')
+        self.assertEqual(self.verbs(), [
+            ('ticket.updated', self.a.id),
+            ('ticket.moved', self.a.id),
+            ('comment.created', self.a.id),
+            ('comment.deleted', self.a.id),
+            ('board.member_added', None),
+            ('ticket.deleted', self.b.id),
+        ])
+        entries = Activity.objects.order_by('id')
+        self.assertEqual(entries[0].data, {'fields': ['title']})
+        self.assertEqual(entries[4].data, {'user_id': self.member.id})
+        self.assertEqual(entries[5].data, {'title': 'B'})
+
+    def test_ticket_deletion_skips_its_comments(self):
+        """Test that deleting a ticket logs one entry, not one per comment"""
+        for text in ('x', 'y'):
+            Comment.objects.create(ticket=self.a, author=self.user, text=text)
+        Activity.objects.all().delete()
+        self.client.delete(f'/api/tasks/{self.a.id}/')
+        self.assertEqual(self.verbs(), [('ticket.deleted', self.a.id)])
+
+    def test_feed_is_cursor_paginated(self):
+        """Test that the feed pages newest first with cursors"""
+        for i in range(5):
+            Activity.objects.create(board=self.board, verb='ticket.updated', ticket_id=self.a.id, data={'n': i})
+        response = self.client.get(self.url, {'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([e['data']['n'] for e in response.data['results']], [4, 3, 2])
+        self.assertIsNone(response.data['previous'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([e['data']['n'] for e in response.data['results']], [1, 0])
+        self.assertIsNone(response.data['next'])
+
+    def test_feed_orders_equal_timestamps_by_id(self):
+        """Test that entries created at the same time page without gaps or repeats"""
+        Activity.objects.bulk_create([
+            Activity(board=self.board, verb='ticket.updated', data={'n': i}) for i in range(5)
+        ])
+        Activity.objects.update(created_at=timezone.now())
+        response = self.client.get(self.url, {'page_size': 2})
+        seen = [e['data']['n'] for e in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += [e['data']['n'] for e in response.data['results']]
+        self.assertEqual(seen, [4, 3, 2, 1, 0])
+
+    def test_feed_requires_board_access(self):
+        """Test that non-members get a 404"""
+        token = Token.objects.create(user=self.member)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_compact_activity(self):
+        """Test that old entries go and boards are capped"""
+        for i in range(6):
+            Activity.objects.create(board=self.board, verb='ticket.updated', data={'n': i})
+        Activity.objects.filter(data__n=0).update(created_at=timezone.now() - timedelta(days=400))
+        out = StringIO()
+        call_command('compact_activity', '--days', '365', '--max-per-board', '3', '--chunk-size', '1', stdout=out)
+        self.assertIn('Deleted 3 activity entries', out.getvalue())
+        self.assertEqual(sorted(Activity.objects.values_list('data__n', flat=True)), [3, 4, 5])
+
+    def test_compact_activity_caps_entries_with_equal_timestamps(self):
+        """Test that the cap holds when entries share the cutoff timestamp"""
+        Activity.objects.bulk_create([
+            Activity(board=self.board, verb='ticket.updated', data={'n': i}) for i in range(6)
+        ])
+        Activity.objects.update(created_at=timezone.now())
+        call_command('compact_activity', '--max-per-board', '3', stdout=StringIO())
+        self.assertEqual(sorted(Activity.objects.values_list('data__n', flat=True)), [3, 4, 5])
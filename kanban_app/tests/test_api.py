@@ -1,10 +1,18 @@
+from datetime import timedelta
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
+from kanban_app.api.views import TicketViewSet
+from kanban_app.caching import get_board_version
 from kanban_app.models import Board, Ticket, Comment
 
 
@@ -86,6 +94,75 @@ class BoardAPITest(TestCase):
         self.assertEqual(Board.objects.count(), 1)
 
 
+class BoardStatsAPITest(TestCase):
+    """Test the board statistics endpoint"""
+
+    def setUp(self):
+        """Create a board with tickets in different states"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+        yesterday = timezone.localdate() - timedelta(days=1)
+        Ticket.objects.create(board=self.board, title='A', priority='high', assignee=self.user)
+        Ticket.objects.create(
+            board=self.board, title='B', priority='high', assignee=self.user, due_date=yesterday,
+        )
+        Ticket.objects.create(board=self.board, title='C', status='done', due_date=yesterday)
+        self.url = f'/api/boards/{self.board.id}/stats/'
+
+    def test_stats(self):
+        """Test counts by status and priority, workload and overdue"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['ticket_count'], 3)
+        self.assertEqual(response.data['overdue_count'], 1)
+        self.assertEqual(response.data['by_status']['to-do']['high'], 2)
+        self.assertEqual(response.data['by_status']['done']['medium'], 1)
+        workload = response.data['workload']
+        self.assertEqual(workload[0]['user']['id'], self.user.id)
+        self.assertEqual((workload[0]['open'], workload[0]['overdue']), (2, 1))
+
+    def test_cached_stats_do_not_touch_tickets(self):
+        """Test that a repeated request is served from the cache"""
+        self.client.get(self.url)
+        # token and board access check only
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['ticket_count'], 3)
+
+    def test_ticket_change_invalidates_cache(self):
+        """Test that a ticket change bumps the board version"""
+        first = self.client.get(self.url)
+        Ticket.objects.create(board=self.board, title='D')
+        second = self.client.get(self.url)
+        self.assertEqual(second.data['ticket_count'], 4)
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+    def test_assignee_rename_invalidates_cache(self):
+        """Test that renaming an assignee refreshes the cached workload"""
+        self.client.get(self.url)
+        self.user.first_name, self.user.last_name, self.user.email = 'Ada', 'Lovelace', 'renamed@example.com'
+        self.user.save()
+        user = self.client.get(self.url).data['workload'][0]['user']
+        self.assertEqual((user['fullname'], user['email']), ('Ada Lovelace', 'renamed@example.com'))
+
+    def test_not_modified(self):
+        """Test that a matching If-None-Match returns 304"""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_stats_of_foreign_board(self):
+        """Test that other users get 404"""
+        other = User.objects.create_user(username='other')
+        self.client.force_authenticate(other)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
 class TicketAPITest(TestCase):
     """Test Ticket API endpoints"""
 
@@ -149,6 +226,149 @@ class TicketAPITest(TestCase):
         self.assertEqual(Ticket.objects.count(), 0)
 
 
+class TicketUpdateAPITest(TestCase):
+    """Test minimal writes and optimistic concurrency on ticket updates"""
+
+    def setUp(self):
+        """Create a ticket on a board with a member"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.member = User.objects.create_user(username='member', email='member@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+        self.board.members.add(self.member)
+        self.ticket = Ticket.objects.create(board=self.board, title='Ticket', created_by=self.user)
+        self.url = f'/api/tasks/{self.ticket.id}/'
+
+    def test_status_change_is_one_update(self):
+        """Test that a status change writes only the changed columns"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'status': 'review'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        writes = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(writes), 1)
+        self.assertIn('"status"', writes[0])
+        self.assertNotIn('"title"', writes[0])
+        # token, ticket with board and users, last rank of the new column, UPDATE, activity INSERT
+        self.assertEqual(len(queries), 5)
+        self.ticket.refresh_from_db()
+        self.assertEqual((self.ticket.status, self.ticket.version), ('review', 2))
+        self.assertEqual(response['ETag'], '"2"')
+
+    def test_unchanged_values_are_not_written(self):
+        """Test that an update without changes runs no UPDATE"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(self.url, {'status': 'to-do'})
+        self.assertFalse([q for q in queries if q['sql'].startswith('UPDATE')])
+
+    def test_assignee_must_be_member(self):
+        """Test that assignees are checked against the board members"""
+        response = self.client.patch(self.url, {'assignee_id': self.member.id})
+        self.assertEqual(response.data['assignee']['id'], self.member.id)
+        outsider = User.objects.create_user(username='outsider')
+        response = self.client.patch(self.url, {'reviewer_id': outsider.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_if_match(self):
+        """Test that a matching If-Match header allows the update"""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'title': 'Renamed'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_stale_if_match(self):
+        """Test that an outdated ETag returns 412 and changes nothing"""
+        etag = self.client.get(self.url)['ETag']
+        self.client.patch(self.url, {'priority': 'high'})
+        response = self.client.patch(self.url, {'title': 'Lost update'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(response['ETag'], '"2"')
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.title, 'Ticket')
+
+    def test_concurrent_change_after_read(self):
+        """Test that the UPDATE itself checks the version"""
+        view = TicketViewSet()
+        self.ticket.version = 1
+        Ticket.objects.filter(pk=self.ticket.pk).update(version=5)
+        self.assertFalse(view._save_changes(self.ticket, {'title': 'Stale'}, check_version=True))
+        self.assertTrue(view._save_changes(self.ticket, {'title': 'Forced'}, check_version=False))
+
+    def test_update_invalidates_board_cache(self):
+        """Test that signal receivers still run for the UPDATE"""
+        version = get_board_version(self.board.id)
+        self.client.patch(self.url, {'status': 'done'})
+        self.assertNotEqual(get_board_version(self.board.id), version)
+
+
+class TicketFilterAPITest(TestCase):
+    """Test filtering, ordering and sparse fields on the ticket list"""
+
+    def setUp(self):
+        """Create tickets on two boards"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.other = User.objects.create_user(username='other', email='other@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.second_board = Board.objects.create(title='Second', owner=self.user)
+        Ticket.objects.create(
+            board=self.board, title='A', status='to-do', priority='high',
+            assignee=self.user, due_date='2026-01-10',
+        )
+        Ticket.objects.create(
+            board=self.board, title='B', status='done', priority='low',
+            reviewer=self.user, due_date='2026-02-10',
+        )
+        Ticket.objects.create(board=self.second_board, title='C', status='review')
+        foreign_board = Board.objects.create(title='Foreign', owner=self.other)
+        Ticket.objects.create(board=foreign_board, title='Hidden')
+
+    def titles(self, query):
+        """Return the ticket titles for a list query"""
+        response = self.client.get(f'/api/tasks/?{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [t['title'] for t in response.data]
+
+    def test_filter_by_board_and_status(self):
+        """Test board and comma separated status filters"""
+        self.assertEqual(self.titles(f'board={self.board.id}&ordering=title'), ['A', 'B'])
+        self.assertEqual(self.titles('status=done,review&ordering=title'), ['B', 'C'])
+
+    def test_filter_by_users_and_due_date(self):
+        """Test assignee, reviewer and due date filters"""
+        self.assertEqual(self.titles(f'assignee={self.user.id}'), ['A'])
+        self.assertEqual(self.titles(f'reviewer={self.user.id}'), ['B'])
+        self.assertEqual(self.titles('due_after=2026-02-01'), ['B'])
+        self.assertEqual(self.titles('due_before=2026-02-01'), ['A'])
+
+    def test_ordering(self):
+        """Test descending ordering"""
+        self.assertEqual(self.titles('ordering=-title'), ['C', 'B', 'A'])
+
+    def test_sparse_fields(self):
+        """Test that only the requested fields are returned"""
+        response = self.client.get('/api/tasks/?fields=id,title&ordering=id')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {'id', 'title'})
+
+    def test_invalid_parameters(self):
+        """Test that invalid filter values return 400"""
+        for query in ('status=nope', 'ordering=password', 'fields=secret', 'board=x', 'due_before=soon'):
+            response = self.client.get(f'/api/tasks/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+    def test_list_query_count(self):
+        """Test that the full list does not run queries per ticket"""
+        # token, tickets with counts, assigned_to and subtickets prefetches
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(len(response.data), 3)
+
+
 class CommentAPITest(TestCase):
     """Test Comment API endpoints"""
 
@@ -236,6 +456,11 @@ class AssignedToMeAPITest(TestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['title'], 'Assigned Ticket')
 
+    def test_assigned_to_me_query_count(self):
+        """Test that users and comment counts do not cause extra queries"""
+        with self.assertNumQueries(2):
+            self.client.get('/api/tasks/assigned-to-me/')
+
     def test_assigned_to_me_unauthorized(self):
         """Test that unauthenticated users cannot access"""
         self.client.credentials()
@@ -243,6 +468,116 @@ class AssignedToMeAPITest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+class MyTasksAPITest(TestCase):
+    """Test the combined my tasks endpoint"""
+
+    def setUp(self):
+        """Create tickets where the user has different roles"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        other = User.objects.create_user(username='other')
+
+        self.board = Board.objects.create(title='Test Board', owner=other)
+        self.board.members.add(self.user)
+        Ticket.objects.create(board=self.board, title='Assigned', assignee=self.user, created_by=other)
+        Ticket.objects.create(board=self.board, title='Reviewing', reviewer=self.user, created_by=other)
+        Ticket.objects.create(
+            board=self.board, title='Both', assignee=self.user, reviewer=self.user, created_by=self.user,
+        )
+        Ticket.objects.create(board=self.board, title='Unrelated', created_by=other)
+        foreign_board = Board.objects.create(title='Foreign', owner=other)
+        Ticket.objects.create(board=foreign_board, title='Hidden', assignee=self.user)
+
+    def test_roles(self):
+        """Test that tickets are tagged with every role of the user"""
+        response = self.client.get('/api/tasks/mine/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        roles = {t['title']: t['roles'] for t in response.data}
+        self.assertEqual(roles, {
+            'Assigned': ['assignee'],
+            'Reviewing': ['reviewer'],
+            'Both': ['assignee', 'reviewer', 'creator'],
+        })
+
+    def test_role_filter(self):
+        """Test limiting the result to one role"""
+        response = self.client.get('/api/tasks/mine/', {'role': 'reviewer'})
+        self.assertEqual(sorted(t['title'] for t in response.data), ['Both', 'Reviewing'])
+        response = self.client.get('/api/tasks/mine/', {'role': 'owner'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_pagination(self):
+        """Test that pagination is used when a page size is given"""
+        response = self.client.get('/api/tasks/mine/', {'page_size': 2})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_query_count(self):
+        """Test that users, roles and comment counts come from one query"""
+        with self.assertNumQueries(2):
+            self.client.get('/api/tasks/mine/')
+
+
+class DueTasksAPITest(TestCase):
+    """Test the due date endpoint"""
+
+    def setUp(self):
+        """Create tickets with different due dates"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+        today = timezone.localdate()
+        self.overdue = Ticket.objects.create(
+            board=self.board, title='Overdue', due_date=today - timedelta(days=2),
+        )
+        Ticket.objects.create(
+            board=self.board, title='Done late', status='done', due_date=today - timedelta(days=3),
+        )
+        Ticket.objects.create(board=self.board, title='This week', due_date=today + timedelta(days=3))
+        Ticket.objects.create(board=self.board, title='Later', due_date=today + timedelta(days=30))
+        Ticket.objects.create(board=self.board, title='No date')
+        other = User.objects.create_user(username='other')
+        foreign_board = Board.objects.create(title='Foreign', owner=other)
+        Ticket.objects.create(board=foreign_board, title='Hidden', due_date=today)
+
+    def titles(self, params):
+        """Return ticket titles for the given query parameters"""
+        response = self.client.get('/api/tasks/due/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [t['title'] for t in response.data]
+
+    def test_all_due_tickets_ordered_by_date(self):
+        """Test that only dated tickets are returned, soonest first"""
+        self.assertEqual(self.titles({}), ['Done late', 'Overdue', 'This week', 'Later'])
+
+    def test_overdue(self):
+        """Test that overdue excludes done tickets"""
+        self.assertEqual(self.titles({'overdue': 'true'}), ['Overdue'])
+
+    def test_date_range(self):
+        """Test due this week"""
+        today = timezone.localdate()
+        params = {'due_after': str(today), 'due_before': str(today + timedelta(days=7))}
+        self.assertEqual(self.titles(params), ['This week'])
+
+    def test_query_count(self):
+        """Test that users and comment counts do not cause extra queries"""
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/tasks/due/')
+        self.assertEqual(response.data[1]['comments_count'], 0)
+
+    def test_invalid_overdue(self):
+        """Test that an invalid overdue value returns 400"""
+        response = self.client.get('/api/tasks/due/', {'overdue': 'maybe'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class ReviewingTasksAPITest(TestCase):
     """Test reviewing tickets endpoint"""
 
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from kanban_app.caching import get_board_version
+from kanban_app.models import Board, Ticket
+
+
+class ArchiveDoneTicketsTest(TestCase):
+    """Test archiving old done tickets and the archive endpoint"""
+
+    def setUp(self):
+        """Create a board with old and recent done tickets and an open one"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+        self.old = [
+            Ticket.objects.create(board=self.board, title=f'Old {i}', status='done', assignee=self.user)
+            for i in range(3)
+        ]
+        self.recent = Ticket.objects.create(board=self.board, title='Recent', status='done')
+        self.open = Ticket.objects.create(board=self.board, title='Open', status='to-do')
+        Ticket.objects.filter(title__startswith='Old').update(updated_at=timezone.now() - timedelta(days=40))
+        Ticket.objects.filter(pk=self.open.pk).update(updated_at=timezone.now() - timedelta(days=40))
+
+    def archive(self, *args):
+        """Run the archive command and return its output"""
+        out = StringIO()
+        call_command('archive_done_tickets', *args, stdout=out)
+        return out.getvalue()
+
+    def test_archives_only_old_done_tickets(self):
+        """Test that recent and open tickets stay on the board"""
+        version = get_board_version(self.board.id)
+        self.assertIn('Archived 3 tickets on 1 boards', self.archive('--chunk-size', '2'))
+        archived = set(Ticket.objects.filter(is_archived=True).values_list('title', flat=True))
+        self.assertEqual(archived, {'Old 0', 'Old 1', 'Old 2'})
+        self.assertNotEqual(get_board_version(self.board.id), version)
+        self.assertIn('Archived 0 tickets', self.archive())
+
+    def test_archiving_bumps_ticket_versions(self):
+        """Test that ETags of archived tickets change"""
+        self.archive()
+        self.assertEqual(set(Ticket.objects.filter(is_archived=True).values_list('version', flat=True)), {2})
+        self.assertEqual(Ticket.objects.get(pk=self.recent.pk).version, 1)
+
+    def test_archived_tickets_are_not_counted(self):
+        """Test that the board list and board stats skip archived tickets"""
+        self.archive()
+        response = self.client.get('/api/boards/')
+        self.assertEqual(response.data[0]['ticket_count'], 2)
+        response = self.client.get(f'/api/boards/{self.board.id}/stats/')
+        self.assertEqual(response.data['ticket_count'], 2)
+        self.assertEqual(response.data['workload'], [])
+
+    def test_archived_tickets_leave_hot_reads(self):
+        """Test that board detail and ticket lists skip archived tickets"""
+        self.archive()
+        response = self.client.get(f'/api/boards/{self.board.id}/')
+        self.assertEqual({t['title'] for t in response.data['tasks']}, {'Recent', 'Open'})
+        response = self.client.get('/api/tasks/')
+        self.assertEqual({t['title'] for t in response.data}, {'Recent', 'Open'})
+        response = self.client.get('/api/tasks/assigned-to-me/')
+        self.assertEqual(response.data, [])
+        response = self.client.get(f'/api/tasks/{self.old[0].id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_new_tickets_ignore_archived_ranks(self):
+        """Test that the done column is ranked without archived tickets"""
+        self.archive()
+        ticket = Ticket.objects.create(board=self.board, title='New', status='done')
+        self.assertGreater(ticket.rank, self.recent.rank)
+        response = self.client.post(f'/api/tasks/{ticket.id}/move/', {'status': 'done', 'before_id': self.recent.id},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(f'/api/tasks/{ticket.id}/move/', {'status': 'done', 'after_id': self.old[0].id},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reopened_tickets_leave_the_archive(self):
+        """Test that moving an archived ticket out of done brings it back to the board"""
+        self.archive()
+        response = self.client.patch(f'/api/tasks/{self.old[0].id}/', {'status': 'review'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(f'/api/tasks/{self.old[1].id}/move/', {'status': 'to-do'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(f'/api/boards/{self.board.id}/move/',
+                                    {'ticket_ids': [self.old[2].id], 'status': 'in-progress'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Ticket.objects.filter(is_archived=True).exists())
+        response = self.client.get(f'/api/boards/{self.board.id}/')
+        self.assertEqual(len(response.data['tasks']), 5)
+
+    def test_edits_keep_done_tickets_archived(self):
+        """Test that editing an archived ticket without reopening it keeps it archived"""
+        self.archive()
+        response = self.client.patch(f'/api/tasks/{self.old[0].id}/', {'title': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(Ticket.objects.get(pk=self.old[0].pk).is_archived)
+
+    def test_archive_endpoint_is_paginated(self):
+        """Test that the archive lists archived tickets page by page"""
+        self.archive()
+        response = self.client.get(f'/api/boards/{self.board.id}/archive/', {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+        self.assertEqual(response.data['results'][0]['assignee']['id'], self.user.id)
+
+    def test_archive_endpoint_requires_board_access(self):
+        """Test that non-members get a 404"""
+        stranger = User.objects.create_user(username='stranger')
+        token = Token.objects.create(user=stranger)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        response = self.client.get(f'/api/boards/{self.board.id}/archive/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,119 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from jobs_app.models import Job
+from kanban_app.caching import get_board_version
+from kanban_app.deletion import delete_board
+from kanban_app.models import Activity, Board, Ticket, Subticket, Comment
+from kanban_app.search import get_search_backend
+
+
+class BoardDeletionTest(TestCase):
+    """Test deleting boards with set-based SQL"""
+
+    def setUp(self):
+        """Create two boards with tickets, subtickets, comments and assignees"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = self.create_board('Doomed')
+        self.other = self.create_board('Other')
+
+    def create_board(self, title):
+        """Create a board with five searchable tickets"""
+        board = Board.objects.create(title=title, owner=self.user)
+        board.members.add(self.user)
+        for i in range(5):
+            ticket = Ticket.objects.create(board=board, title=f'Needle {i}')
+            ticket.assigned_to.add(self.user)
+            Subticket.objects.create(ticket=ticket, title='Step')
+            Comment.objects.create(ticket=ticket, author=self.user, text='Needle comment')
+        return board
+
+    def assert_board_gone(self):
+        """Assert that nothing of the doomed board is left"""
+        self.assertFalse(Board.all_objects.filter(pk=self.board.pk).exists())
+        self.assertFalse(Ticket.objects.filter(board_id=self.board.pk).exists())
+        self.assertFalse(Subticket.objects.filter(ticket__board_id=self.board.pk).exists())
+        self.assertFalse(Comment.objects.filter(ticket__board_id=self.board.pk).exists())
+        self.assertFalse(Ticket.assigned_to.through.objects.filter(ticket__board_id=self.board.pk).exists())
+        self.assertFalse(Board.members.through.objects.filter(board_id=self.board.pk).exists())
+        self.assertFalse(Activity.objects.filter(board_id=self.board.pk).exists())
+        self.assertEqual(get_search_backend().search('needle', [self.board.pk]), [])
+
+    def assert_other_board_intact(self):
+        """Assert that the other board was not touched"""
+        self.assertEqual(Ticket.objects.filter(board=self.other).count(), 5)
+        self.assertEqual(Comment.objects.filter(ticket__board=self.other).count(), 5)
+        self.assertEqual(Board.members.through.objects.filter(board=self.other).count(), 1)
+        self.assertTrue(get_search_backend().search('needle', [self.other.pk]))
+
+    def test_delete_board_in_chunks(self):
+        """Test that all rows are deleted, two tickets per transaction"""
+        version = get_board_version(self.board.pk)
+        self.assertEqual(delete_board(self.board.pk, chunk_size=2), 5)
+        self.assert_board_gone()
+        self.assert_other_board_intact()
+        self.assertNotEqual(get_board_version(self.board.pk), version)
+
+    def test_delete_board_within_the_parameter_limit(self):
+        """Test that chunks larger than the database allows are split per statement"""
+        with mock.patch.object(connection.features, 'max_query_params', 2), \
+                CaptureQueriesContext(connection) as queries:
+            self.assertEqual(delete_board(self.board.pk, chunk_size=5), 5)
+        comment_deletes = [q for q in queries if q['sql'].startswith('DELETE FROM "kanban_app_comment"')]
+        self.assertEqual(len(comment_deletes), 3)
+        self.assert_board_gone()
+        self.assert_other_board_intact()
+
+    def test_delete_board_through_api(self):
+        """Test that DELETE uses the fast path"""
+        with self.assertNumQueries(18):
+            response = self.client.delete(f'/api/boards/{self.board.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assert_board_gone()
+        self.assert_other_board_intact()
+
+    @override_settings(BOARD_DELETE_ASYNC=True)
+    def test_async_delete_hides_board_at_once(self):
+        """Test that the board is flagged and hidden until the background deletion"""
+        ticket = Ticket.objects.filter(board=self.board).first()
+        response = self.client.delete(f'/api/boards/{self.board.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        job = Job.objects.get(name='kanban.delete_board')
+        self.assertEqual(response['Location'], f'/api/jobs/{job.pk}/')
+        self.assertEqual(job.payload, {'board_id': self.board.pk})
+        self.assertTrue(Board.all_objects.get(pk=self.board.pk).is_deleted)
+        response = self.client.get(f'/api/boards/{self.board.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get('/api/tasks/')
+        self.assertNotIn(ticket.id, [t['id'] for t in response.data])
+        response = self.client.get(f'/api/tasks/{ticket.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        call_command('run_worker', '--once', stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, {'tickets': 5})
+        self.assert_board_gone()
+        self.assert_other_board_intact()
+
+    def test_purge_deleted_boards(self):
+        """Test that flagged boards left behind are removed"""
+        Board.all_objects.filter(pk=self.board.pk).update(is_deleted=True)
+        out = StringIO()
+        call_command('purge_deleted_boards', stdout=out)
+        self.assertIn('Deleted 1 boards with 5 tickets', out.getvalue())
+        self.assert_board_gone()
+        self.assert_other_board_intact()
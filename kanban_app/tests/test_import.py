@@ -0,0 +1,166 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from jobs_app.models import Job
+from jobs_app.worker import run_next_job
+from kanban_app.importers import BoardImporter, BoardImportError, read_csv, read_ndjson
+from kanban_app.models import Board, Ticket, Subticket, Comment
+from kanban_app.search import get_search_backend
+
+
+def ndjson(*records):
+    """Return NDJSON lines for the given records."""
+    return [json.dumps(record) + '\n' for record in records]
+
+
+class BoardImporterTest(TestCase):
+    """Test the streaming board importer"""
+
+    def setUp(self):
+        """Create owner and a member that the dump refers to"""
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.member = User.objects.create_user(username='member', email='member@example.com')
+
+    def test_import_ndjson(self):
+        """Test importing tickets, subtickets, comments and assignments"""
+        lines = ndjson(
+            {'type': 'board', 'title': 'Imported', 'members': ['member@example.com']},
+            {'type': 'ticket', 'id': 1, 'title': 'First', 'status': 'review',
+             'assignee': 'member@example.com', 'assigned_to': ['member@example.com'],
+             'due_date': '2026-03-01'},
+            {'type': 'ticket', 'id': 2, 'title': 'Second'},
+            {'type': 'subticket', 'ticket': 1, 'title': 'Sub', 'done': True},
+            {'type': 'comment', 'ticket': 2, 'author': 'member@example.com', 'text': 'Hi'},
+        )
+        stats = BoardImporter(self.owner).run(read_ndjson(lines))
+
+        board = Board.objects.get(pk=stats['boards'][0])
+        self.assertEqual(board.owner, self.owner)
+        self.assertEqual(list(board.members.all()), [self.member])
+        first = board.tickets.get(title='First')
+        self.assertEqual(first.status, 'review')
+        self.assertEqual(first.assignee, self.member)
+        self.assertEqual(list(first.assigned_to.all()), [self.member])
+        self.assertTrue(first.subtickets.get().done)
+        self.assertEqual(Comment.objects.get().author, self.member)
+        self.assertEqual(stats['tickets'], 2)
+
+    def test_import_csv(self):
+        """Test importing a CSV dump with list columns"""
+        lines = [
+            'type,id,ticket,title,assigned_to,done,members\n',
+            'board,,,CSV Board,,,member@example.com\n',
+            'ticket,7,,Ticket,member@example.com;owner@example.com,,\n',
+            'subticket,,7,Sub,,false,\n',
+        ]
+        BoardImporter(self.owner).run(read_csv(lines))
+        ticket = Ticket.objects.get()
+        self.assertEqual(ticket.assigned_to.count(), 2)
+        self.assertFalse(Subticket.objects.get().done)
+
+    def test_batches_use_one_user_lookup(self):
+        """Test that each batch resolves users and inserts rows in bulk"""
+        records = [{'type': 'board', 'title': 'Big'}]
+        records += [
+            {'type': 'ticket', 'id': i, 'title': f'T{i}', 'assigned_to': ['member@example.com']}
+            for i in range(10)
+        ]
+        # savepoint, board insert, then per batch of 5: a user lookup on the
+        # first batch only, one ticket insert and one through insert, then
+        # three INSERT ... SELECT statements for the search index
+        with self.assertNumQueries(11):
+            BoardImporter(self.owner, batch_size=5).run(iter(records))
+        self.assertEqual(Ticket.objects.filter(assigned_to=self.member).count(), 10)
+
+    @override_settings(SEARCH_INDEX_ASYNC=True)
+    def test_index_in_background(self):
+        """Test that imported boards are indexed by a background job"""
+        lines = ndjson({'type': 'board', 'title': 'Board'}, {'type': 'ticket', 'title': 'Needle'})
+        stats = BoardImporter(self.owner).run(read_ndjson(lines))
+        board_id = stats['boards'][0]
+        self.assertEqual(get_search_backend().search('needle', [board_id]), [])
+        job = Job.objects.get(pk=stats['jobs'][0])
+        self.assertEqual((job.name, job.payload), ('kanban.index_board', {'board_id': board_id}))
+        run_next_job('w1')
+        self.assertTrue(get_search_backend().search('needle', [board_id]))
+
+    def test_invalid_record_rolls_back_board(self):
+        """Test that a bad record rolls back only its own board"""
+        lines = ndjson(
+            {'type': 'board', 'title': 'Good'},
+            {'type': 'ticket', 'id': 1, 'title': 'Fine'},
+            {'type': 'board', 'title': 'Bad'},
+            {'type': 'ticket', 'id': 1, 'title': 'Broken', 'status': 'unknown'},
+        )
+        importer = BoardImporter(self.owner)
+        with self.assertRaises(BoardImportError):
+            importer.run(read_ndjson(lines))
+        self.assertEqual(list(Board.objects.values_list('title', flat=True)), ['Good'])
+        self.assertEqual(importer.stats['boards'], [Board.objects.get().id])
+
+    def test_invalid_board_members(self):
+        """Test that empty and unknown member emails are row errors"""
+        for members in (['member@example.com', ''], ['ghost@example.com'], 'member@example.com', [None]):
+            lines = ndjson({'type': 'board', 'title': 'Board', 'members': members})
+            with self.assertRaises(BoardImportError, msg=members):
+                BoardImporter(self.owner).run(read_ndjson(lines))
+        self.assertEqual(Board.objects.count(), 0)
+
+    def test_unknown_ticket_reference(self):
+        """Test that comments must refer to an imported ticket"""
+        lines = ndjson(
+            {'type': 'board', 'title': 'Board'},
+            {'type': 'comment', 'ticket': 99, 'text': 'Orphan'},
+        )
+        with self.assertRaises(BoardImportError):
+            BoardImporter(self.owner).run(read_ndjson(lines))
+        self.assertEqual(Board.objects.count(), 0)
+
+
+class BoardImportAPITest(TestCase):
+    """Test the board import endpoint"""
+
+    def setUp(self):
+        """Create and authenticate a user"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_import_upload(self):
+        """Test uploading an NDJSON dump"""
+        content = ''.join(ndjson(
+            {'type': 'board', 'title': 'Uploaded'},
+            {'type': 'ticket', 'id': 1, 'title': 'Ticket'},
+        )).encode()
+        upload = SimpleUploadedFile('dump.ndjson', content)
+        response = self.client.post('/api/boards/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['tickets'], 1)
+        self.assertEqual(Board.objects.get().owner, self.user)
+
+    def test_import_invalid_dump(self):
+        """Test that invalid dumps return 400"""
+        upload = SimpleUploadedFile('dump.ndjson', b'not json\n')
+        response = self.client.post('/api/boards/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_unknown_member(self):
+        """Test that an unknown member email returns 400"""
+        content = ''.join(ndjson({'type': 'board', 'title': 'Uploaded', 'members': ['ghost@example.com']})).encode()
+        upload = SimpleUploadedFile('dump.ndjson', content)
+        response = self.client.post('/api/boards/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Board.objects.exists())
+
+    def test_import_requires_file(self):
+        """Test that the file field is required"""
+        response = self.client.post('/api/boards/import/', {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,264 @@
+import random
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from kanban_app.caching import get_board_version
+from kanban_app.models import Board, Ticket
+from kanban_app.ranking import RankError, rank_between, ranks_between
+
+
+class RankTest(SimpleTestCase):
+    """Test lexicographic rank generation"""
+
+    def test_between(self):
+        """Test that generated ranks sort strictly between their neighbours"""
+        for before, after in [(None, None), ('a', 'b'), ('a', 'a1'), ('az', 'b'), (None, '0001'), ('zzzz', None)]:
+            rank = rank_between(before, after)
+            self.assertLess(before or '', rank)
+            if after is not None:
+                self.assertLess(rank, after)
+            self.assertFalse(rank.endswith('0'))
+
+    def test_no_rank_between_equal_ranks(self):
+        """Test that equal or inverted neighbours are rejected"""
+        with self.assertRaises(RankError):
+            rank_between('b', 'b')
+        with self.assertRaises(RankError):
+            rank_between('c', 'b')
+
+    def test_appending_keeps_ranks_short(self):
+        """Test that appending steps instead of halving"""
+        rank = rank_between(None, None)
+        for _ in range(500):
+            rank = rank_between(rank, None)
+        self.assertLessEqual(len(rank), 4)
+
+    def test_random_inserts_stay_ordered(self):
+        """Test that random inserts keep a strictly increasing order"""
+        rng = random.Random(1)
+        ranks = [rank_between(None, None)]
+        for _ in range(300):
+            i = rng.randint(0, len(ranks))
+            before = ranks[i - 1] if i > 0 else None
+            after = ranks[i] if i < len(ranks) else None
+            ranks.insert(i, rank_between(before, after))
+        self.assertEqual(ranks, sorted(set(ranks)))
+
+    def test_evenly_spaced(self):
+        """Test bulk ranks for rebalancing"""
+        ranks = ranks_between(None, None, 1000)
+        self.assertEqual(ranks, sorted(set(ranks)))
+        self.assertTrue(all(len(rank) <= 3 for rank in ranks))
+        self.assertEqual(ranks_between('a', 'b', 5), sorted(set(ranks_between('a', 'b', 5))))
+
+
+class TicketMoveAPITest(TestCase):
+    """Test moving tickets within and between columns"""
+
+    def setUp(self):
+        """Create a column with three tickets"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+        self.a, self.b, self.c = (
+            Ticket.objects.create(board=self.board, title=title) for title in 'ABC'
+        )
+
+    def column(self, status_value='to-do'):
+        """Return ticket titles of a column in rank order"""
+        return list(
+            Ticket.objects.filter(board=self.board, status=status_value)
+            .order_by('rank').values_list('title', flat=True)
+        )
+
+    def move(self, ticket, **data):
+        """Move a ticket and return the response"""
+        return self.client.post(f'/api/tasks/{ticket.id}/move/', data, format='json')
+
+    def test_new_tickets_are_appended(self):
+        """Test that created tickets go to the end of their column"""
+        self.assertEqual(self.column(), ['A', 'B', 'C'])
+
+    def test_move_between(self):
+        """Test moving a ticket between two others writes one row"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.move(self.c, after_id=self.a.id, before_id=self.b.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column(), ['A', 'C', 'B'])
+        writes = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(writes), 1)
+
+    def test_move_with_one_neighbour(self):
+        """Test moving to the top and after a single neighbour"""
+        self.move(self.c, before_id=self.a.id)
+        self.assertEqual(self.column(), ['C', 'A', 'B'])
+        self.move(self.c, after_id=self.a.id)
+        self.assertEqual(self.column(), ['A', 'C', 'B'])
+
+    def test_move_to_other_column(self):
+        """Test changing the status with a move"""
+        done = Ticket.objects.create(board=self.board, title='D', status='done')
+        response = self.move(self.a, status='done', before_id=done.id)
+        self.assertEqual(response.data['status'], 'done')
+        self.assertEqual(self.column('done'), ['A', 'D'])
+        self.assertEqual(self.column(), ['B', 'C'])
+
+    def test_move_without_neighbours_appends(self):
+        """Test that a move without neighbours goes to the end"""
+        self.move(self.a)
+        self.assertEqual(self.column(), ['B', 'C', 'A'])
+
+    def test_status_patch_appends_to_new_column(self):
+        """Test that changing the status through PATCH puts the ticket last in its new column"""
+        d, e = (Ticket.objects.create(board=self.board, title=title, status='done') for title in 'DE')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f'/api/tasks/{self.a.id}/', {'status': 'done'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column('done'), ['D', 'E', 'A'])
+        self.assertEqual(self.column(), ['B', 'C'])
+        self.assertEqual(len(set(Ticket.objects.filter(status='done').values_list('rank', flat=True))), 3)
+        writes = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(writes), 1)
+        self.assertIn('"rank"', writes[0])
+
+    def test_invalid_neighbour(self):
+        """Test that neighbours must be in the target column"""
+        response = self.move(self.a, status='done', after_id=self.b.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.move(self.a, after_id='x')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_swapped_neighbours_are_rejected(self):
+        """Test that after_id below before_id is a 400, also for equal ranks"""
+        response = self.move(self.c, after_id=self.b.id, before_id=self.a.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(str(response.data['detail']), 'after_id must come before before_id.')
+        Ticket.objects.filter(pk__in=[self.a.pk, self.b.pk]).update(rank='m')
+        response = self.move(self.c, after_id=self.b.id, before_id=self.a.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.column(), ['C', 'A', 'B'])
+
+    def test_equal_ranks_are_rebalanced(self):
+        """Test that a move between equal ranks respaces the column"""
+        Ticket.objects.filter(pk__in=[self.a.pk, self.b.pk]).update(rank='m')
+        response = self.move(self.c, after_id=self.a.id, before_id=self.b.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column(), ['A', 'C', 'B'])
+
+    def test_board_detail_uses_rank(self):
+        """Test that the board detail lists tasks in rank order"""
+        self.move(self.a)
+        response = self.client.get(f'/api/boards/{self.board.id}/')
+        self.assertEqual([t['title'] for t in response.data['tasks']], ['B', 'C', 'A'])
+
+    def test_rebalance_command(self):
+        """Test that long ranks are spread evenly again"""
+        for _ in range(20):
+            self.move(self.c, after_id=self.a.id, before_id=self.b.id)
+            self.move(self.b, after_id=self.a.id, before_id=self.c.id)
+        self.assertGreater(len(Ticket.objects.get(pk=self.c.pk).rank), 8)
+        order = self.column()
+        out = StringIO()
+        call_command('rebalance_ranks', stdout=out)
+        self.assertIn('Rebalanced 1 columns with 3 tickets.', out.getvalue())
+        self.assertEqual(self.column(), order)
+        self.assertTrue(all(len(t.rank) <= 2 for t in Ticket.objects.all()))
+        self.a.refresh_from_db()
+        self.assertEqual(self.a.version, 2)
+
+
+class BoardMoveAPITest(TestCase):
+    """Test moving several tickets of a board at once"""
+
+    def setUp(self):
+        """Create a board with a to-do and a review column"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Test Board', owner=self.user)
+        self.a, self.b, self.c = (
+            Ticket.objects.create(board=self.board, title=title) for title in 'ABC'
+        )
+        self.x, self.y = (
+            Ticket.objects.create(board=self.board, title=title, status='review') for title in 'XY'
+        )
+        self.url = f'/api/boards/{self.board.id}/move/'
+
+    def column(self, status_value):
+        """Return ticket titles of a column in rank order"""
+        return list(
+            Ticket.objects.filter(board=self.board, status=status_value)
+            .order_by('rank').values_list('title', flat=True)
+        )
+
+    def test_move_between_tickets_keeps_request_order(self):
+        """Test that moved tickets land between the neighbours in the given order"""
+        data = {'ticket_ids': [self.c.id, self.a.id], 'status': 'review', 'after_id': self.x.id}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column('review'), ['X', 'C', 'A', 'Y'])
+        self.assertEqual(self.column('to-do'), ['B'])
+        self.assertEqual([t['id'] for t in response.data['tickets']], [self.c.id, self.a.id])
+        self.a.refresh_from_db()
+        self.assertEqual(self.a.version, 2)
+
+    def test_move_writes_once_and_bumps_board_version(self):
+        """Test that all tickets are written by a single UPDATE"""
+        version = get_board_version(self.board.id)
+        data = {'ticket_ids': [self.a.id, self.b.id, self.c.id], 'status': 'done'}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.column('done'), ['A', 'B', 'C'])
+        self.assertNotEqual(get_board_version(self.board.id), version)
+
+    def test_move_rejects_foreign_tickets(self):
+        """Test that tickets of other boards cannot be moved"""
+        other = Board.objects.create(title='Other', owner=self.user)
+        foreign = Ticket.objects.create(board=other, title='F')
+        data = {'ticket_ids': [self.a.id, foreign.id], 'status': 'done'}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.column('done'), [])
+
+    def test_move_rejects_invalid_input(self):
+        """Test validation of ids, status and neighbours"""
+        for data in (
+            {'ticket_ids': [], 'status': 'done'},
+            {'ticket_ids': [self.a.id, self.a.id], 'status': 'done'},
+            {'ticket_ids': [self.a.id], 'status': 'nope'},
+            {'ticket_ids': [self.a.id], 'status': 'review', 'after_id': self.b.id},
+        ):
+            response = self.client.post(self.url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, data)
+
+    def test_move_rejects_swapped_neighbours(self):
+        """Test that after_id below before_id is a 400 and moves nothing"""
+        data = {'ticket_ids': [self.a.id], 'status': 'review', 'after_id': self.y.id, 'before_id': self.x.id}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(str(response.data['detail']), 'after_id must come before before_id.')
+        self.assertEqual(self.column('review'), ['X', 'Y'])
+
+    def test_move_requires_board_access(self):
+        """Test that non-members get a 404"""
+        stranger = User.objects.create_user(username='stranger')
+        token = Token.objects.create(user=stranger)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        data = {'ticket_ids': [self.a.id], 'status': 'done'}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
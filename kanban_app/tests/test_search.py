@@ -0,0 +1,108 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from jobs_app.models import Job
+from kanban_app.models import Board, Ticket, Subticket, Comment
+from kanban_app.search import SQLiteFTSBackend, get_search_backend
+
+
+class SearchAPITest(TestCase):
+    """Test the full-text search endpoint"""
+
+    def setUp(self):
+        """Create searchable content on an accessible and a foreign board"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.other = User.objects.create_user(username='other', email='other@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        self.board = Board.objects.create(title='Board', owner=self.other)
+        self.board.members.add(self.user)
+        self.ticket = Ticket.objects.create(
+            board=self.board, title='Invoice export', description='Generate monthly PDFs',
+        )
+        self.subticket = Subticket.objects.create(ticket=self.ticket, title='Render invoice header')
+        self.comment = Comment.objects.create(
+            ticket=self.ticket, author=self.other, text='Customers want invoices as CSV',
+        )
+        foreign = Board.objects.create(title='Foreign', owner=self.other)
+        Ticket.objects.create(board=foreign, title='Secret invoice')
+
+    def search(self, query):
+        """Return (type, id) pairs for a search query"""
+        response = self.client.get('/api/search/', {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(r['type'], r['id']) for r in response.data]
+
+    def test_search_all_kinds(self):
+        """Test that tickets, subtickets and comments are found by prefix"""
+        results = self.search('invoic*')
+        self.assertEqual(
+            set(results),
+            {('ticket', self.ticket.id), ('subticket', self.subticket.id), ('comment', self.comment.id)},
+        )
+
+    def test_title_matches_rank_first(self):
+        """Test that title matches rank above body matches"""
+        Ticket.objects.create(board=self.board, title='Other', description='about export')
+        self.assertEqual(self.search('export')[0], ('ticket', self.ticket.id))
+
+    def test_search_description(self):
+        """Test that descriptions are searchable by whole words"""
+        self.assertEqual(self.search('monthly'), [('ticket', self.ticket.id)])
+        self.assertEqual(self.search('month'), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test that signals keep the index in sync"""
+        self.ticket.title = 'Payroll'
+        self.ticket.save()
+        self.assertIn(('ticket', self.ticket.id), self.search('payroll'))
+        self.comment.delete()
+        self.assertNotIn(('comment', self.comment.id), self.search('customers'))
+
+    @patch.object(SQLiteFTSBackend, 'max_ranked_matches', 1)
+    def test_broad_queries_return_newest_first(self):
+        """Test that queries with too many matches skip bm25 ranking"""
+        newer = Ticket.objects.create(board=self.board, title='Invoice archive')
+        response = self.client.get('/api/search/', {'q': 'invoice'})
+        self.assertEqual(response.data[0]['id'], newer.id)
+        self.assertIsNone(response.data[0]['rank'])
+
+    def test_board_tokens_are_not_searchable(self):
+        """Test that the internal board column does not match user queries"""
+        self.assertEqual(self.search(f'b{self.board.id}'), [])
+
+    def test_search_requires_query(self):
+        """Test that q is required"""
+        response = self.client.get('/api/search/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild(self):
+        """Test that a rebuild restores the same results"""
+        before = set(self.search('invoic*'))
+        get_search_backend().rebuild()
+        self.assertEqual(set(self.search('invoic*')), before)
+
+    def test_rebuild_in_background(self):
+        """Test that the rebuild command can queue a job instead"""
+        out = StringIO()
+        call_command('rebuild_search_index', '--background', stdout=out)
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'kanban.rebuild_search_index')
+        self.assertIn(f'job {job.pk}', out.getvalue())
+
+    @override_settings(KANBAN_SEARCH_BACKEND='kanban_app.search.ORMSearchBackend')
+    def test_orm_backend(self):
+        """Test the fallback backend used on other databases"""
+        results = self.search('invoic*')
+        self.assertIn(('ticket', self.ticket.id), results)
+        self.assertEqual(len(results), 3)
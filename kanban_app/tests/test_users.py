@@ -0,0 +1,109 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from kanban_app.api.filters import search_users
+from kanban_app.models import Board
+
+
+class UserDirectoryTest(TestCase):
+    """Test the scoped, searchable user directory"""
+
+    def setUp(self):
+        """Create a caller sharing boards with some users but not others"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='me', email='me@example.com', first_name='Mia', last_name='Kim')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.ada = User.objects.create_user(
+            username='ada', email='ada@example.com', first_name='Ada', last_name='Lovelace',
+        )
+        self.alan = User.objects.create_user(
+            username='alan', email='turing@example.com', first_name='Alan', last_name='Turing',
+        )
+        self.stranger = User.objects.create_user(
+            username='eve', email='eve@example.com', first_name='Eve', last_name='Adams',
+        )
+        own = Board.objects.create(title='Own Board', owner=self.user)
+        own.members.add(self.ada)
+        shared = Board.objects.create(title='Shared Board', owner=self.alan)
+        shared.members.add(self.user)
+
+    def ids(self, response):
+        """Return the user ids of a directory response"""
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        return [user['id'] for user in results]
+
+    def test_directory_is_scoped_to_shared_boards(self):
+        """Test that only the caller and users sharing a board are listed"""
+        response = self.client.get('/api/users/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.ids(response), [self.ada.id, self.alan.id, self.user.id])
+        self.assertEqual(self.client.get(f'/api/users/{self.stranger.id}/').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_prefix_search(self):
+        """Test case-insensitive prefix search on email and names"""
+        self.assertEqual(self.ids(self.client.get('/api/users/', {'search': 'A'})), [self.ada.id, self.alan.id])
+        self.assertEqual(self.ids(self.client.get('/api/users/', {'search': 'tur'})), [self.alan.id])
+        self.assertEqual(self.ids(self.client.get('/api/users/', {'search': 'ada lov'})), [self.ada.id])
+        self.assertEqual(self.ids(self.client.get('/api/users/', {'search': 'love'})), [self.ada.id])
+        self.assertEqual(self.ids(self.client.get('/api/users/', {'search': 'eve'})), [])
+
+    def test_pagination(self):
+        """Test that page_size paginates the directory"""
+        response = self.client.get('/api/users/', {'page_size': 2})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(self.ids(response), [self.ada.id, self.alan.id])
+
+    def test_cached_per_caller_until_membership_changes(self):
+        """Test the ETag round trip and invalidation on membership changes"""
+        response = self.client.get('/api/users/')
+        etag = response['ETag']
+        self.assertIn('private', response['Cache-Control'])
+        # The token lookup and the caller's boards
+        with self.assertNumQueries(2):
+            cached = self.client.get('/api/users/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Board.objects.get(title='Own Board').members.add(self.stranger)
+        response = self.client.get('/api/users/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(self.stranger.id, self.ids(response))
+
+    def test_unrelated_changes_keep_the_cache(self):
+        """Test that title edits and other boards' members do not invalidate a directory"""
+        etag = self.client.get('/api/users/')['ETag']
+        own = Board.objects.get(title='Own Board')
+        own.title = 'Renamed'
+        own.save()
+        other = Board.objects.create(title='Other Board', owner=self.stranger)
+        other.members.add(self.ada)
+        response = self.client.get('/api/users/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_removed_member_and_name_change_invalidate(self):
+        """Test that removed members disappear and renamed users are shown renamed"""
+        etag = self.client.get('/api/users/')['ETag']
+        self.ada.boards.remove(Board.objects.get(title='Own Board'))
+        response = self.client.get('/api/users/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(self.ids(response), [self.alan.id, self.user.id])
+
+        self.alan.first_name = 'Al'
+        self.alan.save()
+        response = self.client.get('/api/users/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.data[0]['fullname'], 'Al Turing')
+
+    def test_search_uses_indexes(self):
+        """Test that prefix search is answered from the email and LOWER() name indexes"""
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plan checked on SQLite only')
+        plan = search_users(User.objects.all(), {'search': 'ada'}).explain()
+        self.assertIn('auth_user_email_uniq', plan)
+        self.assertIn('auth_user_first_lower_idx', plan)
+        self.assertIn('auth_user_last_lower_idx', plan)